@@ -2,10 +2,13 @@
 Inicialización de la aplicación Flask usando Factory Pattern
 """
 import os
+import sqlite3
 import click
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from config import config
 
 # Inicializar extensiones (sin app todavía)
@@ -13,6 +16,18 @@ db = SQLAlchemy()
 migrate = Migrate()
 
 
+@event.listens_for(Engine, 'connect')
+def _activar_claves_foraneas_sqlite(dbapi_connection, connection_record):
+    """
+    SQLite no aplica claves foráneas (ni ON DELETE CASCADE) salvo que se
+    active en cada conexión.
+    """
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA foreign_keys=ON')
+        cursor.close()
+
+
 def create_app(config_name='development'):
     """
     Factory function para crear la aplicación Flask
@@ -2,18 +2,382 @@
 Controlador de Artículos.
 Maneja toda la lógica de negocio para el CRUD de artículos.
 """
+import base64
+from datetime import datetime
 from typing import Optional, Tuple, Dict, Any, List
-from flask import flash
-from sqlalchemy import or_
+from flask import flash, current_app
+from flask_sqlalchemy.pagination import SelectPagination
+from sqlalchemy import or_, tuple_, update
+from sqlalchemy.orm import load_only, lazyload, joinedload, raiseload
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from app import db
 from app.models import Articulo, Autor, Revista, TipoProduccion, Estado, LGAC, Proposito
 from app.models.relations import ArticuloAutor
+from app.utils.cache import (
+    catalogs_exist, catalog_ids_existing, get_cached_statistics, get_estado_id,
+    set_cached_statistics
+)
+
+
+def _encode_cursor(created_at: datetime, article_id: int) -> str:
+    """Codifica la posición (created_at, id) como cursor opaco para la URL."""
+    raw = f"{created_at.isoformat()}|{article_id}".encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def _decode_cursor(cursor: str) -> Optional[Tuple[datetime, int]]:
+    """Decodifica un cursor generado por _encode_cursor. Retorna None si es inválido."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        created_at, article_id = raw.split('|', 1)
+        return datetime.fromisoformat(created_at), int(article_id)
+    except (ValueError, UnicodeError):
+        return None
+
+
+def _insert_ignorando_duplicados(modelo, columnas: List[str], select_stmt, index_elements: List[str]):
+    """
+    Construye un INSERT ... SELECT que no falla si viola una restricción única.
+    
+    Usa ON CONFLICT DO NOTHING (PostgreSQL/SQLite) o INSERT IGNORE (MySQL).
+    En otros dialectos retorna un INSERT normal y el llamador debe capturar
+    IntegrityError.
+    """
+    dialecto = db.session.get_bind().dialect.name
+    
+    if dialecto == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+        return insert(modelo).from_select(columnas, select_stmt)\
+            .on_conflict_do_nothing(index_elements=index_elements)
+    
+    if dialecto == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+        return insert(modelo).from_select(columnas, select_stmt)\
+            .on_conflict_do_nothing(index_elements=index_elements)
+    
+    if dialecto in ('mysql', 'mariadb'):
+        return db.insert(modelo).prefix_with('IGNORE').from_select(columnas, select_stmt)
+    
+    return db.insert(modelo).from_select(columnas, select_stmt)
+
+
+# Llaves foráneas opcionales: el valor 0 de los formularios significa "sin valor"
+_FK_OPCIONALES = frozenset(('proposito_id', 'lgac_id', 'revista_id'))
+
+
+# Identificadores que se guardan en forma canónica: (campo, normalizador).
+# Se normalizan antes de validar, igual que lo haría el setter del modelo
+# (@validates), que las inserciones masivas no ejecutan
+_IDENTIFICADORES = (
+    ('doi', Articulo.normalizar_doi),
+    ('issn', Articulo.normalizar_issn),
+)
+
+
+def _normalizar_datos(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Retorna una copia de data con las FK opcionales en 0 convertidas a None
+    y el DOI y el ISSN en su forma canónica.
+    """
+    data = {
+        k: (None if k in _FK_OPCIONALES and v == 0 else v)
+        for k, v in data.items()
+    }
+    for campo, normalizar in _IDENTIFICADORES:
+        if isinstance(data.get(campo), str):
+            data[campo] = normalizar(data[campo])
+    return data
+
+
+# Campos obligatorios al crear un artículo: (campo, mensaje)
+_CAMPOS_OBLIGATORIOS = (
+    ('titulo', "El título es obligatorio"),
+    ('tipo_produccion_id', "El tipo de producción es obligatorio"),
+    ('estado_id', "El estado es obligatorio"),
+)
+
+# Validaciones de formato de campos opcionales, en el orden en que se reportan:
+# (campo, validador, mensaje). Los validadores se resuelven al importar el módulo
+_VALIDACIONES_FORMATO = (
+    ('doi', Articulo.es_doi_valido, "Formato de DOI inválido (debe ser 10.xxxx/xxxxx)"),
+    ('issn', Articulo.es_issn_valido, "Formato de ISSN inválido (debe ser XXXX-XXXX)"),
+    ('anio_publicacion', Articulo.es_anio_valido,
+     "Año inválido (debe estar entre 1900 y año actual + 1)"),
+    ('quartil', Articulo.es_quartil_valido, "Quartil inválido (debe ser Q1, Q2, Q3 o Q4)"),
+)
+
+# Campos que create_many valida por lote antes de recorrer los artículos:
+# (campo, validador de lote)
+_VALIDACIONES_LOTE = (
+    ('doi', Articulo.son_dois_validos),
+    ('issn', Articulo.son_issns_validos),
+)
+
+
+class _ArticlePagination(SelectPagination):
+    """
+    Paginación de artículos con conteo opcional y ligero.
+    
+    - El total se obtiene con count_select (SELECT count(id) sin ORDER BY ni
+      lista de columnas) en lugar de contar sobre una subconsulta completa.
+    - Siempre se pide una fila extra, así has_next funciona aunque no se
+      haya calculado el total (count=False).
+    """
+    
+    def _query_items(self) -> List[Any]:
+        select = self._query_args['select']
+        select = select.limit(self.per_page + 1).offset(self._query_offset)
+        items = list(self._query_args['session'].execute(select).unique().scalars())
+        self._hay_siguiente = len(items) > self.per_page
+        return items[:self.per_page]
+    
+    def _query_count(self) -> int:
+        if self._query_args.get('total_aproximado') is not None:
+            return self._query_args['total_aproximado']
+        return self._query_args['session'].scalar(self._query_args['count_select'])
+    
+    @property
+    def has_next(self) -> bool:
+        if self.total is None:
+            return self._hay_siguiente
+        return super().has_next
 
 
 class ArticleController:
     """Controlador para operaciones CRUD de artículos."""
     
+    # Referencias a catálogos que se validan antes de guardar: (campo, modelo, mensaje)
+    _REFERENCIAS = (
+        ('tipo_produccion_id', TipoProduccion, "Tipo de producción inválido"),
+        ('estado_id', Estado, "Estado inválido"),
+        ('proposito_id', Proposito, "Propósito inválido"),
+        ('lgac_id', LGAC, "LGAC inválido"),
+        ('revista_id', Revista, "Revista inválida"),
+    )
+    
+    @staticmethod
+    def _validate_formats(data: Dict[str, Any],
+                          validados: Optional[Dict[str, bool]] = None) -> Optional[str]:
+        """
+        Valida el formato de los campos presentes en data (sin acceso a BD).
+        
+        Args:
+            data: Datos del artículo
+            validados: Resultados ya calculados por campo (validación por lote)
+        
+        Returns:
+            Mensaje de error del primer campo inválido, o None
+        """
+        validados = validados or {}
+        for campo, es_valido, mensaje in _VALIDACIONES_FORMATO:
+            valor = data.get(campo)
+            if not valor:
+                continue
+            if not (validados[campo] if campo in validados else es_valido(valor)):
+                return mensaje
+        
+        if not Articulo.son_paginas_validas(data.get('pagina_inicio'), data.get('pagina_fin')):
+            return "La página final debe ser mayor o igual a la página inicial"
+        
+        return None
+    
+    @staticmethod
+    def _validate_create(data: Dict[str, Any],
+                         validados: Optional[Dict[str, bool]] = None
+                         ) -> Tuple[Dict[str, Any], Optional[str]]:
+        """
+        Validación completa sin acceso a BD de los datos de un artículo nuevo:
+        campos obligatorios, FK opcionales en 0 -> None y formatos.
+        
+        Returns:
+            Tuple (datos_normalizados, error_message)
+        """
+        for campo, mensaje in _CAMPOS_OBLIGATORIOS:
+            if not data.get(campo):
+                return data, mensaje
+        
+        data = _normalizar_datos(data)
+        return data, ArticleController._validate_formats(data, validados)
+    
+    @staticmethod
+    def _validate_references(data: Dict[str, Any]) -> Optional[str]:
+        """
+        Verifica que existan las referencias presentes en data.
+        
+        Usa la caché de catálogos: los IDs ya confirmados no generan
+        consulta y el resto se resuelve en un solo SELECT.
+        
+        Returns:
+            Mensaje de error de la primera referencia inválida, o None
+        """
+        pendientes = [
+            (campo, modelo, mensaje)
+            for campo, modelo, mensaje in ArticleController._REFERENCIAS
+            if data.get(campo)
+        ]
+        if not pendientes:
+            return None
+        
+        existencias = catalogs_exist([
+            (modelo, data[campo]) for campo, modelo, _ in pendientes
+        ])
+        
+        for (_, _, mensaje), existe in zip(pendientes, existencias):
+            if not existe:
+                return mensaje
+        
+        return None
+    
+    @staticmethod
+    def _list_loader_options() -> List[Any]:
+        """
+        Opciones de carga para listados de artículos.
+        
+        El listado solo muestra tipo y estado, que se cargan con JOIN en la
+        misma consulta. El resto de relaciones queda diferido; si la
+        configuración ARTICLES_RAISELOAD está activa (desarrollo/pruebas),
+        acceder a ellas lanza una excepción para detectar N+1 a tiempo.
+        """
+        diferidas = raiseload('*') if current_app.config.get('ARTICLES_RAISELOAD') else lazyload('*')
+        return [
+            joinedload(Articulo.tipo),
+            joinedload(Articulo.estado),
+            diferidas
+        ]
+    
+    @staticmethod
+    def _detail_loader_options() -> List[Any]:
+        """
+        Opciones de carga para mostrar o editar un artículo: todas sus
+        relaciones muchos-a-uno en la misma consulta.
+        """
+        return [
+            joinedload(Articulo.tipo),
+            joinedload(Articulo.estado),
+            joinedload(Articulo.proposito),
+            joinedload(Articulo.lgac),
+            joinedload(Articulo.revista)
+        ]
+    
+    @staticmethod
+    def create_many(items: List[Dict[str, Any]]) -> Tuple[List[Articulo], List[str]]:
+        """
+        Crea varios artículos con una sola inserción masiva y un solo commit.
+        
+        Pensado para importaciones: aplica las mismas validaciones que create,
+        pero las referencias a catálogos se verifican con un SELECT ... IN por
+        catálogo para todo el lote. Los registros inválidos se omiten y se
+        reportan en la lista de errores; los válidos se insertan.
+        
+        Args:
+            items: Lista de diccionarios con los datos de cada artículo
+        
+        Returns:
+            Tuple (articulos_creados, errores)
+            - errores: mensajes "Artículo N: ..." (N = posición 1-based en items)
+        """
+        errores = []
+        candidatos = []
+        items = [_normalizar_datos(data) for data in items]
+        
+        # DOI e ISSN de todo el lote se validan juntos; el resto de los
+        # formatos se valida artículo por artículo
+        por_campo = [
+            (campo, validar_lote([data.get(campo) for data in items]))
+            for campo, validar_lote in _VALIDACIONES_LOTE
+        ]
+        
+        for posicion, data in enumerate(items, start=1):
+            validados = {campo: validos[posicion - 1] for campo, validos in por_campo}
+            data, error = ArticleController._validate_create(data, validados)
+            if error:
+                errores.append(f"Artículo {posicion}: {error}")
+            else:
+                candidatos.append((posicion, data))
+        
+        if not candidatos:
+            return [], errores
+        
+        try:
+            # Un SELECT ... IN por catálogo para todo el lote
+            existentes = {
+                modelo: catalog_ids_existing(
+                    modelo, {data[campo] for _, data in candidatos if data.get(campo)}
+                )
+                for campo, modelo, _ in ArticleController._REFERENCIAS
+            }
+            
+            filas = []
+            for posicion, data in candidatos:
+                error = next((
+                    mensaje for campo, modelo, mensaje in ArticleController._REFERENCIAS
+                    if data.get(campo) and data[campo] not in existentes[modelo]
+                ), None)
+                if error:
+                    errores.append(f"Artículo {posicion}: {error}")
+                else:
+                    filas.append({
+                        k: v for k, v in data.items()
+                        if k in Articulo._COLUMNAS_ACTUALIZABLES
+                    })
+            
+            if not filas:
+                return [], errores
+            
+            if db.session.get_bind().dialect.insert_executemany_returning:
+                # INSERT masivo (insertmanyvalues) que regresa las entidades creadas
+                articulos = list(db.session.scalars(
+                    db.insert(Articulo).returning(Articulo, sort_by_parameter_order=True),
+                    filas
+                ))
+            else:
+                articulos = [Articulo(**fila) for fila in filas]
+                db.session.add_all(articulos)
+            
+            db.session.commit()
+            
+            return articulos, errores
+        
+        except IntegrityError:
+            db.session.rollback()
+            return [], errores + ["Error de integridad: algún artículo del lote podría estar duplicado"]
+        
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            return [], errores + [f"Error al crear los artículos: {str(e)}"]
+    
+    @staticmethod
+    def _fast_count() -> Optional[int]:
+        """
+        Número aproximado de filas de la tabla articulos, leído de las
+        estadísticas del catálogo del motor (O(1), sin recorrer la tabla).
+        
+        Incluye artículos inactivos y depende del último ANALYZE, por lo que
+        solo sirve para mostrar "~N resultados".
+        
+        Returns:
+            Entero aproximado, o None si el motor no ofrece estimación
+            (p. ej. SQLite) o la tabla nunca ha sido analizada.
+        """
+        dialecto = db.session.get_bind().dialect.name
+        
+        if dialecto == 'postgresql':
+            estimado = db.session.execute(db.text(
+                "SELECT reltuples::bigint FROM pg_class WHERE relname = :tabla"
+            ), {'tabla': Articulo.__tablename__}).scalar()
+        elif dialecto in ('mysql', 'mariadb'):
+            estimado = db.session.execute(db.text(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :tabla"
+            ), {'tabla': Articulo.__tablename__}).scalar()
+        else:
+            return None
+        
+        # PostgreSQL reporta -1 si la tabla no ha sido analizada
+        if estimado is None or estimado < 0:
+            return None
+        return int(estimado)
+    
     @staticmethod
     def create(data: Dict[str, Any]) -> Tuple[Optional[Articulo], Optional[str]]:
         """
@@ -27,80 +391,20 @@ class ArticleController:
             - Si exitoso: (articulo, None)
             - Si falla: (None, mensaje_error)
         """
+        # Validaciones sin acceso a BD (antes que las de referencias): fuera
+        # del try, no abren transacción ni provocan un rollback innecesario
+        data, error = ArticleController._validate_create(data)
+        if error:
+            return None, error
+        
         try:
-            # Validar campos obligatorios
-            if not data.get('titulo'):
-                return None, "El título es obligatorio"
-            
-            if not data.get('tipo_produccion_id'):
-                return None, "El tipo de producción es obligatorio"
-            
-            if not data.get('estado_id'):
-                return None, "El estado es obligatorio"
-            
-            # Convertir valores vacíos a None para campos opcionales
-            for field in ['proposito_id', 'lgac_id', 'revista_id']:
-                if field in data and data[field] == 0:
-                    data[field] = None
-            
-            # Validar que existan las referencias
-            if data.get('tipo_produccion_id'):
-                tipo = TipoProduccion.query.get(data['tipo_produccion_id'])
-                if not tipo:
-                    return None, "Tipo de producción inválido"
-            
-            if data.get('estado_id'):
-                estado = Estado.query.get(data['estado_id'])
-                if not estado:
-                    return None, "Estado inválido"
-            
-            if data.get('proposito_id'):
-                proposito = Proposito.query.get(data['proposito_id'])
-                if not proposito:
-                    return None, "Propósito inválido"
-            
-            if data.get('lgac_id'):
-                lgac = LGAC.query.get(data['lgac_id'])
-                if not lgac:
-                    return None, "LGAC inválido"
-            
-            if data.get('revista_id'):
-                revista = Revista.query.get(data['revista_id'])
-                if not revista:
-                    return None, "Revista inválida"
-            
-            # Validar DOI si está presente
-            if data.get('doi'):
-                articulo = Articulo(doi=data['doi'])
-                if not articulo.validar_doi():
-                    return None, "Formato de DOI inválido (debe ser 10.xxxx/xxxxx)"
-            
-            # Validar ISSN si está presente
-            if data.get('issn'):
-                articulo = Articulo(issn=data['issn'])
-                if not articulo.validar_issn():
-                    return None, "Formato de ISSN inválido (debe ser XXXX-XXXX)"
-            
-            # Validar año si está presente
-            if data.get('anio_publicacion'):
-                articulo = Articulo(anio_publicacion=data['anio_publicacion'])
-                if not articulo.validar_anio():
-                    return None, "Año inválido (debe estar entre 1900 y año actual + 1)"
-            
-            # Validar páginas si están presentes
-            if data.get('pagina_inicio') and data.get('pagina_fin'):
-                articulo_temp = Articulo(
-                    pagina_inicio=data.get('pagina_inicio'),
-                    pagina_fin=data.get('pagina_fin')
-                )
-                if not articulo_temp.validar_paginas():
-                    return None, "La página final debe ser mayor o igual a la página inicial"
-            
-            # Validar quartil si está presente
-            if data.get('quartil'):
-                articulo = Articulo(quartil=data['quartil'])
-                if not articulo.validar_quartil():
-                    return None, "Quartil inválido (debe ser Q1, Q2, Q3 o Q4)"
+            # Validar que existan las referencias (una sola consulta). Sin
+            # autoflush: los cambios pendientes de la sesión se escriben una
+            # sola vez, en el commit
+            with db.session.no_autoflush:
+                error = ArticleController._validate_references(data)
+            if error:
+                return None, error
             
             # Crear el artículo
             articulo = Articulo(**data)
@@ -132,7 +436,9 @@ class ArticleController:
         anio: Optional[int] = None,
         autor_id: Optional[int] = None,
         query: Optional[str] = None,
-        para_curriculum: Optional[bool] = None
+        para_curriculum: Optional[bool] = None,
+        count: bool = True,
+        approximate_total: bool = False
     ) -> Tuple[Any, Optional[str]]:
         """
         Obtiene todos los artículos con paginación y filtros.
@@ -147,6 +453,10 @@ class ArticleController:
             autor_id: Filtrar por autor
             query: Búsqueda por texto
             para_curriculum: Filtrar por inclusión en curriculum
+            count: Si es False no se ejecuta SELECT count(*); pagination.total
+                   y pagination.pages no estarán disponibles, pero has_next sí
+            approximate_total: Sin filtros, usar la estimación del motor
+                   (_fast_count) como total en lugar de un conteo exacto
             
         Returns:
             Tuple (pagination, error_message)
@@ -172,18 +482,113 @@ class ArticleController:
                 para_curriculum=para_curriculum
             )
             
-            # Ordenar por fecha de creación descendente
-            articles_query = articles_query.order_by(Articulo.created_at.desc())
+            # Conteo sin ORDER BY ni columnas: permite index-only scans
+            count_select = articles_query.statement\
+                .with_only_columns(db.func.count(Articulo.id))\
+                .order_by(None)
             
-            # Paginar usando db.paginate en lugar de query.paginate
-            pagination = db.paginate(
-                articles_query,
+            # Ordenar por fecha de creación descendente
+            articles_query = articles_query.order_by(Articulo.created_at.desc())\
+                .options(*ArticleController._list_loader_options())
+            
+            # Total aproximado: solo tiene sentido sobre la tabla completa
+            total_aproximado = None
+            sin_filtros = not any((query, tipo_id, estado_id, lgac_id, anio, autor_id)) \
+                and para_curriculum is None
+            if count and approximate_total and sin_filtros:
+                total_aproximado = ArticleController._fast_count()
+            
+            pagination = _ArticlePagination(
+                select=articles_query.statement,
+                session=db.session(),
+                count_select=count_select,
+                total_aproximado=total_aproximado,
                 page=page,
                 per_page=per_page,
-                error_out=False
+                max_per_page=None,
+                error_out=False,
+                count=count
             )
             
             return pagination, None
+        
+        except SQLAlchemyError as e:
+            return None, f"Error al obtener artículos: {str(e)}"
+        
+        except Exception as e:
+            return None, f"Error inesperado: {str(e)}"
+    
+    @staticmethod
+    def get_all_keyset(
+        cursor: Optional[str] = None,
+        per_page: int = 20,
+        tipo_id: Optional[int] = None,
+        estado_id: Optional[int] = None,
+        lgac_id: Optional[int] = None,
+        anio: Optional[int] = None,
+        autor_id: Optional[int] = None,
+        query: Optional[str] = None,
+        para_curriculum: Optional[bool] = None
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Obtiene artículos con paginación por cursor (keyset).
+        
+        A diferencia de get_all, no usa OFFSET ni ejecuta SELECT count(*):
+        cada página es un rango sobre el índice (created_at, id), por lo que
+        el costo no depende de la profundidad de la página.
+        
+        Args:
+            cursor: Cursor opaco devuelto en la página anterior (None = primera página)
+            per_page: Artículos por página
+            (resto de filtros igual que get_all)
+        
+        Returns:
+            Tuple (resultado, error_message)
+            - Si exitoso: ({'items', 'next_cursor', 'has_next'}, None)
+            - Si falla: (None, mensaje_error)
+        """
+        try:
+            if per_page < 1 or per_page > 100:
+                return None, "Los artículos por página deben estar entre 1 y 100"
+            
+            articles_query = Articulo.buscar(
+                query=query,
+                tipo_id=tipo_id,
+                estado_id=estado_id,
+                lgac_id=lgac_id,
+                anio=anio,
+                autor_id=autor_id,
+                para_curriculum=para_curriculum
+            )
+            
+            if cursor:
+                posicion = _decode_cursor(cursor)
+                if posicion is None:
+                    return None, "Cursor de paginación inválido"
+                articles_query = articles_query.filter(
+                    tuple_(Articulo.created_at, Articulo.id) < tuple_(*posicion)
+                )
+            
+            # Se pide una fila extra para saber si hay página siguiente
+            items = articles_query.order_by(
+                Articulo.created_at.desc(),
+                Articulo.id.desc()
+            ).options(
+                *ArticleController._list_loader_options()
+            ).limit(per_page + 1).all()
+            
+            has_next = len(items) > per_page
+            items = items[:per_page]
+            next_cursor = None
+            if has_next:
+                ultimo = items[-1]
+                next_cursor = _encode_cursor(ultimo.created_at, ultimo.id)
+            
+            return {
+                'items': items,
+                'next_cursor': next_cursor,
+                'has_next': has_next
+            }, None
             
         except SQLAlchemyError as e:
             return None, f"Error al obtener artículos: {str(e)}"
@@ -205,7 +610,9 @@ class ArticleController:
             - Si no existe: (None, mensaje_error)
         """
         try:
-            articulo = Articulo.query.get(article_id)
+            articulo = db.session.get(
+                Articulo, article_id, options=ArticleController._detail_loader_options()
+            )
             
             if not articulo:
                 return None, f"No se encontró el artículo con ID {article_id}"
@@ -232,87 +639,41 @@ class ArticleController:
             - Si exitoso: (articulo_actualizado, None)
             - Si falla: (None, mensaje_error)
         """
+        # Validaciones sin acceso a BD: fuera del try, antes de cargar el artículo
+        if 'titulo' in data and not data['titulo']:
+            return None, "El título no puede estar vacío"
+        
+        # Convertir valores vacíos a None para campos opcionales
+        data = _normalizar_datos(data)
+        
+        error = ArticleController._validate_formats(data)
+        if error:
+            return None, error
+        
         try:
-            articulo = Articulo.query.get(article_id)
-            
-            if not articulo:
-                return None, f"No se encontró el artículo con ID {article_id}"
-            
-            # Validar campos si están presentes
-            if 'titulo' in data and not data['titulo']:
-                return None, "El título no puede estar vacío"
-            
-            # Convertir valores vacíos a None para campos opcionales
-            for field in ['proposito_id', 'lgac_id', 'revista_id']:
-                if field in data and data[field] == 0:
-                    data[field] = None
-            
-            # Validar referencias si están presentes
-            if 'tipo_produccion_id' in data and data['tipo_produccion_id']:
-                tipo = TipoProduccion.query.get(data['tipo_produccion_id'])
-                if not tipo:
-                    return None, "Tipo de producción inválido"
-            
-            if 'estado_id' in data and data['estado_id']:
-                estado = Estado.query.get(data['estado_id'])
-                if not estado:
-                    return None, "Estado inválido"
-            
-            if 'proposito_id' in data and data['proposito_id']:
-                proposito = Proposito.query.get(data['proposito_id'])
-                if not proposito:
-                    return None, "Propósito inválido"
-            
-            if 'lgac_id' in data and data['lgac_id']:
-                lgac = LGAC.query.get(data['lgac_id'])
-                if not lgac:
-                    return None, "LGAC inválido"
-            
-            if 'revista_id' in data and data['revista_id']:
-                revista = Revista.query.get(data['revista_id'])
-                if not revista:
-                    return None, "Revista inválida"
-            
-            # Validar DOI si está presente
-            if 'doi' in data and data['doi']:
-                temp_articulo = Articulo(doi=data['doi'])
-                if not temp_articulo.validar_doi():
-                    return None, "Formato de DOI inválido (debe ser 10.xxxx/xxxxx)"
-            
-            # Validar ISSN si está presente
-            if 'issn' in data and data['issn']:
-                temp_articulo = Articulo(issn=data['issn'])
-                if not temp_articulo.validar_issn():
-                    return None, "Formato de ISSN inválido (debe ser XXXX-XXXX)"
-            
-            # Validar año si está presente
-            if 'anio_publicacion' in data and data['anio_publicacion']:
-                temp_articulo = Articulo(anio_publicacion=data['anio_publicacion'])
-                if not temp_articulo.validar_anio():
-                    return None, "Año inválido (debe estar entre 1900 y año actual + 1)"
-            
-            # Validar páginas si están presentes
-            pagina_inicio = data.get('pagina_inicio', articulo.pagina_inicio)
-            pagina_fin = data.get('pagina_fin', articulo.pagina_fin)
-            
-            if pagina_inicio and pagina_fin:
-                articulo_temp = Articulo(
-                    pagina_inicio=pagina_inicio,
-                    pagina_fin=pagina_fin
-                )
-                if not articulo_temp.validar_paginas():
+            # Lecturas sin autoflush: los cambios pendientes de la sesión se
+            # escriben una sola vez, en el commit
+            with db.session.no_autoflush:
+                articulo = db.session.get(Articulo, article_id)
+                
+                if not articulo:
+                    return None, f"No se encontró el artículo con ID {article_id}"
+                
+                # Validar páginas (combinando con los valores actuales)
+                pagina_inicio = data.get('pagina_inicio', articulo.pagina_inicio)
+                pagina_fin = data.get('pagina_fin', articulo.pagina_fin)
+                
+                if not Articulo.son_paginas_validas(pagina_inicio, pagina_fin):
                     return None, "La página final debe ser mayor o igual a la página inicial"
+                
+                # Validar referencias si están presentes (una sola consulta)
+                error = ArticleController._validate_references(data)
+                if error:
+                    return None, error
             
-            # Validar quartil si está presente
-            if 'quartil' in data and data['quartil']:
-                temp_articulo = Articulo(quartil=data['quartil'])
-                if not temp_articulo.validar_quartil():
-                    return None, "Quartil inválido (debe ser Q1, Q2, Q3 o Q4)"
-            
-            # Actualizar campos
-            for key, value in data.items():
-                if hasattr(articulo, key):
-                    setattr(articulo, key, value)
+            # Actualizar solo columnas del modelo (ignora relaciones, métodos y llaves desconocidas)
+            for key in data.keys() & Articulo._COLUMNAS_ACTUALIZABLES:
+                setattr(articulo, key, data[key])
             
             db.session.commit()
             
@@ -346,21 +707,26 @@ class ArticleController:
             - Si falla: (False, mensaje_error)
         """
         try:
-            articulo = Articulo.query.get(article_id)
-            
-            if not articulo:
-                return False, f"No se encontró el artículo con ID {article_id}"
-            
             if soft:
-                # Eliminación lógica - marcar como inactivo
-                articulo.activo = False
+                # Eliminación lógica - un solo UPDATE, sin cargar el artículo
+                resultado = db.session.execute(
+                    update(Articulo)
+                    .where(Articulo.id == article_id)
+                    .values(activo=False)
+                )
+                
+                if resultado.rowcount == 0:
+                    return False, f"No se encontró el artículo con ID {article_id}"
+                
                 db.session.commit()
             else:
-                # Eliminación física - borrar de la base de datos
-                # Primero eliminar las relaciones N:N
-                ArticuloAutor.query.filter_by(articulo_id=article_id).delete()
+                articulo = db.session.get(Articulo, article_id)
+                
+                if not articulo:
+                    return False, f"No se encontró el artículo con ID {article_id}"
                 
-                # Eliminar el artículo
+                # Eliminación física - borrar de la base de datos.
+                # Las relaciones N:N se eliminan por ON DELETE CASCADE
                 db.session.delete(articulo)
                 db.session.commit()
             
@@ -392,7 +758,11 @@ class ArticleController:
             - Si falla: (None, mensaje_error)
         """
         try:
-            articulo = Articulo.query.get(article_id)
+            # Solo se necesita la columna activo
+            articulo = db.session.get(
+                Articulo, article_id,
+                options=[load_only(Articulo.id, Articulo.activo), lazyload('*')]
+            )
             
             if not articulo:
                 return None, f"No se encontró el artículo con ID {article_id}"
@@ -432,28 +802,43 @@ class ArticleController:
             - Si falla: (False, mensaje_error)
         """
         try:
-            articulo = Articulo.query.get(article_id)
-            if not articulo:
-                return False, f"No se encontró el artículo con ID {article_id}"
+            # Un solo INSERT ... SELECT que solo inserta si existen artículo y
+            # autor, e ignora el duplicado gracias a uq_articulo_autor
+            valores = db.select(
+                db.literal(article_id, db.Integer),
+                db.literal(author_id, db.Integer),
+                db.literal(orden, db.Integer),
+                db.literal(es_corresponsal, db.Boolean)
+            ).where(
+                db.exists().where(Articulo.id == article_id),
+                db.exists().where(Autor.id == author_id)
+            )
+            stmt = _insert_ignorando_duplicados(
+                ArticuloAutor,
+                ['articulo_id', 'autor_id', 'orden', 'es_corresponsal'],
+                valores,
+                index_elements=['articulo_id', 'autor_id']
+            )
             
-            autor = Autor.query.get(author_id)
-            if not autor:
-                return False, f"No se encontró el autor con ID {author_id}"
+            try:
+                insertados = db.session.execute(stmt).rowcount
+            except IntegrityError:
+                # Dialectos sin soporte para ignorar conflictos
+                db.session.rollback()
+                insertados = 0
             
-            # Verificar si ya existe la relación
-            relacion = ArticuloAutor.query.filter_by(
-                articulo_id=article_id,
-                autor_id=author_id
-            ).first()
+            if insertados:
+                db.session.commit()
+                return True, None
             
-            if relacion:
-                return False, "El autor ya está asociado a este artículo"
+            # No se insertó nada: determinar el motivo solo en la ruta de error
+            if db.session.get(Articulo, article_id) is None:
+                return False, f"No se encontró el artículo con ID {article_id}"
             
-            # Agregar el autor usando el método del modelo
-            articulo.agregar_autor(autor, orden, es_corresponsal)
-            db.session.commit()
+            if db.session.get(Autor, author_id) is None:
+                return False, f"No se encontró el autor con ID {author_id}"
             
-            return True, None
+            return False, "El autor ya está asociado a este artículo"
             
         except SQLAlchemyError as e:
             db.session.rollback()
@@ -478,11 +863,11 @@ class ArticleController:
             - Si falla: (False, mensaje_error)
         """
         try:
-            articulo = Articulo.query.get(article_id)
+            articulo = db.session.get(Articulo, article_id)
             if not articulo:
                 return False, f"No se encontró el artículo con ID {article_id}"
             
-            autor = Autor.query.get(author_id)
+            autor = db.session.get(Autor, author_id)
             if not autor:
                 return False, f"No se encontró el autor con ID {author_id}"
             
@@ -515,53 +900,68 @@ class ArticleController:
             - Si falla: (None, mensaje_error)
         """
         try:
+            # Las estadísticas solo cambian al escribir artículos (ver app.utils.cache)
+            stats = get_cached_statistics()
+            if stats is not None:
+                return stats, None
+            
+            activos = Articulo.activo == True
+            conteo = db.func.count(Articulo.id)
+            
+            def etiqueta(nombre):
+                return db.literal(nombre, db.String).label('metrica')
+            
+            sin_clave = db.null().cast(db.String).label('clave')
+            
+            # Los 10 años más recientes: ORDER BY/LIMIT dentro de una subconsulta
+            anios = db.select(
+                Articulo.anio_publicacion.label('anio'),
+                conteo.label('total')
+            ).where(
+                activos,
+                Articulo.anio_publicacion.isnot(None)
+            ).group_by(Articulo.anio_publicacion).order_by(
+                Articulo.anio_publicacion.desc()
+            ).limit(10).subquery()
+            
+            # Todas las métricas en un solo round-trip, etiquetadas por 'metrica'
+            consulta = db.union_all(
+                db.select(etiqueta('total'), sin_clave, conteo).where(activos),
+                # Por id (índice activo, estado_id) en lugar de unir con estados
+                db.select(etiqueta('publicados'), sin_clave, conteo)
+                    .where(activos, Articulo.estado_id == get_estado_id('Publicado')),
+                db.select(etiqueta('para_curriculum'), sin_clave, conteo)
+                    .where(activos, Articulo.para_curriculum == True),
+                db.select(etiqueta('por_tipo'), TipoProduccion.nombre, conteo)
+                    .join(Articulo, Articulo.tipo_produccion_id == TipoProduccion.id)
+                    .where(activos).group_by(TipoProduccion.nombre),
+                db.select(etiqueta('por_estado'), Estado.nombre, conteo)
+                    .join(Articulo, Articulo.estado_id == Estado.id)
+                    .where(activos).group_by(Estado.nombre),
+                db.select(etiqueta('por_anio'), anios.c.anio.cast(db.String), anios.c.total)
+            )
+            
             stats = {
-                'total': Articulo.query.filter_by(activo=True).count(),
+                'total': 0,
                 'por_tipo': {},
                 'por_estado': {},
                 'por_anio': {},
-                'publicados': Articulo.query.join(Estado).filter(
-                    Articulo.activo == True,
-                    Estado.nombre == 'Publicado'
-                ).count(),
-                'para_curriculum': Articulo.query.filter_by(
-                    activo=True,
-                    para_curriculum=True
-                ).count()
+                'publicados': 0,
+                'para_curriculum': 0
             }
             
-            # Estadísticas por tipo
-            tipos = db.session.query(
-                TipoProduccion.nombre,
-                db.func.count(Articulo.id)
-            ).join(Articulo).filter(Articulo.activo == True).group_by(
-                TipoProduccion.nombre
-            ).all()
-            
-            stats['por_tipo'] = {tipo: count for tipo, count in tipos}
-            
-            # Estadísticas por estado
-            estados = db.session.query(
-                Estado.nombre,
-                db.func.count(Articulo.id)
-            ).join(Articulo).filter(Articulo.activo == True).group_by(
-                Estado.nombre
-            ).all()
-            
-            stats['por_estado'] = {estado: count for estado, count in estados}
-            
-            # Estadísticas por año
-            anios = db.session.query(
-                Articulo.anio_publicacion,
-                db.func.count(Articulo.id)
-            ).filter(
-                Articulo.activo == True,
-                Articulo.anio_publicacion.isnot(None)
-            ).group_by(Articulo.anio_publicacion).order_by(
-                Articulo.anio_publicacion.desc()
-            ).limit(10).all()
+            for metrica, clave, total in db.session.execute(consulta):
+                if metrica == 'por_anio':
+                    stats['por_anio'][int(clave)] = total
+                elif clave is None:
+                    stats[metrica] = total
+                else:
+                    stats[metrica][clave] = total
+            
+            # Conservar el orden descendente por año del resultado original
+            stats['por_anio'] = dict(sorted(stats['por_anio'].items(), reverse=True))
             
-            stats['por_anio'] = {anio: count for anio, count in anios if anio}
+            set_cached_statistics(stats, current_app.config.get('STATS_CACHE_TIMEOUT', 60))
             
             return stats, None
             
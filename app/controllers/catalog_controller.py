@@ -197,11 +197,11 @@ class CatalogController:
         Returns:
             (registro_creado, error_message)
         """
+        model = cls.get_model(catalog_name)
+        if not model:
+            return None, f"Catálogo '{catalog_name}' no encontrado"
+        
         try:
-            model = cls.get_model(catalog_name)
-            if not model:
-                return None, f"Catálogo '{catalog_name}' no encontrado"
-            
             # Crear instancia
             registro = model(**data)
             
@@ -1,25 +1,44 @@
 """
 Controlador para generación de reportes y exportaciones.
 """
-from typing import List, Optional, Dict, Any
+from collections import Counter
+from typing import Iterator, List, Optional, Dict, Any, Tuple
 from flask import send_file
-from sqlalchemy import or_, and_
+from sqlalchemy import or_, and_, case, func
 from app.models.articulo import Articulo
-from app.models.autor import Autor
 from app.models.catalogs import (
-    TipoProduccion, Estado, LGAC, Proposito, Indexacion, Pais
+    TipoProduccion, Estado, LGAC, Proposito, Pais
 )
 from app.models.revista import Revista
 from app.services.excel_service import ExcelService
+from app.utils.cache import get_catalog_name
 from app import db
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Caracteres que no deben aparecer en el nombre del archivo exportado: los
+# espacios y separadores se reemplazan por '_' y el resto de los caracteres
+# inválidos en Windows se eliminan
+_NOMBRE_ARCHIVO_TRANS = str.maketrans({
+    ' ': '_', '/': '_', '\\': '_', ':': '_', **dict.fromkeys('<>|"*?', '')
+})
+
+
+def _sanitizar_para_nombre_archivo(texto: str) -> str:
+    """
+    Convierte texto a minúsculas, reemplaza espacios, separadores de ruta y
+    ':' por '_' y elimina los caracteres <>|"*? (inválidos en Windows).
+    """
+    return texto.lower().translate(_NOMBRE_ARCHIVO_TRANS)
+
 
 class ReportController:
     """Controlador para manejo de reportes y exportaciones."""
     
+    # Artículos por lote al recorrer la exportación
+    EXPORT_BATCH_SIZE = 500
+    
     def __init__(self):
         """Inicializa el controlador."""
         self.excel_service = ExcelService()
@@ -43,19 +62,28 @@ class ReportController:
                 - activo: True/False (default True)
         
         Returns:
-            Tupla (BytesIO, filename) con el archivo Excel y su nombre
+            Tupla (archivo, filename) con el archivo Excel y su nombre
         """
         try:
-            # Construir query con filtros
-            articulos = self._build_filtered_query(filters)
+            # Recorrer los artículos como filas planas de SQLAlchemy Core, por
+            # lotes, en lugar de cargar la lista completa de objetos Articulo
+            stmt = self._build_filtered_select(filters)
+            filas = self._export_rows(stmt)
+            
+            # Contar solo si hay un motor alternativo para exportaciones grandes
+            total_estimado = None
+            if self.excel_service.XLSXWRITER_DISPONIBLE:
+                total_estimado = db.session.scalar(
+                    db.select(func.count()).select_from(stmt.order_by(None).subquery())
+                )
             
             # Generar archivo Excel
-            excel_file = self.excel_service.generate(articulos)
+            excel_file, total = self.excel_service.generate_rows(filas, total_estimado)
             
             # Generar nombre de archivo
             filename = self._generate_filename(filters)
             
-            self.logger.info(f"Reporte generado: {len(articulos)} artículos")
+            self.logger.info(f"Reporte generado: {total} artículos")
             
             return excel_file, filename
             
@@ -63,30 +91,34 @@ class ReportController:
             self.logger.error(f"Error generando reporte Excel: {str(e)}")
             raise
     
-    def _build_filtered_query(self, filters: Optional[Dict[str, Any]] = None) -> List[Articulo]:
+    def _base_filter_clauses(self, filters: Optional[Dict[str, Any]] = None) -> List[Any]:
         """
-        Construye query con filtros aplicados.
+        Construye las condiciones WHERE correspondientes a los filtros.
+        
+        Las comparten la query de exportación y las consultas agregadas de
+        estadísticas, para que ambas cuenten exactamente los mismos artículos.
         
         Args:
             filters: Diccionario con filtros
-            
+        
         Returns:
-            Lista de artículos filtrados
+            Lista de expresiones SQLAlchemy (unidas con AND)
         """
-        query = Articulo.query
+        # Caso más común (exportar todo): solo artículos activos, sin revisar
+        # el resto de los filtros
+        if not filters:
+            return [Articulo.activo == True]
         
-        # Filtros por defecto
-        if filters is None:
-            filters = {}
+        clauses = []
         
         # Filtro de activos (por defecto True)
         if filters.get('activo', True):
-            query = query.filter(Articulo.activo == True)
+            clauses.append(Articulo.activo == True)
         
         # Búsqueda por texto
         if filters.get('search'):
             search_term = f"%{filters['search']}%"
-            query = query.filter(
+            clauses.append(
                 or_(
                     Articulo.titulo.ilike(search_term),
                     Articulo.titulo_revista.ilike(search_term)
@@ -95,60 +127,121 @@ class ReportController:
         
         # Filtro por rango de años
         if filters.get('anio_inicio'):
-            query = query.filter(Articulo.anio_publicacion >= filters['anio_inicio'])
+            clauses.append(Articulo.anio_publicacion >= filters['anio_inicio'])
         
         if filters.get('anio_fin'):
-            query = query.filter(Articulo.anio_publicacion <= filters['anio_fin'])
+            clauses.append(Articulo.anio_publicacion <= filters['anio_fin'])
         
         # Filtro por tipo de producción
         if filters.get('tipo_produccion_id'):
-            query = query.filter(Articulo.tipo_produccion_id == filters['tipo_produccion_id'])
+            clauses.append(Articulo.tipo_produccion_id == filters['tipo_produccion_id'])
         
         # Filtro por estado
         if filters.get('estado_id'):
-            query = query.filter(Articulo.estado_id == filters['estado_id'])
+            clauses.append(Articulo.estado_id == filters['estado_id'])
         
-        # Filtro por LGAC
+        # Filtro por LGAC (relación muchos-a-uno)
         if filters.get('lgac_id'):
-            query = query.join(Articulo.lgacs).filter(LGAC.id == filters['lgac_id'])
+            clauses.append(Articulo.lgac_id == filters['lgac_id'])
         
-        # Filtro por autor
+        # Filtro por autor: un solo EXISTS sobre articulo_autor (sin JOIN, así no
+        # hay filas duplicadas que requieran DISTINCT), resuelto con el índice
+        # (autor_id, articulo_id)
         if filters.get('autor_id'):
-            query = query.join(Articulo.articulo_autores).filter(
-                Articulo.articulo_autores.any(autor_id=filters['autor_id'])
-            )
+            clauses.append(Articulo.articulo_autores.any(autor_id=filters['autor_id']))
         
         # Filtro por indexación
         if filters.get('indexacion_id'):
-            query = query.join(Articulo.indexaciones).filter(
-                Indexacion.id == filters['indexacion_id']
+            clauses.append(
+                Articulo.articulo_indexaciones.any(indexacion_id=filters['indexacion_id'])
             )
         
         # Filtro para currículum
         if filters.get('para_curriculum') is not None:
-            query = query.filter(Articulo.para_curriculum == filters['para_curriculum'])
+            clauses.append(Articulo.para_curriculum == filters['para_curriculum'])
         
         # Filtro por completitud
         if filters.get('completo') is not None:
-            query = query.filter(Articulo.completo == filters['completo'])
+            clauses.append(Articulo.completo == filters['completo'])
         
-        # Ordenar por año descendente y título
-        query = query.order_by(
-            Articulo.anio_publicacion.desc().nullslast(),
-            Articulo.titulo
-        )
+        return clauses
+    
+    def _build_filtered_select(self, filters: Optional[Dict[str, Any]] = None):
+        """
+        Construye el SELECT de exportación con filtros aplicados.
         
-        # Eager loading de relaciones para evitar N+1 queries
-        # Nota: no se puede hacer joinedload en backrefs dinámicos, se cargan bajo demanda
-        query = query.options(
-            db.joinedload(Articulo.tipo),
-            db.joinedload(Articulo.estado),
-            db.joinedload(Articulo.revista),
-            db.joinedload(Articulo.lgac),
-            db.joinedload(Articulo.proposito)
+        Selecciona solo las columnas que escribe ExcelService, con los nombres
+        de catálogo resueltos por JOIN; todas las relaciones son muchos-a-uno,
+        así que hay un renglón por artículo.
+        
+        Args:
+            filters: Diccionario con filtros
+            
+        Returns:
+            Select (sin ejecutar) de los artículos filtrados
+        """
+        return (
+            db.select(
+                Articulo.id,
+                Articulo.titulo,
+                Articulo.anio_publicacion,
+                Articulo.titulo_revista,
+                Articulo.nombre_congreso,
+                Articulo.issn,
+                Articulo.doi,
+                Articulo.url,
+                Articulo.para_curriculum,
+                Articulo.completo,
+                Articulo.descripcion,
+                Articulo.revista_id,
+                TipoProduccion.nombre.label('tipo'),
+                Estado.nombre.label('estado'),
+                # LGAC y propósito inactivos se exportan vacíos
+                case((LGAC.activo == True, LGAC.nombre)).label('lgac'),
+                case((Proposito.activo == True, Proposito.nombre)).label('proposito'),
+                Pais.nombre.label('pais')
+            )
+            .join(Articulo.tipo)
+            .join(Articulo.estado)
+            .outerjoin(Articulo.lgac)
+            .outerjoin(Articulo.proposito)
+            .outerjoin(Articulo.revista)
+            .outerjoin(Pais, Pais.id == Revista.pais_id)
+            .where(*self._base_filter_clauses(filters))
+            # Ordenar por año descendente y título
+            .order_by(
+                Articulo.anio_publicacion.desc().nullslast(),
+                Articulo.titulo
+            )
         )
+    
+    def _export_rows(self, stmt) -> Iterator[Tuple[Any, ...]]:
+        """
+        Ejecuta el SELECT de exportación y genera las filas de Excel.
         
-        return query.all()
+        Los resultados se recorren en particiones de EXPORT_BATCH_SIZE
+        (yield_per) con cursor del lado del servidor donde el driver lo
+        admite (stream_results), así la memoria no crece con el número de
+        artículos; por cada partición se consultan juntos los autores y las
+        indexaciones de sus artículos, en lugar de una consulta por artículo.
+        """
+        resultado = db.session.execute(
+            stmt, execution_options={
+                'stream_results': True,
+                'yield_per': self.EXPORT_BATCH_SIZE
+            }
+        )
+        for lote in resultado.partitions():
+            autores = self.excel_service.autores_por_articulo([registro.id for registro in lote])
+            indexaciones = self.excel_service.indexaciones_por_articulo(
+                {registro.id: registro.revista_id for registro in lote}
+            )
+            for registro in lote:
+                yield self.excel_service.build_row(
+                    registro,
+                    autores.get(registro.id, ''),
+                    indexaciones.get(registro.id, '')
+                )
     
     def _generate_filename(self, filters: Optional[Dict[str, Any]] = None) -> str:
         """
@@ -171,22 +264,21 @@ class ReportController:
             elif filters.get('anio_fin'):
                 prefix_parts.append(f"hasta_{filters['anio_fin']}")
             
+            # Nombres de catálogo desde caché (solo se consulta la columna nombre)
             if filters.get('tipo_produccion_id'):
                 try:
-                    tipo = TipoProduccion.query.get(filters['tipo_produccion_id'])
-                    if tipo:
+                    tipo_nombre = get_catalog_name(TipoProduccion, filters['tipo_produccion_id'])
+                    if tipo_nombre:
                         # Sanitizar nombre para filename
-                        tipo_nombre = tipo.nombre.lower().replace(' ', '_')
-                        prefix_parts.append(tipo_nombre)
+                        prefix_parts.append(_sanitizar_para_nombre_archivo(tipo_nombre))
                 except:
                     pass
             
             if filters.get('estado_id'):
                 try:
-                    estado = Estado.query.get(filters['estado_id'])
-                    if estado:
-                        estado_nombre = estado.nombre.lower().replace(' ', '_')
-                        prefix_parts.append(estado_nombre)
+                    estado_nombre = get_catalog_name(Estado, filters['estado_id'])
+                    if estado_nombre:
+                        prefix_parts.append(_sanitizar_para_nombre_archivo(estado_nombre))
                 except:
                     pass
             
@@ -203,6 +295,12 @@ class ReportController:
         """
         Obtiene estadísticas de los artículos que se exportarían.
         
+        Todo se calcula con una sola consulta agrupada: no hay consultas
+        independientes que ejecutar en paralelo, y repartirla en varias (cada
+        una con su propia sesión y conexión) recorrería el conjunto filtrado
+        varias veces. Completos y para currículum también se cuentan en SQL
+        (SUM de CASE); no hay un conteo en Python sobre artículos cargados.
+        
         Args:
             filters: Diccionario con filtros
             
@@ -210,33 +308,40 @@ class ReportController:
             Diccionario con estadísticas
         """
         try:
-            articulos = self._build_filtered_query(filters)
+            clauses = self._base_filter_clauses(filters)
             
-            # Calcular estadísticas
-            total = len(articulos)
-            completos = sum(1 for a in articulos if a.completo)
-            incompletos = total - completos
-            para_curriculum = sum(1 for a in articulos if a.para_curriculum)
-            
-            # Por año
-            por_anio = {}
-            for a in articulos:
-                if a.anio_publicacion:
-                    por_anio[a.anio_publicacion] = por_anio.get(a.anio_publicacion, 0) + 1
+            # Un solo recorrido del conjunto filtrado: conteos agrupados por
+            # (año, tipo, estado), que son pocas combinaciones; los totales y
+            # los desgloses se derivan de esas filas
+            filas = db.session.execute(
+                db.select(
+                    Articulo.anio_publicacion,
+                    TipoProduccion.nombre,
+                    Estado.nombre,
+                    func.count(Articulo.id),
+                    func.sum(case((Articulo.completo == True, 1), else_=0)),
+                    func.sum(case((Articulo.para_curriculum == True, 1), else_=0))
+                )
+                .join(Articulo.tipo)
+                .join(Articulo.estado)
+                .where(*clauses)
+                .group_by(Articulo.anio_publicacion, TipoProduccion.nombre, Estado.nombre)
+            ).all()
             
-            # Por tipo de producción
-            por_tipo = {}
-            for a in articulos:
-                if a.tipo:
-                    tipo = a.tipo.nombre
-                    por_tipo[tipo] = por_tipo.get(tipo, 0) + 1
+            total = completos = para_curriculum = 0
+            por_anio = Counter()
+            por_tipo = Counter()
+            por_estado = Counter()
+            for anio, tipo, estado, cantidad, n_completos, n_curriculum in filas:
+                total += cantidad
+                completos += n_completos
+                para_curriculum += n_curriculum
+                if anio:
+                    por_anio[anio] += cantidad
+                por_tipo[tipo] += cantidad
+                por_estado[estado] += cantidad
             
-            # Por estado
-            por_estado = {}
-            for a in articulos:
-                if a.estado:
-                    estado = a.estado.nombre
-                    por_estado[estado] = por_estado.get(estado, 0) + 1
+            incompletos = total - completos
             
             return {
                 'total': total,
@@ -244,8 +349,8 @@ class ReportController:
                 'incompletos': incompletos,
                 'para_curriculum': para_curriculum,
                 'por_anio': dict(sorted(por_anio.items(), reverse=True)),
-                'por_tipo': por_tipo,
-                'por_estado': por_estado
+                'por_tipo': dict(por_tipo),
+                'por_estado': dict(por_estado)
             }
             
         except Exception as e:
@@ -15,6 +15,11 @@ import re
 from datetime import datetime
 
 
+# Validadores precompilados a nivel de módulo (se usan en cada envío del formulario)
+_DOI_MATCH = re.compile(r'^10\.\d{4,}/\S+$').match
+_ISSN_MATCH = re.compile(r'^\d{4}-\d{3}[\dX]$').match
+
+
 class AuthorSubForm(FlaskForm):
     """
     Sub-formulario para un autor individual.
@@ -252,14 +257,31 @@ class ArticleForm(FlaskForm):
     
     # === Validaciones personalizadas ===
     
+    # Instante de referencia durante validate(); None fuera de él
+    _ahora = None
+    
+    def validate(self, extra_validators=None):
+        """
+        Valida el formulario tomando la fecha actual una sola vez, así todos
+        los validadores comparan contra el mismo instante.
+        """
+        self._ahora = datetime.now()
+        try:
+            return super().validate(extra_validators=extra_validators)
+        finally:
+            self._ahora = None
+    
+    def _fecha_actual(self):
+        """Instante tomado en validate(), o el actual si se valida un campo suelto."""
+        return self._ahora or datetime.now()
+    
     def validate_doi(self, field):
         """
         Valida el formato del DOI.
         Formato esperado: 10.xxxx/xxxxx
         """
         if field.data:
-            doi_pattern = r'^10\.\d{4,}/[\S]+$'
-            if not re.match(doi_pattern, field.data):
+            if not _DOI_MATCH(field.data):
                 raise ValidationError(
                     'DOI inválido. Formato esperado: 10.xxxx/xxxxx'
                 )
@@ -270,8 +292,7 @@ class ArticleForm(FlaskForm):
         Formato esperado: XXXX-XXXX
         """
         if field.data:
-            issn_pattern = r'^\d{4}-\d{3}[\dX]$'
-            if not re.match(issn_pattern, field.data):
+            if not _ISSN_MATCH(field.data):
                 raise ValidationError(
                     'ISSN inválido. Formato esperado: XXXX-XXXX'
                 )
@@ -282,7 +303,7 @@ class ArticleForm(FlaskForm):
         No puede ser futuro (excepto año siguiente).
         """
         if field.data:
-            current_year = datetime.now().year
+            current_year = self._fecha_actual().year
             if field.data > current_year + 1:
                 raise ValidationError(
                     f'El año no puede ser mayor a {current_year + 1}'
@@ -307,7 +328,7 @@ class ArticleForm(FlaskForm):
         Valida que la fecha de publicación no sea futura.
         """
         if field.data:
-            if field.data > datetime.now().date():
+            if field.data > self._fecha_actual().date():
                 raise ValidationError(
                     'La fecha de publicación no puede ser futura'
                 )
@@ -2,86 +2,150 @@
 Utilidades para formularios.
 Funciones para poblar campos dinámicos desde la base de datos.
 """
+import functools
+from flask import current_app
+from app import db
 from app.models.catalogs import TipoProduccion, Proposito, LGAC, Estado, Indexacion
 from app.models.revista import Revista
 from app.models.autor import Autor
+from app.utils.cache import get_cached_choices, get_catalog_name
 
 
+def _opciones_cacheadas(func):
+    """
+    Cachea entre peticiones el resultado de una función populate_*_choices.
+    
+    Los catálogos casi no cambian: la caché se invalida al escribir en ellos
+    y expira tras CHOICES_CACHE_TIMEOUT segundos (ver app.utils.cache).
+    """
+    @functools.wraps(func)
+    def wrapper():
+        return get_cached_choices(
+            func.__name__, func, current_app.config.get('CHOICES_CACHE_TIMEOUT', 60)
+        )
+    return wrapper
+
+
+# Opción vacía al inicio de los select de un solo valor
+_OPCION_SELECCIONE = ((0, '-- Seleccione --'),)
+
+
+def _consultar_opciones(*columnas, order_by, where=()):
+    """
+    Consulta (id, etiqueta) directamente como columnas, sin construir objetos ORM.
+    
+    Retorna una tupla de tuplas: inmutable, así se puede compartir desde la
+    caché entre peticiones. (WTForms solo reconoce pares list/tuple, por eso
+    cada Row se convierte a tuple.)
+    """
+    stmt = db.select(*columnas).where(*where).order_by(*order_by)
+    return tuple(map(tuple, db.session.execute(stmt)))
+
+
+@_opciones_cacheadas
 def populate_tipo_produccion_choices():
     """
     Obtiene las opciones para el campo tipo_produccion_id.
     
     Returns:
-        list: Lista de tuplas (id, nombre) ordenadas alfabéticamente
+        tuple: Tupla de tuplas (id, nombre) ordenadas alfabéticamente
     """
-    tipos = TipoProduccion.query.order_by(TipoProduccion.nombre).all()
-    return [(0, '-- Seleccione --')] + [(t.id, t.nombre) for t in tipos]
+    return _OPCION_SELECCIONE + _consultar_opciones(
+        TipoProduccion.id, TipoProduccion.nombre, order_by=(TipoProduccion.nombre,)
+    )
 
 
+@_opciones_cacheadas
 def populate_proposito_choices():
     """
     Obtiene las opciones para el campo proposito_id.
     
     Returns:
-        list: Lista de tuplas (id, nombre) ordenadas alfabéticamente
+        tuple: Tupla de tuplas (id, nombre) ordenadas alfabéticamente
     """
-    propositos = Proposito.query.order_by(Proposito.nombre).all()
-    return [(0, '-- Seleccione --')] + [(p.id, p.nombre) for p in propositos]
+    return _OPCION_SELECCIONE + _consultar_opciones(
+        Proposito.id, Proposito.nombre, order_by=(Proposito.nombre,)
+    )
 
 
+@_opciones_cacheadas
 def populate_lgac_choices():
     """
     Obtiene las opciones para el campo lgac_id.
     
     Returns:
-        list: Lista de tuplas (id, nombre) ordenadas alfabéticamente
+        tuple: Tupla de tuplas (id, nombre) ordenadas alfabéticamente
     """
-    lgacs = LGAC.query.order_by(LGAC.nombre).all()
-    return [(0, '-- Seleccione --')] + [(l.id, l.nombre) for l in lgacs]
+    return _OPCION_SELECCIONE + _consultar_opciones(
+        LGAC.id, LGAC.nombre, order_by=(LGAC.nombre,)
+    )
 
 
+@_opciones_cacheadas
 def populate_estado_choices():
     """
     Obtiene las opciones para el campo estado_id.
     
     Returns:
-        list: Lista de tuplas (id, nombre) ordenadas alfabéticamente
+        tuple: Tupla de tuplas (id, nombre) ordenadas alfabéticamente
     """
-    estados = Estado.query.order_by(Estado.nombre).all()
-    return [(0, '-- Seleccione --')] + [(e.id, e.nombre) for e in estados]
+    return _OPCION_SELECCIONE + _consultar_opciones(
+        Estado.id, Estado.nombre, order_by=(Estado.nombre,)
+    )
 
 
+@_opciones_cacheadas
 def populate_revista_choices():
     """
     Obtiene las opciones para el campo revista_id.
     
     Returns:
-        list: Lista de tuplas (id, nombre) ordenadas alfabéticamente
+        tuple: Tupla de tuplas (id, nombre) ordenadas alfabéticamente
     """
-    revistas = Revista.query.order_by(Revista.nombre).all()
-    return [(0, '-- Seleccione --')] + [(r.id, r.nombre) for r in revistas]
+    return _OPCION_SELECCIONE + _consultar_opciones(
+        Revista.id, Revista.nombre, order_by=(Revista.nombre,)
+    )
 
 
+@_opciones_cacheadas
 def populate_autor_choices():
     """
     Obtiene las opciones para el campo autor_id.
     
     Returns:
-        list: Lista de tuplas (id, nombre_completo) ordenadas alfabéticamente
+        tuple: Tupla de tuplas (id, nombre_completo) ordenadas alfabéticamente
     """
-    autores = Autor.query.order_by(Autor.nombre, Autor.apellidos).all()
-    return [(0, '-- Seleccione --')] + [(a.id, a.nombre_completo) for a in autores]
+    # nombre_completo ("nombre apellidos") armado en SQL
+    return _OPCION_SELECCIONE + _consultar_opciones(
+        Autor.id, Autor.nombre + ' ' + Autor.apellidos,
+        order_by=(Autor.nombre, Autor.apellidos)
+    )
 
 
+@_opciones_cacheadas
 def populate_indexacion_choices():
     """
     Obtiene las opciones para el campo indexaciones (SelectMultipleField).
     
     Returns:
-        list: Lista de tuplas (id, nombre) ordenadas alfabéticamente
+        tuple: Tupla de tuplas (id, nombre) ordenadas alfabéticamente
     """
-    indexaciones = Indexacion.query.filter_by(activo=True).order_by(Indexacion.nombre).all()
-    return [(i.id, i.nombre) for i in indexaciones]
+    return _consultar_opciones(
+        Indexacion.id, Indexacion.nombre,
+        where=(Indexacion.activo == True,), order_by=(Indexacion.nombre,)
+    )
+
+
+# Campos de selección que se pueblan directamente: (campo, función de opciones)
+_CAMPOS_CON_OPCIONES = (
+    ('tipo_produccion_id', populate_tipo_produccion_choices),
+    ('proposito_id', populate_proposito_choices),
+    ('lgac_id', populate_lgac_choices),
+    ('estado_id', populate_estado_choices),
+    ('revista_id', populate_revista_choices),
+    ('autor_id', populate_autor_choices),
+    ('indexaciones', populate_indexacion_choices),
+)
 
 
 def populate_form_choices(form):
@@ -94,34 +158,19 @@ def populate_form_choices(form):
     Returns:
         form: El formulario con los campos poblados
     """
-    if hasattr(form, 'tipo_produccion_id'):
-        form.tipo_produccion_id.choices = populate_tipo_produccion_choices()
-    
-    if hasattr(form, 'proposito_id'):
-        form.proposito_id.choices = populate_proposito_choices()
-    
-    if hasattr(form, 'lgac_id'):
-        form.lgac_id.choices = populate_lgac_choices()
-    
-    if hasattr(form, 'estado_id'):
-        form.estado_id.choices = populate_estado_choices()
-    
-    if hasattr(form, 'revista_id'):
-        form.revista_id.choices = populate_revista_choices()
-    
-    if hasattr(form, 'autor_id'):
-        form.autor_id.choices = populate_autor_choices()
+    for nombre, opciones in _CAMPOS_CON_OPCIONES:
+        campo = getattr(form, nombre, None)
+        if campo is not None:
+            campo.choices = opciones()
     
     # Poblar choices de autores en sub-formularios
-    if hasattr(form, 'autores'):
+    autores = getattr(form, 'autores', None)
+    if autores is not None:
         autor_choices = populate_autor_choices()
-        for autor_form in form.autores:
-            if hasattr(autor_form, 'autor_id'):
-                autor_form.autor_id.choices = autor_choices
-    
-    # Poblar indexaciones
-    if hasattr(form, 'indexaciones'):
-        form.indexaciones.choices = populate_indexacion_choices()
+        for autor_form in autores:
+            campo = getattr(autor_form, 'autor_id', None)
+            if campo is not None:
+                campo.choices = autor_choices
     
     return form
 
@@ -138,10 +187,12 @@ def validate_articulo_data(form_data):
     """
     errors = {}
     
+    # Los nombres de estado y tipo salen de la caché de catálogos: en
+    # validaciones repetidas no hay consultas
+    
     # Si el estado es "Publicado", debe tener revista
     if form_data.get('estado_id'):
-        estado = Estado.query.get(form_data['estado_id'])
-        if estado and estado.nombre == 'Publicado':
+        if get_catalog_name(Estado, form_data['estado_id']) == 'Publicado':
             if not form_data.get('revista_id'):
                 errors['revista_id'] = 'La revista es obligatoria para artículos publicados'
             if not form_data.get('anio_publicacion'):
@@ -154,8 +205,8 @@ def validate_articulo_data(form_data):
     
     # Conference paper debe tener nombre de congreso
     if form_data.get('tipo_produccion_id'):
-        tipo = TipoProduccion.query.get(form_data['tipo_produccion_id'])
-        if tipo and 'conference' in tipo.nombre.lower():
+        tipo_nombre = get_catalog_name(TipoProduccion, form_data['tipo_produccion_id'])
+        if tipo_nombre and 'conference' in tipo_nombre.lower():
             if not form_data.get('nombre_congreso'):
                 errors['nombre_congreso'] = 'El nombre del congreso es obligatorio para conference papers'
     
@@ -2,9 +2,67 @@
 Modelo de Artículo.
 Modelo principal del sistema que representa una producción académica.
 """
+import json
+import re
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+from operator import attrgetter
+from sqlalchemy import inspect
+from sqlalchemy.orm import validates
 from app import db
 
+# orjson (extensión en C) si está instalada; si no, json de la biblioteca estándar
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Validadores precompilados a nivel de módulo (se usan en cada alta/edición)
+_DOI_MATCH = re.compile(r'^10\.\d{4,9}/[-._;()/:A-Z0-9]+$', re.IGNORECASE).match
+_ISSN_MATCH = re.compile(r'^\d{4}-\d{3}[\dX]$').match
+_QUARTILES = frozenset(('Q1', 'Q2', 'Q3', 'Q4'))
+
+
+def _serializar_faltantes(faltantes):
+    """
+    Serializa la lista de campos faltantes para campos_faltantes (None si
+    está vacía). Ambas ramas producen el mismo JSON compacto y sin escapar
+    acentos.
+    """
+    if not faltantes:
+        return None
+    if orjson is not None:
+        return orjson.dumps(faltantes).decode()
+    return json.dumps(faltantes, ensure_ascii=False, separators=(',', ':'))
+
+
+# Documento de búsqueda de texto completo de Articulo.buscar (PostgreSQL).
+# La consulta usa exactamente la misma expresión que el índice
+# ix_articulos_busqueda_fts para que el planificador lo aproveche
+_VECTOR_BUSQUEDA_SQL = (
+    "to_tsvector('spanish', coalesce(titulo, '') || ' ' || coalesce(titulo_revista, ''))"
+)
+
+
+# Campos obligatorios de calcular_completitud: (atributo, nombre mostrado)
+_CAMPOS_OBLIGATORIOS = (
+    ('titulo', 'Título'),
+    ('tipo_produccion_id', 'Tipo de producción'),
+    ('estado_id', 'Estado'),
+    ('anio_publicacion', 'Año de publicación'),
+)
+
+# Campos adicionales obligatorios para artículos publicados
+_CAMPOS_OBLIGATORIOS_PUBLICADO = (
+    ('revista_id', 'Revista'),
+    ('volumen', 'Volumen'),
+    ('numero', 'Número'),
+    ('pagina_inicio', 'Página inicio'),
+    ('pagina_fin', 'Página fin'),
+)
+
 
 class Articulo(db.Model):
     """
@@ -12,6 +70,32 @@ class Articulo(db.Model):
     Contiene todos los campos necesarios para el Excel del CA.
     """
     __tablename__ = 'articulos'
+    __table_args__ = (
+        # Soporta la paginación por cursor (keyset) de ArticleController.get_all_keyset
+        db.Index('ix_articulos_created_at_id', 'created_at', 'id'),
+        # Conteos por estado de artículos activos (p. ej. 'publicados' en estadísticas)
+        db.Index('ix_articulos_activo_estado_id', 'activo', 'estado_id'),
+        # Filtros de Articulo.buscar por año y tipo sobre artículos activos
+        db.Index('ix_articulos_activo_anio_tipo', 'activo', 'anio_publicacion',
+                 'tipo_produccion_id'),
+        # Búsqueda ILIKE '%texto%' de Articulo.buscar (solo PostgreSQL, pg_trgm)
+        db.Index('ix_articulos_titulo_trgm', 'titulo',
+                 postgresql_using='gin',
+                 postgresql_ops={'titulo': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
+        db.Index('ix_articulos_titulo_revista_trgm', 'titulo_revista',
+                 postgresql_using='gin',
+                 postgresql_ops={'titulo_revista': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
+        # Formato de los identificadores validado también por la base (solo
+        # PostgreSQL, que admite expresiones regulares en CHECK)
+        db.CheckConstraint(r"doi ~ '^10\.[0-9]{4,9}/.+'",
+                           name='ck_articulos_doi_formato').ddl_if(dialect='postgresql'),
+        db.CheckConstraint(r"issn ~ '^[0-9]{4}-[0-9]{3}[0-9X]$'",
+                           name='ck_articulos_issn_formato').ddl_if(dialect='postgresql'),
+        # Búsqueda de texto completo de Articulo.buscar (solo PostgreSQL)
+        db.Index('ix_articulos_busqueda_fts', db.text(_VECTOR_BUSQUEDA_SQL),
+                 postgresql_using='gin').ddl_if(dialect='postgresql'),
+        # ix_articulos_activos_anio_titulo se declara después de la clase
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     
@@ -69,20 +153,25 @@ class Articulo(db.Model):
                           onupdate=datetime.utcnow)
     
     # === Relaciones ===
+    # Carga perezosa por defecto: cada consulta indica con options() las
+    # relaciones que va a usar (ver ArticleController._list_loader_options y
+    # _detail_loader_options). Al ser muchos-a-uno, una carga perezosa de un
+    # catálogo ya presente en la sesión no genera consulta.
+    
     # Relación con TipoProduccion (muchos a uno)
-    tipo = db.relationship('TipoProduccion', back_populates='articulos', lazy='joined')
+    tipo = db.relationship('TipoProduccion', back_populates='articulos')
     
     # Relación con Proposito (muchos a uno)
-    proposito = db.relationship('Proposito', back_populates='articulos', lazy='joined')
+    proposito = db.relationship('Proposito', back_populates='articulos')
     
     # Relación con LGAC (muchos a uno)
-    lgac = db.relationship('LGAC', back_populates='articulos', lazy='joined')
+    lgac = db.relationship('LGAC', back_populates='articulos')
     
     # Relación con Estado (muchos a uno)
-    estado = db.relationship('Estado', back_populates='articulos', lazy='joined')
+    estado = db.relationship('Estado', back_populates='articulos')
     
     # Relación con Revista (muchos a uno)
-    revista = db.relationship('Revista', back_populates='articulos', lazy='joined')
+    revista = db.relationship('Revista', back_populates='articulos')
     
     # Nota: Las relaciones N:N con Autores e Indexaciones están definidas
     # en las tablas intermedias ArticuloAutor y ArticuloIndexacion
@@ -112,9 +201,19 @@ class Articulo(db.Model):
     def es_conference_paper(self):
         """Indica si es un artículo de conferencia."""
         if self.tipo:
-            return 'conference' in self.tipo.nombre.lower() or 'congreso' in self.tipo.nombre.lower()
+            return self._es_tipo_conference(self.tipo.nombre)
         return False
     
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _es_tipo_conference(nombre_tipo):
+        """
+        Indica si el nombre del tipo de producción corresponde a un congreso.
+        Memoizada por nombre: hay pocos tipos y se consulta por cada artículo.
+        """
+        nombre_tipo = nombre_tipo.lower()
+        return 'conference' in nombre_tipo or 'congreso' in nombre_tipo
+    
     def to_dict(self, include_relations=False):
         """
         Convierte el artículo a diccionario.
@@ -122,41 +221,27 @@ class Articulo(db.Model):
         Args:
             include_relations: Si es True, incluye autores e indexaciones.
         """
-        data = {
-            'id': self.id,
-            'titulo': self.titulo,
-            'titulo_revista': self.titulo_revista,
-            'tipo_produccion_id': self.tipo_produccion_id,
-            'tipo_produccion': self.tipo.nombre if self.tipo else None,
-            'proposito_id': self.proposito_id,
-            'proposito': self.proposito.nombre if self.proposito else None,
-            'lgac_id': self.lgac_id,
-            'lgac': self.lgac.nombre if self.lgac else None,
-            'estado_id': self.estado_id,
-            'estado': self.estado.nombre if self.estado else None,
-            'anio_publicacion': self.anio_publicacion,
-            'fecha_publicacion': self.fecha_publicacion.isoformat() if self.fecha_publicacion else None,
-            'fecha_aceptacion': self.fecha_aceptacion.isoformat() if self.fecha_aceptacion else None,
-            'revista_id': self.revista_id,
-            'revista': self.revista.nombre if self.revista else None,
-            'volumen': self.volumen,
-            'numero': self.numero,
-            'paginas': self.paginas,
-            'pagina_inicio': self.pagina_inicio,
-            'pagina_fin': self.pagina_fin,
-            'doi': self.doi,
-            'url': self.url,
-            'issn': self.issn,
-            'nombre_congreso': self.nombre_congreso,
-            'para_curriculum': self.para_curriculum,
-            'factor_impacto': self.factor_impacto,
-            'quartil': self.quartil,
-            'citas': self.citas,
-            'completo': self.completo,
-            'campos_faltantes': self.campos_faltantes,
-            'archivo_origen': self.archivo_origen,
-            'activo': self.activo
-        }
+        # Las columnas se leen del diccionario de estado de la instancia en
+        # lugar de pasar por el descriptor instrumentado de cada atributo
+        valores = inspect(self).dict
+        for clave in self._COLUMNAS_TO_DICT:
+            if clave not in valores:
+                # Expirada (p. ej. tras un commit): el primer acceso recarga
+                # todas las columnas expiradas de una vez
+                getattr(self, clave)
+        data = {clave: valores.get(clave) for clave in self._COLUMNAS_TO_DICT}
+        
+        for clave in ('fecha_publicacion', 'fecha_aceptacion'):
+            if data[clave] is not None:
+                data[clave] = data[clave].isoformat()
+        data['paginas'] = self.paginas
+        
+        # Nombres de los catálogos relacionados
+        data['tipo_produccion'] = self.tipo.nombre if self.tipo else None
+        data['proposito'] = self.proposito.nombre if self.proposito else None
+        data['lgac'] = self.lgac.nombre if self.lgac else None
+        data['estado'] = self.estado.nombre if self.estado else None
+        data['revista'] = self.revista.nombre if self.revista else None
         
         if include_relations:
             data['autores'] = [aa.autor.to_dict() for aa in self.articulo_autores]
@@ -167,151 +252,371 @@ class Articulo(db.Model):
         
         return data
     
-    def calcular_completitud(self):
+    def calcular_completitud(self, tiene_autores=None):
         """
         Calcula si el artículo tiene todos los campos obligatorios.
         Retorna True si está completo, False si faltan campos.
         Actualiza el campo campos_faltantes con la lista de campos faltantes.
+        
+        Args:
+            tiene_autores: Si ya se sabe si el artículo tiene autores
+                (ver recalcular_completitud); si es None se consulta
         """
-        import json
         from app.models.relations import ArticuloAutor
         
-        campos_obligatorios = [
-            ('titulo', 'Título'),
-            ('tipo_produccion_id', 'Tipo de producción'),
-            ('estado_id', 'Estado'),
-            ('anio_publicacion', 'Año de publicación'),
-        ]
-        
-        # Campos adicionales obligatorios para artículos publicados
-        if self.estado and self.estado.nombre.lower() == 'publicado':
-            campos_obligatorios.extend([
-                ('revista_id', 'Revista'),
-                ('volumen', 'Volumen'),
-                ('numero', 'Número'),
-                ('pagina_inicio', 'Página inicio'),
-                ('pagina_fin', 'Página fin'),
-            ])
+        faltantes = self._campos_faltantes(
+            lambda campo: getattr(self, campo, None),
+            es_publicado=bool(self.estado and self.estado.nombre.lower() == 'publicado'),
+            es_conference=self.es_conference_paper,
+        )
+        
+        # Verificar que tenga al menos un autor - hacer query directo si el objeto está persistido
+        if tiene_autores is not None:
+            if not tiene_autores:
+                faltantes.append('Autores')
+        elif self.id:
+            # Si el artículo ya existe en la DB, basta un EXISTS (se detiene
+            # en la primera fila en lugar de contarlas todas)
+            tiene_autores = db.session.scalar(db.select(
+                db.exists().where(ArticuloAutor.articulo_id == self.id)
+            ))
+            if not tiene_autores:
+                faltantes.append('Autores')
+        else:
+            # Si es un objeto nuevo, revisar los autores agregados en memoria
+            # (historial de la relación dinámica, sin consultar la base; un
+            # AppenderQuery siempre es verdadero en contexto booleano)
+            if not inspect(self).attrs.articulo_autores.history.added:
+                faltantes.append('Autores')
+        
+        self.campos_faltantes = _serializar_faltantes(faltantes)
+        self.completo = len(faltantes) == 0
+        
+        return self.completo
+    
+    @staticmethod
+    def _campos_faltantes(valor_de, es_publicado, es_conference):
+        """
+        Nombres de los campos obligatorios vacíos (sin contar autores).
+        
+        Args:
+            valor_de: Función que recibe el nombre de un campo y retorna su valor
+            es_publicado: Si el estado es 'Publicado'
+            es_conference: Si el tipo de producción es de congreso
+        """
+        campos_obligatorios = list(_CAMPOS_OBLIGATORIOS)
+        if es_publicado:
+            campos_obligatorios.extend(_CAMPOS_OBLIGATORIOS_PUBLICADO)
         
         # Si es conference paper, el nombre del congreso es obligatorio
-        if self.es_conference_paper:
+        if es_conference:
             campos_obligatorios.append(('nombre_congreso', 'Nombre del congreso'))
         
         faltantes = []
         for campo, nombre in campos_obligatorios:
-            valor = getattr(self, campo, None)
+            valor = valor_de(campo)
             if valor is None or (isinstance(valor, str) and not valor.strip()):
                 faltantes.append(nombre)
+        return faltantes
+    
+    @classmethod
+    def recalcular_completitud_bulk(cls, ids=None, tamano_lote=10000):
+        """
+        Recalcula completo y campos_faltantes directamente en SQL, sin
+        cargar los artículos como objetos: una consulta con los campos
+        obligatorios, los nombres de estado y tipo y el conteo de autores
+        (LEFT JOIN + GROUP BY), y un UPDATE masivo por clave primaria cada
+        tamano_lote artículos.
         
-        # Verificar que tenga al menos un autor - hacer query directo si el objeto está persistido
-        if self.id:
-            # Si el artículo ya existe en la DB, hacer un query directo
-            num_autores = db.session.query(ArticuloAutor).filter_by(articulo_id=self.id).count()
-            if num_autores == 0:
-                faltantes.append('Autores')
-        else:
-            # Si es un objeto nuevo, verificar la relación cargada
-            if not hasattr(self, 'articulo_autores') or not self.articulo_autores:
+        Los artículos ya cargados en la sesión no se refrescan; usar
+        recalcular_completitud si se van a seguir usando.
+        
+        Args:
+            ids: IDs de los artículos a recalcular (None = todos)
+            tamano_lote: Filas por cada UPDATE masivo
+        
+        Returns:
+            Número de artículos completos
+        """
+        from app.models.catalogs import Estado, TipoProduccion
+        from app.models.relations import ArticuloAutor
+        
+        campos = [campo for campo, _ in _CAMPOS_OBLIGATORIOS + _CAMPOS_OBLIGATORIOS_PUBLICADO]
+        campos.append('nombre_congreso')
+        
+        stmt = (
+            db.select(
+                cls.id, *[getattr(cls, campo) for campo in campos],
+                Estado.nombre.label('estado_nombre'),
+                TipoProduccion.nombre.label('tipo_nombre'),
+                db.func.count(ArticuloAutor.autor_id).label('num_autores'),
+            )
+            .outerjoin(Estado, Estado.id == cls.estado_id)
+            .outerjoin(TipoProduccion, TipoProduccion.id == cls.tipo_produccion_id)
+            .outerjoin(ArticuloAutor, ArticuloAutor.articulo_id == cls.id)
+            .group_by(cls.id, Estado.nombre, TipoProduccion.nombre)
+        )
+        if ids is not None:
+            stmt = stmt.where(cls.id.in_(ids))
+        
+        cambios = []
+        for fila in db.session.execute(stmt).mappings():
+            faltantes = cls._campos_faltantes(
+                fila.get,
+                es_publicado=(fila['estado_nombre'] or '').lower() == 'publicado',
+                es_conference=cls._es_tipo_conference(fila['tipo_nombre'] or ''),
+            )
+            if not fila['num_autores']:
                 faltantes.append('Autores')
+            cambios.append({
+                'id': fila['id'],
+                'completo': not faltantes,
+                'campos_faltantes': _serializar_faltantes(faltantes),
+            })
         
-        self.campos_faltantes = json.dumps(faltantes, ensure_ascii=False) if faltantes else None
-        self.completo = len(faltantes) == 0
+        for inicio in range(0, len(cambios), tamano_lote):
+            db.session.execute(db.update(cls), cambios[inicio:inicio + tamano_lote])
         
-        return self.completo
+        return sum(1 for cambio in cambios if cambio['completo'])
     
-    def to_excel_row(self):
+    def to_excel_row(self, autores_lista=None, indexaciones_lista=None):
         """
         Convierte el artículo al formato de fila para Excel del CA.
         Retorna un diccionario con las columnas del Excel.
+        
+        Args:
+            autores_lista: Nombres completos de los autores ya cargados
+                (ver to_excel_rows); si es None se consultan
+            indexaciones_lista: Nombres de las indexaciones de la revista ya
+                cargados; si es None se consultan
         """
-        autores_lista = [aa.autor.nombre_completo for aa in self.articulo_autores] if hasattr(self, 'articulo_autores') else []
+        if autores_lista is None:
+            autores_lista = [aa.autor.nombre_completo for aa in self.articulo_autores]
         
         # Obtener indexaciones de la revista
-        indexaciones_lista = []
-        if self.revista and hasattr(self.revista, 'revista_indexaciones'):
-            indexaciones_lista = [ri.indexacion.nombre for ri in self.revista.revista_indexaciones]
-        
-        return {
-            'Título del artículo': self.titulo,
-            'Tipo de producción': self.tipo.nombre if self.tipo else '',
-            'Estado': self.estado.nombre if self.estado else '',
-            'Propósito': self.proposito.nombre if self.proposito else '',
-            'LGAC': self.lgac.nombre if self.lgac else '',
-            'Autores': ', '.join(autores_lista),
-            'Nombre de la revista': self.revista.nombre if self.revista else self.titulo_revista or '',
-            'Volumen': self.volumen or '',
-            'Número': self.numero or '',
-            'Página inicio': self.pagina_inicio or '',
-            'Página fin': self.pagina_fin or '',
-            'Año de publicación': self.anio_publicacion or '',
-            'Fecha de publicación': self.fecha_publicacion.strftime('%d/%m/%Y') if self.fecha_publicacion else '',
-            'ISSN': self.issn or (self.revista.issn if self.revista else ''),
-            'País de la revista': self.revista.pais.nombre if self.revista and self.revista.pais else '',
-            'DOI': self.doi or '',
-            'URL': self.url or '',
-            'Indexaciones': ', '.join(indexaciones_lista),
-            'Factor de impacto': self.factor_impacto or '',
-            'Quartil': self.quartil or '',
-            'Nombre del congreso': self.nombre_congreso or '',
-            'Para currículum CA': 'Sí' if self.para_curriculum else 'No'
+        if indexaciones_lista is None:
+            indexaciones_lista = []
+            if self.revista:
+                indexaciones_lista = [ri.indexacion.nombre for ri in self.revista.revista_indexaciones]
+        
+        # Columnas en el orden del Excel (ver _CAMPOS_EXCEL); autores e
+        # indexaciones conservan su posición al asignarse después
+        fila = {
+            encabezado: (obtener(self) or '') if obtener else None
+            for encabezado, obtener in self._CAMPOS_EXCEL
         }
+        fila['Autores'] = ', '.join(autores_lista)
+        fila['Indexaciones'] = ', '.join(indexaciones_lista)
+        return fila
+    
+    @classmethod
+    def recalcular_completitud(cls, articulos, tamano_lote=500):
+        """
+        Ejecuta calcular_completitud sobre muchos artículos resolviendo qué
+        artículos tienen autores con una consulta por lote, en lugar de una
+        por artículo.
+        
+        Args:
+            articulos: Iterable de artículos persistidos
+            tamano_lote: Artículos por lote
+        
+        Returns:
+            Número de artículos completos
+        """
+        from app.models.relations import ArticuloAutor
+        
+        completos = 0
+        articulos = iter(articulos)
+        while True:
+            lote = list(islice(articulos, tamano_lote))
+            if not lote:
+                return completos
+            
+            con_autores = set(db.session.scalars(
+                db.select(ArticuloAutor.articulo_id).distinct()
+                .where(ArticuloAutor.articulo_id.in_([a.id for a in lote]))
+            ))
+            for articulo in lote:
+                if articulo.calcular_completitud(tiene_autores=articulo.id in con_autores):
+                    completos += 1
+    
+    @classmethod
+    def to_excel_rows(cls, articulos, tamano_lote=500):
+        """
+        Genera to_excel_row de cada artículo cargando autores e indexaciones
+        por lote: una consulta por relación cada tamano_lote artículos, en
+        lugar de varias por artículo (articulo_autores y revista_indexaciones
+        son relaciones dinámicas y no admiten selectinload).
+        
+        Args:
+            articulos: Iterable de artículos (p. ej. una query con yield_per)
+            tamano_lote: Artículos por lote
+        
+        Yields:
+            Diccionario de to_excel_row por artículo, en el mismo orden
+        """
+        from app.models.autor import Autor
+        from app.models.catalogs import Indexacion
+        from app.models.relations import ArticuloAutor, RevistaIndexacion
+        
+        articulos = iter(articulos)
+        while True:
+            lote = list(islice(articulos, tamano_lote))
+            if not lote:
+                return
+            
+            autores = {}
+            filas = db.session.execute(
+                db.select(ArticuloAutor.articulo_id, Autor.nombre, Autor.apellidos)
+                .join(ArticuloAutor.autor)
+                .where(ArticuloAutor.articulo_id.in_([a.id for a in lote]))
+                .order_by(ArticuloAutor.articulo_id, ArticuloAutor.orden)
+            )
+            for articulo_id, nombre, apellidos in filas:
+                autores.setdefault(articulo_id, []).append(f"{nombre} {apellidos}")
+            
+            indexaciones = {}
+            revista_ids = {a.revista_id for a in lote if a.revista_id}
+            if revista_ids:
+                filas = db.session.execute(
+                    db.select(RevistaIndexacion.revista_id, Indexacion.nombre)
+                    .join(RevistaIndexacion.indexacion)
+                    .where(RevistaIndexacion.revista_id.in_(revista_ids))
+                    .order_by(RevistaIndexacion.revista_id, RevistaIndexacion.id)
+                )
+                for revista_id, nombre in filas:
+                    indexaciones.setdefault(revista_id, []).append(nombre)
+            
+            for articulo in lote:
+                yield articulo.to_excel_row(
+                    autores.get(articulo.id, []),
+                    indexaciones.get(articulo.revista_id, [])
+                )
     
     # === Métodos de validación ===
     
-    def validar_doi(self):
+    @staticmethod
+    def normalizar_doi(doi):
+        """
+        Forma canónica de un DOI: sin espacios alrededor y en minúsculas (los
+        DOI no distinguen mayúsculas); None si está vacío.
+        """
+        if doi is None:
+            return None
+        return doi.strip().lower() or None
+    
+    @staticmethod
+    def normalizar_issn(issn):
+        """Forma canónica de un ISSN: sin espacios y con X mayúscula; None si está vacío."""
+        if issn is None:
+            return None
+        return issn.strip().upper() or None
+    
+    @validates('doi', 'issn')
+    def _normalizar_identificador(self, clave, valor):
+        """
+        Normaliza DOI e ISSN al asignarlos, así el índice único de doi no
+        admite el mismo DOI con distinta capitalización ni cadenas vacías.
+        """
+        if clave == 'doi':
+            return Articulo.normalizar_doi(valor)
+        return Articulo.normalizar_issn(valor)
+    
+    @staticmethod
+    def es_doi_valido(doi):
         """
-        Valida que el formato del DOI sea correcto.
+        Valida el formato de un DOI sin necesidad de crear un Articulo.
         Formato típico: 10.xxxx/xxxxx
         """
-        if not self.doi:
+        if not doi:
             return True
-        
-        import re
-        patron_doi = r'^10\.\d{4,9}/[-._;()/:A-Z0-9]+$'
-        return bool(re.match(patron_doi, self.doi, re.IGNORECASE))
+        return _DOI_MATCH(doi) is not None
     
-    def validar_issn(self):
+    @staticmethod
+    def es_issn_valido(issn):
         """
-        Valida que el formato del ISSN sea correcto.
+        Valida el formato de un ISSN sin necesidad de crear un Articulo.
         Formato: XXXX-XXXX (8 dígitos con guion)
         """
-        if not self.issn:
+        if not issn:
             return True
+        # Descarte rápido por forma antes de evaluar la expresión regular
+        if len(issn) != 9 or issn[4] != '-':
+            return False
+        return _ISSN_MATCH(issn) is not None
+    
+    @staticmethod
+    def son_dois_validos(dois):
+        """
+        Valida un lote de DOIs (p. ej. de una importación) con el mismo criterio
+        que es_doi_valido, sin una llamada a método por valor.
         
-        import re
-        patron_issn = r'^\d{4}-\d{3}[\dX]$'
-        return bool(re.match(patron_issn, self.issn))
+        Returns:
+            Lista de booleanos en el mismo orden
+        """
+        match = _DOI_MATCH
+        return [not doi or match(doi) is not None for doi in dois]
     
-    def validar_anio(self):
+    @staticmethod
+    def son_issns_validos(issns):
+        """
+        Valida un lote de ISSNs con el mismo criterio que es_issn_valido,
+        sin una llamada a método por valor.
+        
+        Returns:
+            Lista de booleanos en el mismo orden
+        """
+        match = _ISSN_MATCH
+        return [not issn or match(issn) is not None for issn in issns]
+    
+    @staticmethod
+    def es_anio_valido(anio):
         """
-        Valida que el año de publicación sea razonable.
+        Valida que un año de publicación sea razonable.
         Debe estar entre 1900 y el año actual + 2
         """
-        if not self.anio_publicacion:
+        if not anio:
             return True
-        
-        from datetime import datetime
-        anio_actual = datetime.now().year
-        return 1900 <= self.anio_publicacion <= anio_actual + 2
+        return 1900 <= anio <= datetime.now().year + 2
     
-    def validar_paginas(self):
+    @staticmethod
+    def son_paginas_validas(pagina_inicio, pagina_fin):
         """
         Valida que el rango de páginas sea coherente.
         pagina_fin debe ser mayor o igual a pagina_inicio
         """
-        if self.pagina_inicio and self.pagina_fin:
-            return self.pagina_fin >= self.pagina_inicio
+        if pagina_inicio and pagina_fin:
+            return pagina_fin >= pagina_inicio
         return True
     
-    def validar_quartil(self):
+    @staticmethod
+    def es_quartil_valido(quartil):
         """
         Valida que el quartil sea uno de los valores permitidos.
         """
-        if not self.quartil:
+        if not quartil:
             return True
-        
-        quartiles_validos = ['Q1', 'Q2', 'Q3', 'Q4']
-        return self.quartil.upper() in quartiles_validos
+        return quartil.upper() in _QUARTILES
+    
+    def validar_doi(self):
+        """Valida que el formato del DOI del artículo sea correcto."""
+        return Articulo.es_doi_valido(self.doi)
+    
+    def validar_issn(self):
+        """Valida que el formato del ISSN del artículo sea correcto."""
+        return Articulo.es_issn_valido(self.issn)
+    
+    def validar_anio(self):
+        """Valida que el año de publicación del artículo sea razonable."""
+        return Articulo.es_anio_valido(self.anio_publicacion)
+    
+    def validar_paginas(self):
+        """Valida que el rango de páginas del artículo sea coherente."""
+        return Articulo.son_paginas_validas(self.pagina_inicio, self.pagina_fin)
+    
+    def validar_quartil(self):
+        """Valida que el quartil del artículo sea uno de los valores permitidos."""
+        return Articulo.es_quartil_valido(self.quartil)
     
     def validar(self):
         """
@@ -370,6 +675,43 @@ class Articulo(db.Model):
         db.session.add(articulo_autor)
         return articulo_autor
     
+    def agregar_autores(self, autores, corresponsal=None):
+        """
+        Agrega varios autores al artículo, en orden, a continuación de los
+        que ya tenga.
+        
+        A diferencia de llamar agregar_autor por cada uno, el siguiente orden
+        se consulta una sola vez y todas las filas se insertan con un solo
+        INSERT de varias filas (executemany), sin crear objetos ArticuloAutor.
+        
+        Args:
+            autores: Lista de instancias de Autor
+            corresponsal: Autor corresponsal (opcional, debe estar en autores)
+        
+        Returns:
+            Número de autores agregados
+        """
+        from app.models.relations import ArticuloAutor
+        
+        if not autores:
+            return 0
+        
+        max_orden = db.session.scalar(
+            db.select(db.func.max(ArticuloAutor.orden))
+            .where(ArticuloAutor.articulo_id == self.id)
+        ) or 0
+        
+        db.session.execute(db.insert(ArticuloAutor), [
+            {
+                'articulo_id': self.id,
+                'autor_id': autor.id,
+                'orden': max_orden + i,
+                'es_corresponsal': corresponsal is not None and autor.id == corresponsal.id,
+            }
+            for i, autor in enumerate(autores, start=1)
+        ])
+        return len(autores)
+    
     def remover_autor(self, autor):
         """
         Remueve un autor del artículo y reorganiza los órdenes.
@@ -379,27 +721,34 @@ class Articulo(db.Model):
         """
         from app.models.relations import ArticuloAutor
         
-        # Verificar si existe la asociación antes de eliminarla
-        relacion = ArticuloAutor.query.filter_by(
-            articulo_id=self.id,
-            autor_id=autor.id
-        ).first()
+        # Eliminar la relación; el número de filas borradas indica si existía
+        resultado = db.session.execute(
+            db.delete(ArticuloAutor).where(
+                ArticuloAutor.articulo_id == self.id,
+                ArticuloAutor.autor_id == autor.id
+            )
+        )
         
-        if not relacion:
+        if not resultado.rowcount:
             return False
         
-        # Eliminar la relación
-        ArticuloAutor.query.filter_by(
-            articulo_id=self.id,
-            autor_id=autor.id
-        ).delete()
-        
-        # Reorganizar órdenes
-        autores = ArticuloAutor.query.filter_by(articulo_id=self.id)\
-            .order_by(ArticuloAutor.orden).all()
-        
-        for idx, aa in enumerate(autores, start=1):
-            aa.orden = idx
+        # Reorganizar órdenes con un solo UPDATE ... FROM: cada autor restante
+        # toma su posición (ROW_NUMBER) en el orden actual
+        numerados = db.select(
+            ArticuloAutor.id,
+            db.func.row_number().over(
+                order_by=(ArticuloAutor.orden, ArticuloAutor.id)
+            ).label('posicion')
+        ).where(ArticuloAutor.articulo_id == self.id).subquery()
+        
+        db.session.execute(
+            db.update(ArticuloAutor)
+            .where(
+                ArticuloAutor.id == numerados.c.id,
+                ArticuloAutor.orden != numerados.c.posicion
+            )
+            .values(orden=numerados.c.posicion)
+        )
         
         return True
     
@@ -431,21 +780,30 @@ class Articulo(db.Model):
         Combina las indexaciones de la revista y las específicas del artículo.
         
         Returns:
-            Lista de objetos Indexacion (sin duplicados)
+            Lista de objetos Indexacion (sin duplicados, primero las de la revista)
         """
-        indexaciones = set()
+        from sqlalchemy.orm import joinedload
+        from app.models.relations import ArticuloIndexacion, RevistaIndexacion
+        
+        # Sin duplicados por id, conservando el orden de aparición; cada
+        # relación se carga con su indexación en una sola consulta
+        indexaciones = {}
         
         # Indexaciones de la revista
         if self.revista:
-            for ri in self.revista.revista_indexaciones:
-                if ri.activo:
-                    indexaciones.add(ri.indexacion)
+            revista_indexaciones = self.revista.revista_indexaciones\
+                .filter(RevistaIndexacion.activo == True)\
+                .options(joinedload(RevistaIndexacion.indexacion))
+            for ri in revista_indexaciones:
+                indexaciones.setdefault(ri.indexacion_id, ri.indexacion)
         
         # Indexaciones específicas del artículo
-        for ai in self.articulo_indexaciones:
-            indexaciones.add(ai.indexacion)
+        articulo_indexaciones = self.articulo_indexaciones\
+            .options(joinedload(ArticuloIndexacion.indexacion))
+        for ai in articulo_indexaciones:
+            indexaciones.setdefault(ai.indexacion_id, ai.indexacion)
         
-        return list(indexaciones)
+        return list(indexaciones.values())
     
     @staticmethod
     def buscar(query=None, tipo_id=None, estado_id=None, lgac_id=None, 
@@ -454,7 +812,8 @@ class Articulo(db.Model):
         Método estático para búsqueda avanzada de artículos.
         
         Args:
-            query: Texto a buscar en título o revista
+            query: Texto a buscar en título o revista (en PostgreSQL, búsqueda
+                de texto completo en español; en otros motores, subcadena)
             tipo_id: ID del tipo de producción
             estado_id: ID del estado
             lgac_id: ID de la LGAC
@@ -467,33 +826,115 @@ class Articulo(db.Model):
         """
         from app.models.relations import ArticuloAutor
         
-        articulos = Articulo.query.filter_by(activo=True)
+        # Se acumulan las condiciones y se aplican con un solo filter()
+        # (cada filter()/filter_by() clona la Query)
+        condiciones = [Articulo.activo == True]
         
         if query:
-            articulos = articulos.filter(
-                db.or_(
-                    Articulo.titulo.ilike(f'%{query}%'),
-                    Articulo.titulo_revista.ilike(f'%{query}%')
+            if db.session.get_bind().dialect.name == 'postgresql':
+                # Texto completo en español (palabras y sus variantes), con
+                # índice GIN; en otros motores, subcadena con ILIKE
+                condiciones.append(
+                    db.literal_column(_VECTOR_BUSQUEDA_SQL)
+                    .op('@@', is_comparison=True)(db.func.plainto_tsquery('spanish', query))
+                )
+            else:
+                condiciones.append(
+                    db.or_(
+                        Articulo.titulo.ilike(f'%{query}%'),
+                        Articulo.titulo_revista.ilike(f'%{query}%')
+                    )
                 )
-            )
         
         if tipo_id:
-            articulos = articulos.filter_by(tipo_produccion_id=tipo_id)
+            condiciones.append(Articulo.tipo_produccion_id == tipo_id)
         
         if estado_id:
-            articulos = articulos.filter_by(estado_id=estado_id)
+            condiciones.append(Articulo.estado_id == estado_id)
         
         if lgac_id:
-            articulos = articulos.filter_by(lgac_id=lgac_id)
+            condiciones.append(Articulo.lgac_id == lgac_id)
         
         if anio:
-            articulos = articulos.filter_by(anio_publicacion=anio)
-        
-        if autor_id:
-            articulos = articulos.join(ArticuloAutor)\
-                .filter(ArticuloAutor.autor_id == autor_id)
+            condiciones.append(Articulo.anio_publicacion == anio)
         
         if para_curriculum is not None:
-            articulos = articulos.filter_by(para_curriculum=para_curriculum)
+            condiciones.append(Articulo.para_curriculum == para_curriculum)
+        
+        articulos = Articulo.query
         
-        return articulos
+        if autor_id:
+            # uq_articulo_autor garantiza a lo más una fila por artículo
+            articulos = articulos.join(ArticuloAutor)
+            condiciones.append(ArticuloAutor.autor_id == autor_id)
+        
+        return articulos.filter(*condiciones)
+
+
+# Columnas que ArticleController.update puede asignar desde un diccionario.
+# Se calcula una sola vez y excluye la llave primaria y la fecha de creación.
+Articulo._COLUMNAS_ACTUALIZABLES = frozenset(
+    columna.key for columna in Articulo.__table__.columns
+) - {'id', 'created_at'}
+
+def _nombre_relacionado(relacion):
+    """Getter del nombre del registro relacionado ('' si no hay)."""
+    obtener = attrgetter(relacion)
+    
+    def nombre(articulo):
+        relacionado = obtener(articulo)
+        return relacionado.nombre if relacionado else ''
+    return nombre
+
+
+# Columnas de to_excel_row, en orden: (encabezado, getter). Las columnas
+# simples usan attrgetter; None marca los valores que se calculan aparte
+# (autores e indexaciones)
+Articulo._CAMPOS_EXCEL = (
+    ('Título del artículo', attrgetter('titulo')),
+    ('Tipo de producción', _nombre_relacionado('tipo')),
+    ('Estado', _nombre_relacionado('estado')),
+    ('Propósito', _nombre_relacionado('proposito')),
+    ('LGAC', _nombre_relacionado('lgac')),
+    ('Autores', None),
+    ('Nombre de la revista',
+     lambda a: a.revista.nombre if a.revista else a.titulo_revista),
+    ('Volumen', attrgetter('volumen')),
+    ('Número', attrgetter('numero')),
+    ('Página inicio', attrgetter('pagina_inicio')),
+    ('Página fin', attrgetter('pagina_fin')),
+    ('Año de publicación', attrgetter('anio_publicacion')),
+    ('Fecha de publicación',
+     lambda a: a.fecha_publicacion.strftime('%d/%m/%Y') if a.fecha_publicacion else ''),
+    ('ISSN', lambda a: a.issn or (a.revista.issn if a.revista else '')),
+    ('País de la revista',
+     lambda a: a.revista.pais.nombre if a.revista and a.revista.pais else ''),
+    ('DOI', attrgetter('doi')),
+    ('URL', attrgetter('url')),
+    ('Indexaciones', None),
+    ('Factor de impacto', attrgetter('factor_impacto')),
+    ('Quartil', attrgetter('quartil')),
+    ('Nombre del congreso', attrgetter('nombre_congreso')),
+    ('Para currículum CA', lambda a: 'Sí' if a.para_curriculum else 'No'),
+)
+
+# Índice parcial solo de artículos activos (filtro por defecto de la
+# exportación y de los listados), en el mismo orden que la exportación (año
+# DESC con nulos al final, título): el motor recorre el índice en lugar de
+# ordenar todo el conjunto antes de entregar la primera fila. SQLite no admite
+# NULLS LAST en índices, pero en DESC ya deja los nulos al final y usa el
+# índice para ORDER BY ... DESC NULLS LAST. Se declara sobre las columnas (no
+# con texto SQL) para que autogenerate pueda compararlo con el reflejado
+db.Index('ix_articulos_activos_anio_titulo',
+         Articulo.anio_publicacion.desc().nulls_last(), Articulo.titulo,
+         postgresql_where=db.text('activo = true')).ddl_if(dialect='postgresql')
+db.Index('ix_articulos_activos_anio_titulo',
+         Articulo.anio_publicacion.desc(), Articulo.titulo,
+         sqlite_where=db.text('activo = 1')).ddl_if(dialect='sqlite')
+
+# Columnas que to_dict copia tal cual (todas salvo la descripción y las
+# marcas de tiempo), tomadas una sola vez del mapper
+Articulo._COLUMNAS_TO_DICT = tuple(
+    atributo.key for atributo in inspect(Articulo).column_attrs
+    if atributo.key not in ('descripcion', 'created_at', 'updated_at')
+)
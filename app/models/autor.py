@@ -2,16 +2,63 @@
 Modelo de Autor.
 Representa a los autores de artículos académicos.
 """
+import re
+import unicodedata
 from datetime import datetime
+from sqlalchemy import DDL, event
+from sqlalchemy.orm import validates
 from app import db
 
 
+# Expresiones precompiladas a nivel de módulo (normalización en importaciones
+# masivas y validación en cada alta/edición)
+_NO_LETRAS_SUB = re.compile(r'[^a-z\s]').sub
+_ORCID_MATCH = re.compile(r'^\d{4}-\d{4}-\d{4}-\d{3}[\dX]$').match
+_EMAIL_MATCH = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$').match
+
+
+class _TablaNormalizacion(dict):
+    """
+    Tabla para str.translate de normalizar_texto: lleva cada carácter a su
+    resultado normalizado (NFKD, sin lo que no sea ASCII, minúsculas y
+    espacio en lugar de lo que no sea letra o espacio). La descomposición
+    NFKD es carácter por carácter, así traducir da lo mismo que normalizar
+    el texto completo. Los caracteres no vistos se calculan y guardan al
+    encontrarlos.
+    """
+    
+    def __missing__(self, codigo):
+        texto = unicodedata.normalize('NFKD', chr(codigo))
+        texto = _NO_LETRAS_SUB(' ', texto.encode('ASCII', 'ignore').decode().lower())
+        self[codigo] = texto
+        return texto
+
+
+# Precalculada para ASCII y los bloques latinos (los nombres más comunes)
+_NORMALIZACION = _TablaNormalizacion()
+for _codigo in range(0x250):
+    _NORMALIZACION[_codigo]
+
+
 class Autor(db.Model):
     """
     Modelo para representar autores de artículos.
     Un autor puede pertenecer a múltiples artículos (relación N:N).
     """
     __tablename__ = 'autores'
+    __table_args__ = (
+        # Búsqueda exacta sin distinguir mayúsculas (buscar_por_nombre)
+        db.Index('ix_autores_lower_nombre_apellidos',
+                 db.text('lower(nombre)'), db.text('lower(apellidos)')),
+        # Índice de trigramas (solo PostgreSQL, extensión pg_trgm) para el
+        # prefiltro por similitud de buscar_fuzzy
+        db.Index('ix_autores_nombre_normalizado_trgm', 'nombre_normalizado',
+                 postgresql_using='gin',
+                 postgresql_ops={'nombre_normalizado': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
+        # Formato del ORCID validado también por la base (solo PostgreSQL)
+        db.CheckConstraint(r"orcid ~ '^[0-9]{4}-[0-9]{4}-[0-9]{4}-[0-9]{3}[0-9X]$'",
+                           name='ck_autores_orcid_formato').ddl_if(dialect='postgresql'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     nombre = db.Column(db.String(100), nullable=False)
@@ -68,26 +115,15 @@ class Autor(db.Model):
         Normaliza texto para búsqueda: sin acentos, minúsculas, sin caracteres especiales.
         Ejemplo: "Comparán-Pantoja, Francisco" -> "comparan pantoja francisco"
         """
-        import unicodedata
-        import re
-        
         if not texto:
             return ""
         
-        # Remover acentos
-        texto = unicodedata.normalize('NFKD', texto)
-        texto = texto.encode('ASCII', 'ignore').decode('utf-8')
-        
-        # Convertir a minúsculas
-        texto = texto.lower()
-        
-        # Remover puntuación y caracteres especiales, dejar solo letras y espacios
-        texto = re.sub(r'[^a-z\s]', ' ', texto)
+        # Remover acentos, convertir a minúsculas y dejar solo letras y
+        # espacios en una sola pasada (ver _TablaNormalizacion)
+        texto = texto.translate(_NORMALIZACION)
         
         # Normalizar espacios múltiples
-        texto = re.sub(r'\s+', ' ', texto).strip()
-        
-        return texto
+        return ' '.join(texto.split())
     
     @staticmethod
     def buscar_por_nombre(nombre, apellidos):
@@ -95,6 +131,8 @@ class Autor(db.Model):
         Busca un autor por nombre y apellidos (búsqueda exacta).
         Útil para evitar duplicados al importar.
         """
+        # lower() en la base para ambos lados (SQLite solo convierte ASCII);
+        # usa el índice ix_autores_lower_nombre_apellidos
         return Autor.query.filter(
             db.func.lower(Autor.nombre) == db.func.lower(nombre),
             db.func.lower(Autor.apellidos) == db.func.lower(apellidos)
@@ -104,27 +142,32 @@ class Autor(db.Model):
     def buscar_por_identificador(orcid=None, email=None, registro=None):
         """
         Busca autor por identificador único (ORCID, email o registro).
-        Retorna el primer match encontrado.
-        """
-        if orcid:
-            autor = Autor.query.filter_by(orcid=orcid).first()
-            if autor:
-                return autor
-        
-        if email:
-            autor = Autor.query.filter_by(email=email).first()
-            if autor:
-                return autor
+        Retorna el primer match encontrado, con prioridad ORCID > email > registro.
         
-        if registro:
-            autor = Autor.query.filter_by(registro=registro).first()
-            if autor:
-                return autor
-        
-        return None
+        Se resuelve en una sola consulta: los identificadores se combinan con
+        OR y la prioridad se aplica en el ORDER BY.
+        """
+        condiciones = [
+            columna == valor
+            for columna, valor in (
+                (Autor.orcid, Autor.normalizar_orcid(orcid)),
+                (Autor.email, email),
+                (Autor.registro, registro)
+            )
+            if valor
+        ]
+        if not condiciones:
+            return None
+        
+        prioridad = db.case(
+            *[(condicion, i) for i, condicion in enumerate(condiciones)],
+            else_=len(condiciones)
+        )
+        return Autor.query.filter(db.or_(*condiciones))\
+            .order_by(prioridad, Autor.id).first()
     
     @staticmethod
-    def buscar_fuzzy(texto_nombre, umbral=80):
+    def buscar_fuzzy(texto_nombre, umbral=80, limite=None):
         """
         Busca autores usando fuzzy matching sobre nombres normalizados.
         Retorna lista de tuplas (autor, score) ordenadas por similitud.
@@ -132,32 +175,55 @@ class Autor(db.Model):
         Args:
             texto_nombre: Texto a buscar (cualquier formato)
             umbral: Porcentaje mínimo de similitud (0-100)
+            limite: Máximo de resultados (los más similares); None = todos.
+                Con limite=1 RapidFuzz solo conserva el mejor candidato y se
+                carga un único Autor
         
         Returns:
             Lista de tuplas (Autor, score) con score >= umbral
         """
-        try:
-            from fuzzywuzzy import fuzz
-        except ImportError:
-            # Si no está instalada la librería, hacer búsqueda simple
-            return []
+        from rapidfuzz import fuzz, process
         
         # Normalizar el texto de búsqueda
         texto_normalizado = Autor.normalizar_texto(texto_nombre)
         
-        # Obtener todos los autores activos
-        autores = Autor.query.filter_by(activo=True).all()
+        # Prefiltro en SQL; solo se cargan id y nombre_normalizado de los candidatos.
+        # En PostgreSQL: similitud de trigramas (operador % de pg_trgm, con
+        # índice GIN). En otros motores: el nombre normalizado contiene alguna
+        # de las palabras buscadas (de 3 letras o más)
+        condiciones = [Autor.activo == True]
+        if db.session.get_bind().dialect.name == 'postgresql':
+            condiciones.append(Autor.nombre_normalizado.op('%')(texto_normalizado))
+        else:
+            palabras = [p for p in texto_normalizado.split() if len(p) >= 3]
+            if palabras:
+                condiciones.append(db.or_(*[
+                    Autor.nombre_normalizado.contains(p, autoescape=True) for p in palabras
+                ]))
+        candidatos = dict(db.session.execute(
+            db.select(Autor.id, Autor.nombre_normalizado).where(*condiciones).order_by(Autor.id)
+        ).all())
+        
+        # Calcular similitud con el nombre completo normalizado; el score se
+        # redondea a entero (los umbrales son porcentajes enteros)
+        coincidencias = process.extract(
+            texto_normalizado, candidatos, scorer=fuzz.token_sort_ratio,
+            score_cutoff=max(umbral - 1, 0), limit=limite
+        )
+        scores = {autor_id: round(score) for _, score, autor_id in coincidencias}
+        scores = {autor_id: score for autor_id, score in scores.items() if score >= umbral}
+        if limite is not None:
+            scores = dict(sorted(scores.items(), key=lambda x: (-x[1], x[0]))[:limite])
+        if not scores:
+            return []
         
-        resultados = []
-        for autor in autores:
-            # Calcular similitud con el nombre completo normalizado
-            score = fuzz.token_sort_ratio(texto_normalizado, autor.nombre_normalizado or "")
-            
-            if score >= umbral:
-                resultados.append((autor, score))
+        resultados = [
+            (autor, scores[autor.id])
+            for autor in Autor.query.filter(Autor.id.in_(scores))
+        ]
         
-        # Ordenar por score descendente
-        resultados.sort(key=lambda x: x[1], reverse=True)
+        # Ordenar por score descendente (a igual score, por id)
+        resultados.sort(key=lambda x: (-x[1], x[0].id))
         
         return resultados
     
@@ -168,6 +234,18 @@ class Autor(db.Model):
     
     # === Métodos de validación ===
     
+    @staticmethod
+    def normalizar_orcid(orcid):
+        """Forma canónica de un ORCID: sin espacios y con X mayúscula; None si está vacío."""
+        if orcid is None:
+            return None
+        return orcid.strip().upper() or None
+    
+    @validates('orcid')
+    def _normalizar_orcid(self, clave, valor):
+        """Normaliza el ORCID al asignarlo (el índice único compara el texto exacto)."""
+        return Autor.normalizar_orcid(valor)
+    
     def validar_orcid(self):
         """
         Valida que el formato del ORCID sea correcto.
@@ -176,9 +254,7 @@ class Autor(db.Model):
         if not self.orcid:
             return True
         
-        import re
-        patron_orcid = r'^\d{4}-\d{4}-\d{4}-\d{3}[\dX]$'
-        return bool(re.match(patron_orcid, self.orcid))
+        return bool(_ORCID_MATCH(self.orcid))
     
     def validar_email(self):
         """
@@ -187,9 +263,7 @@ class Autor(db.Model):
         if not self.email:
             return True
         
-        import re
-        patron_email = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(patron_email, self.email))
+        return bool(_EMAIL_MATCH(self.email))
     
     def validar(self):
         """
@@ -263,3 +337,19 @@ class Autor(db.Model):
         ).first()
         
         return aa.orden == 1 if aa else False
+
+
+def _normalizar_nombre(mapper, connection, target):
+    """Mantiene nombre_normalizado al día en cada alta o modificación."""
+    target.actualizar_nombre_normalizado()
+
+
+event.listen(Autor, 'before_insert', _normalizar_nombre)
+event.listen(Autor, 'before_update', _normalizar_nombre)
+
+# Los índices de trigramas (autores y articulos) requieren la extensión
+# pg_trgm; se crea antes que cualquier tabla (create_all en PostgreSQL)
+event.listen(
+    db.metadata, 'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql')
+)
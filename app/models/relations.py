@@ -14,7 +14,9 @@ class ArticuloAutor(db.Model):
     __tablename__ = 'articulo_autor'
     
     id = db.Column(db.Integer, primary_key=True)
-    articulo_id = db.Column(db.Integer, db.ForeignKey('articulos.id'), nullable=False)
+    # ON DELETE CASCADE: al borrar el artículo la BD elimina sus autores
+    articulo_id = db.Column(db.Integer, db.ForeignKey('articulos.id', ondelete='CASCADE'),
+                            nullable=False)
     autor_id = db.Column(db.Integer, db.ForeignKey('autores.id'), nullable=False)
     
     # Orden del autor en la lista de autores (1 = primer autor)
@@ -28,12 +30,17 @@ class ArticuloAutor(db.Model):
     # Relaciones
     articulo = db.relationship('Articulo', backref=db.backref('articulo_autores', 
                                                                lazy='dynamic',
-                                                               order_by='ArticuloAutor.orden'))
+                                                               order_by='ArticuloAutor.orden',
+                                                               cascade='all, delete-orphan',
+                                                               passive_deletes=True))
     autor = db.relationship('Autor', backref=db.backref('articulo_autores', lazy='dynamic'))
     
     # Constraint único para evitar duplicados
     __table_args__ = (
         db.UniqueConstraint('articulo_id', 'autor_id', name='uq_articulo_autor'),
+        # Búsquedas de artículos por autor (filtro de exportación, Autor.obtener_articulos);
+        # uq_articulo_autor solo sirve cuando se conoce el artículo
+        db.Index('ix_articulo_autor_autor_id_articulo_id', 'autor_id', 'articulo_id'),
     )
     
     def __repr__(self):
@@ -83,7 +90,9 @@ class ArticuloIndexacion(db.Model):
     __tablename__ = 'articulo_indexacion'
     
     id = db.Column(db.Integer, primary_key=True)
-    articulo_id = db.Column(db.Integer, db.ForeignKey('articulos.id'), nullable=False)
+    # ON DELETE CASCADE: al borrar el artículo la BD elimina sus indexaciones
+    articulo_id = db.Column(db.Integer, db.ForeignKey('articulos.id', ondelete='CASCADE'),
+                            nullable=False)
     indexacion_id = db.Column(db.Integer, db.ForeignKey('indexaciones.id'), nullable=False)
     
     # Fecha en que se verificó la indexación
@@ -93,7 +102,9 @@ class ArticuloIndexacion(db.Model):
     
     # Relaciones
     articulo = db.relationship('Articulo', backref=db.backref('articulo_indexaciones', 
-                                                               lazy='dynamic'))
+                                                               lazy='dynamic',
+                                                               cascade='all, delete-orphan',
+                                                               passive_deletes=True))
     indexacion = db.relationship('Indexacion', backref=db.backref('articulo_indexaciones', 
                                                                     lazy='dynamic'))
     
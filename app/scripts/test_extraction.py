@@ -1,119 +1,186 @@
 """
 Script de prueba para ver extracción de metadatos en acción.
 Ejecutar: python -m app.scripts.test_extraction
+
+Procesa todos los PDFs de las subcarpetas de pdf/ en paralelo (un proceso
+por núcleo) y muestra los resultados en el orden de los archivos.
 """
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
 from app.services.pdf_service import PDFService
-import json
 
 
-def test_extraction():
-    """Prueba extracción con PDFs reales"""
-    pdf_service = PDFService()
+# Carpeta cuyos PDFs se muestran con todos los metadatos; del resto solo
+# se indica qué campos se encontraron
+CARPETA_DETALLE = 'art_rev_indexada'
+
+# Servicio de cada proceso trabajador (se crea en el propio proceso)
+_pdf_service = None
+
+
+def _extraer(ruta):
+    """
+    Extrae metadatos e información de un PDF (se ejecuta en un proceso
+    trabajador).
     
-    # PDFs de prueba
-    base_path = Path(__file__).parent.parent.parent / 'pdf'
+    Returns:
+        Tupla (metadatos, info del PDF)
+    """
+    global _pdf_service
+    if _pdf_service is None:
+        _pdf_service = PDFService()
     
-    # Probar con un artículo indexado (buscar el primero disponible)
-    art_folder = base_path / 'art_rev_indexada'
-    art_pdfs = list(art_folder.glob('*.pdf')) if art_folder.exists() else []
-    art_path = art_pdfs[0] if art_pdfs else None
-    
-    if art_path and art_path.exists():
-        print("="*80)
-        print(f"Procesando: {art_path.name}")
-        print("="*80)
-        
-        # Extraer metadatos
-        metadata = pdf_service.extract_metadata(str(art_path))
-        
-        # Mostrar resultados
-        print(f"\n✓ Extracción exitosa: {metadata['success']}")
-        print(f"✓ Confianza: {metadata['confidence']*100:.1f}%\n")
-        
-        print("METADATOS EXTRAÍDOS:")
-        print("-" * 80)
-        
-        print(f"\n📄 TÍTULO:")
-        print(f"   {metadata['titulo'] or 'No encontrado'}")
-        
-        print(f"\n👥 AUTORES ({len(metadata['autores'])}):")
-        for i, autor in enumerate(metadata['autores'][:5], 1):
-            print(f"   {i}. {autor}")
-        if len(metadata['autores']) > 5:
-            print(f"   ... y {len(metadata['autores']) - 5} más")
-        
-        print(f"\n📅 AÑO:")
-        print(f"   {metadata['anio_publicacion'] or 'No encontrado'}")
-        
-        print(f"\n🔗 DOI:")
-        print(f"   {metadata['doi'] or 'No encontrado'}")
-        
-        print(f"\n📰 ISSN:")
-        print(f"   {metadata['issn'] or 'No encontrado'}")
-        
-        print(f"\n📧 EMAILS ({len(metadata['emails'])}):")
-        for email in metadata['emails'][:3]:
-            print(f"   - {email}")
-        
-        print(f"\n📝 RESUMEN:")
-        if metadata['resumen']:
-            resumen = metadata['resumen'][:300] + "..." if len(metadata['resumen']) > 300 else metadata['resumen']
-            print(f"   {resumen}")
-        else:
-            print("   No encontrado")
-        
-        print(f"\n🏷️ PALABRAS CLAVE ({len(metadata['palabras_clave'])}):")
-        if metadata['palabras_clave']:
-            print(f"   {', '.join(metadata['palabras_clave'][:10])}")
-        else:
-            print("   No encontradas")
-        
-        print("\n" + "="*80)
-        
-        # Info del PDF
-        info = pdf_service.get_pdf_info(str(art_path))
-        print(f"\nINFO DEL PDF:")
-        print(f"   Páginas: {info['num_pages']}")
-        print(f"   Tamaño: {info['file_size'] / 1024:.1f} KB")
-        print(f"   Encriptado: {info['encrypted']}")
-        
-        if info['metadata'].get('title'):
-            print(f"   Título (metadata): {info['metadata']['title']}")
-        
-        print("\n" + "="*80)
-        
+    metadata = _pdf_service.extract_metadata(str(ruta))
+    info = _pdf_service.get_pdf_info(str(ruta))
+    # Los metadatos del archivo pueden ser objetos de PyPDF2: se envían como texto
+    info['metadata'] = {
+        clave: str(valor) if valor is not None else None
+        for clave, valor in info['metadata'].items()
+    }
+    return metadata, info
+
+
+def _mostrar_detalle(ruta, metadata, info):
+    """Muestra todos los metadatos extraídos de un artículo."""
+    print("="*80)
+    print(f"Procesando: {ruta.name}")
+    print("="*80)
+    
+    # Mostrar resultados
+    print(f"\n✓ Extracción exitosa: {metadata['success']}")
+    print(f"✓ Confianza: {metadata['confidence']*100:.1f}%\n")
+    
+    print("METADATOS EXTRAÍDOS:")
+    print("-" * 80)
+    
+    print(f"\n📄 TÍTULO:")
+    print(f"   {metadata['titulo'] or 'No encontrado'}")
+    
+    print(f"\n👥 AUTORES ({len(metadata['autores'])}):")
+    for i, autor in enumerate(metadata['autores'][:5], 1):
+        print(f"   {i}. {autor}")
+    if len(metadata['autores']) > 5:
+        print(f"   ... y {len(metadata['autores']) - 5} más")
+    
+    print(f"\n📅 AÑO:")
+    print(f"   {metadata['anio_publicacion'] or 'No encontrado'}")
+    
+    print(f"\n🔗 DOI:")
+    print(f"   {metadata['doi'] or 'No encontrado'}")
+    
+    print(f"\n📰 ISSN:")
+    print(f"   {metadata['issn'] or 'No encontrado'}")
+    
+    print(f"\n📧 EMAILS ({len(metadata['emails'])}):")
+    for email in metadata['emails'][:3]:
+        print(f"   - {email}")
+    
+    print(f"\n📝 RESUMEN:")
+    if metadata['resumen']:
+        resumen = metadata['resumen'][:300] + "..." if len(metadata['resumen']) > 300 else metadata['resumen']
+        print(f"   {resumen}")
+    else:
+        print("   No encontrado")
+    
+    print(f"\n🏷️ PALABRAS CLAVE ({len(metadata['palabras_clave'])}):")
+    if metadata['palabras_clave']:
+        print(f"   {', '.join(metadata['palabras_clave'][:10])}")
     else:
-        print(f"❌ No se encontró el archivo: {art_path}")
-    
-    # Probar con un informe técnico
-    print("\n\n")
-    inf_folder = base_path / 'informe_tec'
-    inf_pdfs = list(inf_folder.glob('*.pdf')) if inf_folder.exists() else []
-    inf_path = inf_pdfs[0] if inf_pdfs else None
-    
-    if inf_path and inf_path.exists():
-        print("="*80)
-        print(f"Procesando: {inf_path.name}")
-        print("="*80)
-        
-        metadata = pdf_service.extract_metadata(str(inf_path))
-        
-        print(f"\n✓ Extracción exitosa: {metadata['success']}")
-        print(f"✓ Confianza: {metadata['confidence']*100:.1f}%\n")
-        
-        print("CAMPOS ENCONTRADOS:")
-        print(f"   Título: {'✓' if metadata['titulo'] else '✗'}")
-        print(f"   Autores: {'✓' if metadata['autores'] else '✗'} ({len(metadata['autores'])})")
-        print(f"   Año: {'✓' if metadata['anio_publicacion'] else '✗'}")
-        print(f"   DOI: {'✓' if metadata['doi'] else '✗'}")
-        print(f"   ISSN: {'✓' if metadata['issn'] else '✗'}")
-        print(f"   Resumen: {'✓' if metadata['resumen'] else '✗'}")
-        
-        if metadata['titulo']:
-            print(f"\n📄 TÍTULO: {metadata['titulo'][:100]}...")
-        
-        print("\n" + "="*80)
+        print("   No encontradas")
+    
+    print("\n" + "="*80)
+    
+    # Info del PDF
+    print(f"\nINFO DEL PDF:")
+    print(f"   Páginas: {info['num_pages']}")
+    print(f"   Tamaño: {info['file_size'] / 1024:.1f} KB")
+    print(f"   Encriptado: {info['encrypted']}")
+    
+    if info['metadata'].get('title'):
+        print(f"   Título (metadata): {info['metadata']['title']}")
+    
+    print("\n" + "="*80)
+
+
+def _mostrar_resumen(ruta, metadata):
+    """Muestra qué campos se encontraron en un PDF."""
+    print("="*80)
+    print(f"Procesando: {ruta.parent.name}/{ruta.name}")
+    print("="*80)
+    
+    print(f"\n✓ Extracción exitosa: {metadata['success']}")
+    print(f"✓ Confianza: {metadata['confidence']*100:.1f}%\n")
+    
+    print("CAMPOS ENCONTRADOS:")
+    print(f"   Título: {'✓' if metadata['titulo'] else '✗'}")
+    print(f"   Autores: {'✓' if metadata['autores'] else '✗'} ({len(metadata['autores'])})")
+    print(f"   Año: {'✓' if metadata['anio_publicacion'] else '✗'}")
+    print(f"   DOI: {'✓' if metadata['doi'] else '✗'}")
+    print(f"   ISSN: {'✓' if metadata['issn'] else '✗'}")
+    print(f"   Resumen: {'✓' if metadata['resumen'] else '✗'}")
+    
+    if metadata['titulo']:
+        print(f"\n📄 TÍTULO: {metadata['titulo'][:100]}...")
+    
+    print("\n" + "="*80)
+
+
+def _listar_pdfs(base_path, por_carpeta=None):
+    """
+    Lista los PDFs de las subcarpetas de base_path en un solo recorrido.
+    
+    Args:
+        base_path: Carpeta con una subcarpeta por tipo de producción
+        por_carpeta: Máximo de PDFs por subcarpeta (None = todos); con un
+            límite, el listado de cada carpeta se corta al alcanzarlo en
+            lugar de enumerarla completa
+    
+    Returns:
+        Lista de rutas, agrupadas por subcarpeta en orden alfabético
+    """
+    if not base_path.is_dir():
+        return []
+    
+    pdfs = []
+    for carpeta in sorted(p for p in base_path.iterdir() if p.is_dir()):
+        encontrados = carpeta.glob('*.pdf')
+        if por_carpeta is None:
+            pdfs.extend(sorted(encontrados))
+        else:
+            pdfs.extend(islice(encontrados, por_carpeta))
+    return pdfs
+
+
+def test_extraction(max_workers=None, por_carpeta=None):
+    """
+    Prueba extracción con PDFs reales.
+    
+    Args:
+        max_workers: Procesos trabajadores (por defecto, uno por núcleo)
+        por_carpeta: Máximo de PDFs a procesar por subcarpeta (None = todos)
+    """
+    # PDFs de prueba: los de las subcarpetas de pdf/ (listados una sola vez)
+    base_path = Path(__file__).parent.parent.parent / 'pdf'
+    pdfs = _listar_pdfs(base_path, por_carpeta)
+    
+    if not pdfs:
+        print(f"❌ No se encontraron PDFs en: {base_path}")
+        return
+    
+    max_workers = min(max_workers or os.cpu_count() or 1, len(pdfs))
+    print(f"Procesando {len(pdfs)} PDFs con {max_workers} procesos\n")
+    
+    # La extracción es CPU intensiva e independiente por archivo; map
+    # entrega los resultados en el orden de pdfs
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for ruta, (metadata, info) in zip(pdfs, executor.map(_extraer, pdfs, chunksize=4)):
+            if ruta.parent.name == CARPETA_DETALLE:
+                _mostrar_detalle(ruta, metadata, info)
+            else:
+                _mostrar_resumen(ruta, metadata)
+            print()
 
 
 if __name__ == '__main__':
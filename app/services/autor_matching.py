@@ -3,16 +3,102 @@ Servicio para matching y deduplicación de autores.
 Maneja diferentes formatos de nombres y encuentra coincidencias.
 """
 import re
+from functools import lru_cache
+from sqlalchemy.orm import load_only
 from app.models import Autor
 from app import db
 
 
+# "Apellidos, Nombre" (texto ya sin espacios en los extremos)
+_RE_APELLIDOS_NOMBRE = re.compile(r'([^,]*?)\s*,\s*(.*)', re.DOTALL)
+_RE_ESPACIOS = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=8192)
+def _parsear_nombre(texto):
+    """
+    Implementación de parsear_nombre_autor. Se memoiza por texto: en una
+    carga masiva los mismos coautores se repiten en muchos artículos.
+    """
+    texto = texto.strip()
+    
+    # Formato: "Apellidos, Nombre". La búsqueda de la coma es mucho más
+    # barata que intentar la regex sobre cada nombre sin coma (el caso común)
+    if ',' in texto:
+        apellidos, nombre = _RE_APELLIDOS_NOMBRE.match(texto).groups()
+        return (nombre, apellidos.replace('-', ' '))
+    
+    # Formato: "Nombre Apellidos" o "F. Apellidos": el primer token es el
+    # nombre (o la inicial) y el resto son apellidos
+    partes = texto.split(maxsplit=1)
+    if not partes:
+        return ("", "")
+    if len(partes) == 1:
+        return (partes[0], "")
+    return (partes[0], _RE_ESPACIOS.sub(' ', partes[1]))
+
+
+# Filas de la matriz de similitud calculadas por llamada a process.cdist
+# (memoria: FILAS_POR_BLOQUE x número de autores bytes)
+FILAS_POR_BLOQUE = 1000
+
+
 class AutorMatchingService:
     """
     Servicio para identificar y evitar duplicados de autores.
     Maneja múltiples formatos de nombres.
     """
     
+    @staticmethod
+    def _clave_nombre(texto):
+        """Clave de nombre independiente del formato y del orden de las palabras."""
+        return ' '.join(sorted(Autor.normalizar_texto(texto).split()))
+    
+    @classmethod
+    def prime_cache(cls):
+        """
+        Carga los autores activos en memoria para una carga masiva.
+        
+        La caché es del llamador: se pasa como cache= a
+        encontrar_o_crear_autor o resolve_batch, que resuelven por ORCID,
+        email o nombre exacto (normalizado) sin consultar la base y agregan
+        a ella los autores que crean. Contiene objetos de la sesión actual,
+        así que no debe compartirse entre hilos ni usarse tras el lote.
+        
+        Returns:
+            dict: {'orcid': {...}, 'email': {...}, 'nombre': {...}}
+        """
+        cache = {'orcid': {}, 'email': {}, 'nombre': {}}
+        autores = Autor.query.filter_by(activo=True).options(
+            load_only(Autor.id, Autor.nombre, Autor.apellidos, Autor.orcid,
+                      Autor.email, Autor.nombre_normalizado)
+        ).order_by(Autor.id)
+        for autor in autores:
+            cls._agregar_a_cache(cache, autor)
+        return cache
+    
+    @classmethod
+    def _agregar_a_cache(cls, cache, autor):
+        """Registra un autor en la caché (sin reemplazar al primero registrado)."""
+        if autor.orcid:
+            cache['orcid'].setdefault(autor.orcid, autor)
+        if autor.email:
+            cache['email'].setdefault(autor.email, autor)
+        if autor.nombre_normalizado:
+            cache['nombre'].setdefault(cls._clave_nombre(autor.nombre_normalizado), autor)
+    
+    @classmethod
+    def _buscar_en_cache(cls, cache, texto_nombre, orcid=None, email=None):
+        """Busca un autor en la caché con prioridad ORCID > email > nombre."""
+        orcid = Autor.normalizar_orcid(orcid)
+        if orcid and orcid in cache['orcid']:
+            return cache['orcid'][orcid]
+        if email and email in cache['email']:
+            return cache['email'][email]
+        if texto_nombre:
+            return cache['nombre'].get(cls._clave_nombre(texto_nombre))
+        return None
+    
     @staticmethod
     def parsear_nombre_autor(texto):
         """
@@ -30,72 +116,81 @@ class AutorMatchingService:
         if not texto:
             return ("", "")
         
-        texto = texto.strip()
-        
-        # Formato: "Apellidos, Nombre"
-        if ',' in texto:
-            partes = texto.split(',', 1)
-            apellidos = partes[0].strip().replace('-', ' ')
-            nombre = partes[1].strip()
-            return (nombre, apellidos)
-        
-        # Formato: "Nombre Apellidos" (asume último token es apellido)
-        partes = texto.split()
-        if len(partes) == 1:
-            return (partes[0], "")
-        
-        # Si empieza con inicial (ej: "F. Comparan Pantoja")
-        if len(partes[0]) <= 2 and partes[0].endswith('.'):
-            nombre = partes[0]
-            apellidos = ' '.join(partes[1:])
-            return (nombre, apellidos)
-        
-        # Caso general: primer token es nombre, resto son apellidos
-        nombre = partes[0]
-        apellidos = ' '.join(partes[1:])
-        
-        return (nombre, apellidos)
+        return _parsear_nombre(texto)
     
     @staticmethod
-    def encontrar_o_crear_autor(texto_nombre, orcid=None, email=None, crear_si_no_existe=True):
+    def encontrar_o_crear_autor(texto_nombre, orcid=None, email=None, crear_si_no_existe=True,
+                                cache=None):
         """
         Busca un autor existente o crea uno nuevo.
         
+        Con una caché de carga masiva (prime_cache), primero se busca en
+        memoria por ORCID, email o nombre exacto.
+        
         Estrategia de búsqueda (en orden):
         1. Por ORCID (si se proporciona)
         2. Por email (si se proporciona)
-        3. Por fuzzy matching del nombre completo
-        4. Si no encuentra y crear_si_no_existe=True, crea uno nuevo
+        3. Por nombre normalizado exacto (consulta indexada)
+        4. Por fuzzy matching del nombre completo
+        5. Si no encuentra y crear_si_no_existe=True, crea uno nuevo
         
         Args:
             texto_nombre: Nombre en cualquier formato
             orcid: ORCID del autor (opcional)
             email: Email del autor (opcional)
             crear_si_no_existe: Si crear nuevo autor si no se encuentra
+            cache: Caché de la carga masiva (opcional, ver prime_cache)
         
         Returns:
             Autor: Instancia del autor (existente o nuevo)
             bool: True si es nuevo, False si ya existía
         """
+        # 0. Buscar en la caché de la carga masiva
+        if cache is not None:
+            autor = AutorMatchingService._buscar_en_cache(cache, texto_nombre, orcid=orcid, email=email)
+            if autor:
+                return autor, False
+        
         # 1. Buscar por identificador único
         autor = Autor.buscar_por_identificador(orcid=orcid, email=email)
         if autor:
             return autor, False
         
-        # 2. Buscar por fuzzy matching
-        resultados = Autor.buscar_fuzzy(texto_nombre, umbral=85)
+        nombre, apellidos = AutorMatchingService.parsear_nombre_autor(texto_nombre)
+        
+        # 2. Buscar por nombre normalizado exacto, tal como viene y en el orden
+        # "nombre apellidos" en que se guarda; evita el fuzzy matching en el
+        # caso más común. Con caché ya se buscó en memoria
+        if cache is None:
+            formas = {
+                Autor.normalizar_texto(texto_nombre),
+                Autor.normalizar_texto(f"{nombre} {apellidos}")
+            } - {''}
+            if formas:
+                autor = Autor.query.filter(
+                    Autor.activo == True,
+                    Autor.nombre_normalizado.in_(formas)
+                ).order_by(Autor.id).first()
+                if autor:
+                    return autor, False
+        
+        # 3. Buscar por fuzzy matching
+        resultados = Autor.buscar_fuzzy(texto_nombre, umbral=85, limite=1)
         if resultados:
             # Retornar el mejor match
             mejor_autor, score = resultados[0]
             print(f"✓ Match encontrado: '{texto_nombre}' -> '{mejor_autor.nombre_completo}' (score: {score})")
+            if cache is not None and texto_nombre:
+                # La misma variante del nombre se resuelve en memoria en el resto del lote
+                cache['nombre'].setdefault(
+                    AutorMatchingService._clave_nombre(texto_nombre), mejor_autor
+                )
             return mejor_autor, False
         
-        # 3. No encontrado, crear nuevo si se permite
+        # 4. No encontrado, crear nuevo si se permite
         if not crear_si_no_existe:
             return None, False
         
-        nombre, apellidos = AutorMatchingService.parsear_nombre_autor(texto_nombre)
-        
         # Verificar si ya existe con nombre exacto
         autor_exacto = Autor.buscar_por_nombre(nombre, apellidos)
         if autor_exacto:
@@ -112,48 +207,138 @@ class AutorMatchingService:
         nuevo_autor.actualizar_nombre_normalizado()
         
         db.session.add(nuevo_autor)
+        if cache is not None:
+            AutorMatchingService._agregar_a_cache(cache, nuevo_autor)
         
         print(f"✓ Nuevo autor creado: '{nuevo_autor.nombre_completo}'")
         return nuevo_autor, True
     
     @staticmethod
-    def detectar_duplicados(umbral=90):
+    def resolve_batch(nombres, crear_si_no_existe=True, cache=None):
+        """
+        Resuelve varios nombres de autor, buscando cada texto distinto una sola vez.
+        
+        En una carga masiva el mismo coautor aparece en muchas filas: cada
+        texto repetido se resuelve con una sola llamada a
+        encontrar_o_crear_autor (un solo fuzzy matching) y el resultado se
+        comparte entre todas sus apariciones.
+        
+        Args:
+            nombres: Lista de nombres en cualquier formato (puede repetir)
+            crear_si_no_existe: Si crear los autores que no se encuentren
+            cache: Caché de la carga masiva (opcional, ver prime_cache)
+        
+        Returns:
+            dict: {nombre original: Autor (o None si no existe y no se creó)}
+        """
+        resueltos = dict.fromkeys(nombres)
+        for nombre in resueltos:
+            resueltos[nombre], _ = AutorMatchingService.encontrar_o_crear_autor(
+                nombre, crear_si_no_existe=crear_si_no_existe, cache=cache
+            )
+        return resueltos
+    
+    @staticmethod
+    def detectar_duplicados(umbral=90, por_bloques=True):
         """
         Detecta posibles autores duplicados en la base de datos.
         
         Args:
             umbral: Porcentaje de similitud para considerar duplicado
+            por_bloques: Comparar solo autores que comparten alguna palabra
+                (de 3 letras o más) o las dos primeras letras del nombre
+                normalizado; con False se comparan todos los pares
         
         Returns:
             list: Lista de tuplas (autor1, autor2, score)
         """
-        autores = Autor.query.filter_by(activo=True).all()
-        duplicados = []
+        from rapidfuzz import fuzz, process
+        from rapidfuzz.utils import default_process
         
-        try:
-            from fuzzywuzzy import fuzz
-        except ImportError:
-            print("⚠️  Instala 'fuzzywuzzy' para detección de duplicados: pip install fuzzywuzzy python-Levenshtein")
-            return []
-        
-        # Comparar cada par de autores
-        for i, autor1 in enumerate(autores):
-            for autor2 in autores[i+1:]:
-                if not autor1.nombre_normalizado or not autor2.nombre_normalizado:
-                    continue
-                
-                score = fuzz.token_sort_ratio(
-                    autor1.nombre_normalizado,
-                    autor2.nombre_normalizado
-                )
-                
-                if score >= umbral:
-                    duplicados.append((autor1, autor2, score))
+        autores = [
+            autor for autor in Autor.query.filter_by(activo=True)
+            if autor.nombre_normalizado
+        ]
+        
+        if por_bloques:
+            grupos = AutorMatchingService._bloques([autor.nombre_normalizado for autor in autores])
+        else:
+            grupos = [list(range(len(autores)))]
+        
+        # token_sort_ratio equivale a ratio sobre las palabras ordenadas: se
+        # preparan una sola vez por autor
+        nombres = [
+            ' '.join(sorted(default_process(autor.nombre_normalizado).split()))
+            for autor in autores
+        ]
+        
+        # Score por par (i, j) de índices en autores; un par que comparte
+        # varios bloques se registra una vez
+        scores = {}
+        for grupo in grupos:
+            pares = AutorMatchingService._pares_similares(
+                [nombres[k] for k in grupo], umbral, fuzz, process
+            )
+            for i, j, score in pares:
+                scores[(grupo[i], grupo[j])] = score
         
         # Ordenar por score descendente
-        duplicados.sort(key=lambda x: x[2], reverse=True)
+        pares = sorted(scores.items(), key=lambda par: (-par[1], par[0]))
+        
+        return [(autores[i], autores[j], score) for (i, j), score in pares]
+    
+    @staticmethod
+    def _bloques(nombres):
+        """
+        Agrupa los nombres normalizados que pueden ser duplicados entre sí.
+        
+        Cada palabra de 3 letras o más y cada prefijo de dos letras forman
+        un bloque; solo se comparan nombres de un mismo bloque, en lugar de
+        todos contra todos.
+        
+        Returns:
+            list: Listas (sin repetir) de índices crecientes de nombres, con
+            al menos dos elementos cada una
+        """
+        bloques = {}
+        for k, nombre in enumerate(nombres):
+            claves = {palabra for palabra in nombre.split() if len(palabra) >= 3}
+            claves.add('#' + nombre[:2])
+            for clave in claves:
+                bloques.setdefault(clave, []).append(k)
+        
+        grupos = {tuple(grupo) for grupo in bloques.values() if len(grupo) > 1}
+        return [list(grupo) for grupo in grupos]
+    
+    @staticmethod
+    def _pares_similares(nombres, umbral, fuzz, process):
+        """
+        Compara todos los pares de nombres con RapidFuzz.
+        
+        La matriz de similitud se calcula con process.cdist (en C++ y en
+        paralelo), por bloques de filas para acotar la memoria.
         
-        return duplicados
+        Returns:
+            list: Tuplas (i, j, score) con i < j y score >= umbral; el score
+            se redondea a entero
+        """
+        import numpy as np
+        
+        corte = max(umbral - 1, 0)
+        pares = []
+        for inicio in range(0, len(nombres), FILAS_POR_BLOQUE):
+            scores = process.cdist(
+                nombres[inicio:inicio + FILAS_POR_BLOQUE], nombres,
+                scorer=fuzz.ratio, score_cutoff=corte,
+                dtype=np.uint8, workers=-1
+            )
+            # Solo el triángulo superior (j > i) de la matriz completa
+            filas, columnas = np.nonzero(np.triu(scores, k=inicio + 1) >= umbral)
+            pares.extend(
+                (inicio + int(fila), int(columna), int(scores[fila, columna]))
+                for fila, columna in zip(filas, columnas)
+            )
+        return pares
     
     @staticmethod
     def fusionar_autores(autor_principal_id, autor_duplicado_id):
@@ -179,21 +364,24 @@ class AutorMatchingService:
             return False, "No se puede fusionar un autor consigo mismo"
         
         try:
-            # Mover todas las relaciones de artículos
-            relaciones = ArticuloAutor.query.filter_by(autor_id=autor_duplicado.id).all()
+            # En los artículos donde el principal ya figura, eliminar la
+            # relación del duplicado (evita duplicar la relación)
+            articulos_del_principal = db.select(ArticuloAutor.articulo_id).where(
+                ArticuloAutor.autor_id == autor_principal.id
+            )
+            eliminadas = db.session.execute(
+                db.delete(ArticuloAutor).where(
+                    ArticuloAutor.autor_id == autor_duplicado.id,
+                    ArticuloAutor.articulo_id.in_(articulos_del_principal)
+                )
+            ).rowcount
             
-            for relacion in relaciones:
-                # Verificar si ya existe relación para evitar duplicados
-                existe = ArticuloAutor.query.filter_by(
-                    articulo_id=relacion.articulo_id,
-                    autor_id=autor_principal.id
-                ).first()
-                
-                if not existe:
-                    relacion.autor_id = autor_principal.id
-                else:
-                    # Si ya existe, eliminar la relación duplicada
-                    db.session.delete(relacion)
+            # Mover el resto de las relaciones al principal con un solo UPDATE
+            movidas = db.session.execute(
+                db.update(ArticuloAutor)
+                .where(ArticuloAutor.autor_id == autor_duplicado.id)
+                .values(autor_id=autor_principal.id)
+            ).rowcount
             
             # Copiar información adicional si el principal no la tiene
             if not autor_principal.orcid and autor_duplicado.orcid:
@@ -210,7 +398,7 @@ class AutorMatchingService:
             
             db.session.commit()
             
-            return True, f"Fusión exitosa: {len(relaciones)} artículos movidos"
+            return True, f"Fusión exitosa: {eliminadas + movidas} artículos movidos"
         
         except Exception as e:
             db.session.rollback()
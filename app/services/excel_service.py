@@ -3,13 +3,32 @@ Servicio para generación de archivos Excel con formato institucional.
 Exporta artículos académicos con todas sus relaciones y metadatos.
 """
 from datetime import datetime
-from typing import List, Optional
+from itertools import groupby, islice
+from operator import itemgetter
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
-from io import BytesIO
+from sqlalchemy import func, literal_column
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import joinedload
+from tempfile import SpooledTemporaryFile
+from app.models.articulo import Articulo
+from app.models.autor import Autor
+from app.models.catalogs import Indexacion
+from app.models.revista import Revista
+from app.models.relations import ArticuloAutor, ArticuloIndexacion, RevistaIndexacion
+from app import db
 import logging
 
+# xlsxwriter (opcional) para exportaciones grandes; sin ella todo se genera
+# con openpyxl
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -38,15 +57,35 @@ class ExcelService:
         ('R', 'Descripción/Resumen', 60),
     ]
     
+    # Columnas de datos centradas (el resto se alinea arriba con ajuste de texto)
+    CENTERED_COLUMNS = ('A', 'D', 'O', 'P')
+    
     # Colores institucionales
     COLOR_HEADER = 'FF1F4E78'  # Azul institucional
     COLOR_ALT_ROW = 'FFE7E6E6'  # Gris claro para filas alternas
     
+    # Bytes del archivo generado que se mantienen en memoria; por encima se
+    # pasan a un archivo temporal en disco
+    SPOOL_MAX_SIZE = 8 * 1024 * 1024
+    
+    # Artículos cuyos autores e indexaciones se consultan juntos al generar
+    # desde objetos Articulo (generate_stream)
+    LOTE_RELACIONES = 500
+    
+    # Filas a partir de las cuales se genera con xlsxwriter (si está
+    # instalada) en modo constant_memory, más rápido que openpyxl para
+    # tablas grandes
+    XLSXWRITER_DISPONIBLE = xlsxwriter is not None
+    XLSXWRITER_MIN_FILAS = 50000
+    
     def __init__(self):
         """Inicializa el servicio."""
         self.logger = logger
+        # Indexaciones por revista de la exportación en curso:
+        # {revista_id: (nombres, 'Indexación, ...')}
+        self._indexaciones_revista: Dict[int, Tuple[set, str]] = {}
     
-    def generate(self, articulos: List, filename: Optional[str] = None) -> BytesIO:
+    def generate(self, articulos: List, filename: Optional[str] = None) -> IO[bytes]:
         """
         Genera archivo Excel con los artículos proporcionados.
         
@@ -55,33 +94,160 @@ class ExcelService:
             filename: Nombre base del archivo (opcional)
             
         Returns:
-            BytesIO con el contenido del archivo Excel
+            Archivo (posicionado al inicio) con el contenido del Excel
+        """
+        output, _ = self.generate_stream(articulos, total_estimado=len(articulos))
+        return output
+    
+    def generate_stream(self, articulos: Iterable,
+                        total_estimado: Optional[int] = None) -> Tuple[IO[bytes], int]:
+        """
+        Genera archivo Excel consumiendo los artículos de uno en uno.
+        
+        A diferencia de generate, acepta cualquier iterable (p. ej. una query
+        con yield_per) sin requerir len(): el total se cuenta al recorrerlo.
+        
+        Args:
+            articulos: Iterable de objetos Articulo
+            total_estimado: Número de artículos, si se conoce (ver generate_rows)
+        
+        Returns:
+            Tupla (archivo Excel, total de artículos escritos)
+        """
+        return self.generate_rows(self._filas_de_articulos(articulos), total_estimado)
+    
+    def usar_xlsxwriter(self, total_estimado: Optional[int]) -> bool:
+        """Indica si una exportación de total_estimado filas se genera con xlsxwriter."""
+        return (
+            self.XLSXWRITER_DISPONIBLE
+            and total_estimado is not None
+            and total_estimado >= self.XLSXWRITER_MIN_FILAS
+        )
+    
+    def generate_rows(self, filas: Iterable[Sequence[Any]],
+                      total_estimado: Optional[int] = None) -> Tuple[IO[bytes], int]:
+        """
+        Genera archivo Excel a partir de filas ya construidas.
+        
+        Cada fila trae los valores de COLUMNS en orden (ver build_row); así
+        el llamador puede armarlas desde filas de SQLAlchemy Core sin
+        construir objetos Articulo.
+        
+        El libro es de solo escritura (write_only): cada fila se serializa al
+        agregarla, ya con su formato, en lugar de conservar todas las celdas
+        en memoria hasta guardar. El archivo se escribe en un
+        SpooledTemporaryFile: en memoria hasta SPOOL_MAX_SIZE y en disco por
+        encima, así un reporte grande no queda completo en memoria mientras
+        se envía. Quien lo recibe debe cerrarlo (send_file lo cierra al
+        terminar la respuesta).
+        
+        Con total_estimado >= XLSXWRITER_MIN_FILAS y xlsxwriter instalada,
+        el archivo se genera con xlsxwriter (mismo contenido y formato).
+        
+        Args:
+            filas: Iterable de secuencias de valores
+            total_estimado: Número de filas, si se conoce de antemano
+        
+        Returns:
+            Tupla (archivo Excel posicionado al inicio, total de filas escritas)
         """
+        # Las indexaciones por revista se reutilizan solo dentro de una exportación
+        self._indexaciones_revista = {}
+        
+        if self.usar_xlsxwriter(total_estimado):
+            return self._generate_rows_xlsxwriter(filas)
+        
         try:
-            # Crear workbook
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Artículos Académicos"
+            # Crear workbook de solo escritura
+            wb = Workbook(write_only=True)
+            ws = wb.create_sheet("Artículos Académicos")
             
             # Configurar encabezados
             self._setup_headers(ws)
             
-            # Agregar datos
-            self._add_data(ws, articulos)
-            
-            # Aplicar formato
-            self._apply_formatting(ws, len(articulos))
+            # Agregar datos (con formato)
+            total = self._add_data(ws, filas)
             
             # Agregar metadatos
-            self._add_metadata(wb, len(articulos))
+            self._add_metadata(wb, total)
             
-            # Guardar en BytesIO
-            output = BytesIO()
+            # Guardar en archivo temporal (memoria o disco según tamaño)
+            output = SpooledTemporaryFile(max_size=self.SPOOL_MAX_SIZE)
             wb.save(output)
             output.seek(0)
             
-            self.logger.info(f"Excel generado exitosamente con {len(articulos)} artículos")
-            return output
+            self.logger.info(f"Excel generado exitosamente con {total} artículos")
+            return output, total
+        
+        except Exception as e:
+            self.logger.error(f"Error generando Excel: {str(e)}")
+            raise
+    
+    def _generate_rows_xlsxwriter(self, filas: Iterable[Sequence[Any]]) -> Tuple[IO[bytes], int]:
+        """
+        Genera el archivo con xlsxwriter en modo constant_memory: cada fila se
+        escribe a disco al pasar a la siguiente. Los formatos se crean una
+        vez y se asignan por celda.
+        """
+        try:
+            output = SpooledTemporaryFile(max_size=self.SPOOL_MAX_SIZE)
+            # Los textos se escriben tal cual (sin convertirlos en fórmulas,
+            # números ni hipervínculos)
+            wb = xlsxwriter.Workbook(output, {
+                'constant_memory': True,
+                'strings_to_formulas': False,
+                'strings_to_numbers': False,
+                'strings_to_urls': False,
+            })
+            ws = wb.add_worksheet("Artículos Académicos")
+            
+            # Anchos de columna, panel congelado y encabezados
+            for col, (_, _, col_width) in enumerate(self.COLUMNS):
+                ws.set_column(col, col, col_width)
+            ws.freeze_panes(1, 0)
+            header_format = wb.add_format({
+                'bold': True, 'font_color': 'white', 'font_size': 11,
+                'bg_color': '#' + self.COLOR_HEADER[2:],
+                'align': 'center', 'valign': 'vcenter', 'text_wrap': True
+            })
+            ws.write_row(0, 0, [col_name for _, col_name, _ in self.COLUMNS], header_format)
+            
+            # Formatos por columna, según la paridad de la fila (como en _add_data)
+            formatos = []
+            for relleno in ('#' + self.COLOR_ALT_ROW[2:], None):
+                formatos_paridad = []
+                for col_letter, _, _ in self.COLUMNS:
+                    propiedades = {'border': 1}
+                    if col_letter in self.CENTERED_COLUMNS:
+                        propiedades.update(align='center', valign='vcenter')
+                    else:
+                        propiedades.update(valign='top', text_wrap=True)
+                    if relleno:
+                        propiedades['bg_color'] = relleno
+                    formatos_paridad.append(wb.add_format(propiedades))
+                formatos.append(formatos_paridad)
+            
+            total = 0
+            for fila, valores in enumerate(filas, start=1):
+                total += 1
+                # Número de fila de Excel = fila + 1; paridad como en _add_data
+                for col, (valor, formato) in enumerate(zip(valores, formatos[(fila + 1) % 2])):
+                    ws.write(fila, col, valor, formato)
+            
+            # Hoja de metadatos
+            ws_meta = wb.add_worksheet("Información del Reporte")
+            ws_meta.set_column(0, 0, 25)
+            ws_meta.set_column(1, 1, 40)
+            label_format = wb.add_format({'bold': True})
+            for fila, (label, value) in enumerate(self._datos_metadata(total)):
+                ws_meta.write(fila, 0, label, label_format)
+                ws_meta.write(fila, 1, value)
+            
+            wb.close()
+            output.seek(0)
+            
+            self.logger.info(f"Excel generado exitosamente con {total} artículos (xlsxwriter)")
+            return output, total
             
         except Exception as e:
             self.logger.error(f"Error generando Excel: {str(e)}")
@@ -96,56 +262,261 @@ class ExcelService:
                                    fill_type='solid')
         header_alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
         
+        # Anchos de columna y panel congelado (antes de escribir filas)
+        for col_letter, _, col_width in self.COLUMNS:
+            ws.column_dimensions[col_letter].width = col_width
+        
+        # Congelar primera fila
+        ws.freeze_panes = 'A2'
+        
         # Aplicar encabezados
-        for col_letter, col_name, col_width in self.COLUMNS:
-            cell = ws[f'{col_letter}1']
-            cell.value = col_name
+        encabezados = []
+        for _, col_name, _ in self.COLUMNS:
+            cell = WriteOnlyCell(ws, value=col_name)
             cell.font = header_font
             cell.fill = header_fill
             cell.alignment = header_alignment
+            encabezados.append(cell)
+        ws.append(encabezados)
+    
+    def _add_data(self, ws, filas: Iterable[Sequence[Any]]) -> int:
+        """Agrega las filas con formato al worksheet y retorna cuántas se escribieron."""
+        # Asignar borde, alineación y relleno busca cada estilo en el registro
+        # del libro; se hace una vez por columna en una celda modelo y cada
+        # celda de datos comparte su arreglo de estilos ya resuelto (sin
+        # copiarlo: las celdas se serializan al agregar la fila y no se
+        # vuelven a modificar). Es más rápido que asignar un NamedStyle por
+        # nombre, que resuelve el estilo en cada celda
+        estilos = []
+        for estilos_paridad in self._estilos_de_datos():
+            modelos = []
+            for border, alignment, fill in estilos_paridad:
+                modelo = WriteOnlyCell(ws)
+                modelo.border = border
+                modelo.alignment = alignment
+                modelo.fill = fill
+                modelos.append(modelo._style)
+            estilos.append(modelos)
+        
+        total = 0
+        for idx, valores in enumerate(filas, start=2):
+            total += 1
+            celdas = []
+            for valor, estilo in zip(valores, estilos[idx % 2]):
+                cell = WriteOnlyCell(ws, value=valor)
+                cell._style = estilo
+                celdas.append(cell)
+            ws.append(celdas)
+        
+        return total
+    
+    @staticmethod
+    def prepare_query(query):
+        """
+        Agrega a una query de Articulo la carga anticipada de las relaciones
+        muchos-a-uno que usa la exportación (tipo, estado, LGAC, propósito y
+        revista con su país).
+        
+        Autores e indexaciones son relaciones dinámicas (no admiten carga
+        anticipada): generate_stream las consulta juntas por lote.
+        """
+        return query.options(
+            joinedload(Articulo.tipo),
+            joinedload(Articulo.estado),
+            joinedload(Articulo.lgac),
+            joinedload(Articulo.proposito),
+            joinedload(Articulo.revista).joinedload(Revista.pais)
+        )
+    
+    def _filas_de_articulos(self, articulos: Iterable) -> Iterator[Tuple[Any, ...]]:
+        """
+        Convierte objetos Articulo en filas; omite los que fallen.
+        
+        Los artículos se recorren en lotes de LOTE_RELACIONES: los autores y
+        las indexaciones de cada lote se obtienen con una consulta cada uno,
+        en lugar de varias por artículo. Construir las filas no hace más
+        consultas, así que no se reparte entre hilos: no habría esperas de
+        la base de datos que solapar, y los objetos pertenecen a la sesión
+        del hilo que exporta.
+        """
+        articulos = iter(articulos)
+        while True:
+            lote = list(islice(articulos, self.LOTE_RELACIONES))
+            if not lote:
+                return
+            autores_lote = self.autores_por_articulo([articulo.id for articulo in lote])
+            indexaciones_lote = self.indexaciones_por_articulo(
+                {articulo.id: articulo.revista_id for articulo in lote}
+            )
+            for articulo in lote:
+                fila = self._fila_de_articulo(
+                    articulo,
+                    autores_lote.get(articulo.id, ''),
+                    indexaciones_lote.get(articulo.id, '')
+                )
+                if fila is not None:
+                    yield fila
+    
+    def _fila_de_articulo(self, articulo, autores: str, indexaciones: str) -> Optional[Tuple[Any, ...]]:
+        """Construye la fila de un objeto Articulo, o None si falla."""
+        try:
+            # Obtener datos relacionados
+            lgacs = self._get_lgacs(articulo)
+            propositos = self._get_propositos(articulo)
             
-            # Ajustar ancho de columna
-            ws.column_dimensions[col_letter].width = col_width
+            return (
+                articulo.id,
+                articulo.titulo or '',
+                autores,
+                articulo.anio_publicacion or '',
+                articulo.titulo_revista or '',
+                articulo.nombre_congreso or '',
+                articulo.issn or '',
+                articulo.doi or '',
+                articulo.tipo.nombre if articulo.tipo else '',
+                articulo.estado.nombre if articulo.estado else '',
+                lgacs,
+                propositos,
+                indexaciones,
+                articulo.revista.pais.nombre if articulo.revista and articulo.revista.pais else '',
+                articulo.url or '',
+                'Sí' if articulo.para_curriculum else 'No',
+                'Sí' if articulo.completo else 'No',
+                articulo.descripcion or ''
+            )
         
-        # Congelar primera fila
-        ws.freeze_panes = 'A2'
+        except Exception as e:
+            self.logger.warning(f"Error procesando artículo {articulo.id}: {str(e)}")
+            return None
+    
+    def build_row(self, registro, autores: str = '', indexaciones: str = '') -> Tuple[Any, ...]:
+        """
+        Construye la fila de Excel de un artículo a partir de un registro plano.
+        
+        Args:
+            registro: Objeto con atributos id, titulo, anio_publicacion,
+                titulo_revista, nombre_congreso, issn, doi, tipo, estado, lgac,
+                proposito, pais, url, para_curriculum, completo y descripcion
+                (p. ej. un Row de SQLAlchemy Core); tipo, estado, lgac,
+                proposito y pais son nombres (o None)
+            autores: Autores ya formateados
+            indexaciones: Indexaciones ya formateadas
+        
+        Returns:
+            Tupla de valores en el orden de COLUMNS
+        """
+        return (
+            registro.id,
+            registro.titulo or '',
+            autores,
+            registro.anio_publicacion or '',
+            registro.titulo_revista or '',
+            registro.nombre_congreso or '',
+            registro.issn or '',
+            registro.doi or '',
+            registro.tipo or '',
+            registro.estado or '',
+            registro.lgac or '',
+            registro.proposito or '',
+            indexaciones,
+            registro.pais or '',
+            registro.url or '',
+            'Sí' if registro.para_curriculum else 'No',
+            'Sí' if registro.completo else 'No',
+            registro.descripcion or ''
+        )
+    
+    def autores_por_articulo(self, ids: List[int]) -> Dict[int, str]:
+        """Retorna {articulo_id: 'Apellidos, Nombre; ...'} en orden de autoría."""
+        if db.session.get_bind().dialect.name == 'postgresql':
+            # La base arma la cadena de cada artículo (string_agg ordenado por
+            # orden de autoría): una fila por artículo en lugar de una por autor
+            return dict(db.session.execute(
+                db.select(
+                    ArticuloAutor.articulo_id,
+                    func.string_agg(
+                        Autor.apellidos + ', ' + Autor.nombre,
+                        aggregate_order_by(literal_column("'; '"), ArticuloAutor.orden)
+                    )
+                )
+                .join(ArticuloAutor.autor)
+                .where(ArticuloAutor.articulo_id.in_(ids))
+                .group_by(ArticuloAutor.articulo_id)
+            ).all())
+        
+        # SQLite no garantiza el orden dentro de group_concat: la base arma
+        # cada nombre y las filas, ya ordenadas, se agrupan aquí
+        filas = db.session.execute(
+            db.select(ArticuloAutor.articulo_id, Autor.apellidos + ', ' + Autor.nombre)
+            .join(ArticuloAutor.autor)
+            .where(ArticuloAutor.articulo_id.in_(ids))
+            .order_by(ArticuloAutor.articulo_id, ArticuloAutor.orden)
+        )
+        return {
+            articulo_id: '; '.join(nombre for _, nombre in grupo)
+            for articulo_id, grupo in groupby(filas, key=itemgetter(0))
+        }
     
-    def _add_data(self, ws, articulos: List):
-        """Agrega los datos de los artículos al worksheet."""
-        for idx, articulo in enumerate(articulos, start=2):
-            try:
-                # Obtener datos relacionados
-                autores = self._get_autores(articulo)
-                lgacs = self._get_lgacs(articulo)
-                propositos = self._get_propositos(articulo)
-                indexaciones = self._get_indexaciones(articulo)
-                
-                # Llenar fila
-                ws[f'A{idx}'] = articulo.id
-                ws[f'B{idx}'] = articulo.titulo or ''
-                ws[f'C{idx}'] = autores
-                ws[f'D{idx}'] = articulo.anio_publicacion or ''
-                ws[f'E{idx}'] = articulo.titulo_revista or ''
-                ws[f'F{idx}'] = articulo.nombre_congreso or ''
-                ws[f'G{idx}'] = articulo.issn or ''
-                ws[f'H{idx}'] = articulo.doi or ''
-                ws[f'I{idx}'] = articulo.tipo.nombre if articulo.tipo else ''
-                ws[f'J{idx}'] = articulo.estado.nombre if articulo.estado else ''
-                ws[f'K{idx}'] = lgacs
-                ws[f'L{idx}'] = propositos
-                ws[f'M{idx}'] = indexaciones
-                ws[f'N{idx}'] = articulo.revista.pais.nombre if articulo.revista and articulo.revista.pais else ''
-                ws[f'O{idx}'] = articulo.url or ''
-                ws[f'P{idx}'] = 'Sí' if articulo.para_curriculum else 'No'
-                ws[f'Q{idx}'] = 'Sí' if articulo.completo else 'No'
-                ws[f'R{idx}'] = articulo.descripcion or ''
-                
-            except Exception as e:
-                self.logger.warning(f"Error procesando artículo {articulo.id}: {str(e)}")
-                continue
+    def indexaciones_por_articulo(self, revistas: Dict[int, Optional[int]]) -> Dict[int, str]:
+        """
+        Retorna {articulo_id: 'Indexación, ...'} con las indexaciones activas
+        de la revista y las adicionales del artículo, sin repetir y ordenadas.
+        
+        Las indexaciones de cada revista se consultan una sola vez por
+        exportación (muchos artículos comparten revista); por lote solo se
+        consultan las de revistas nuevas y las propias de los artículos.
+        
+        Args:
+            revistas: {articulo_id: revista_id (o None)} de los artículos del lote
+        """
+        pendientes = {
+            revista_id for revista_id in revistas.values()
+            if revista_id is not None and revista_id not in self._indexaciones_revista
+        }
+        if pendientes:
+            de_revista: Dict[int, set] = {revista_id: set() for revista_id in pendientes}
+            filas = db.session.execute(
+                db.select(RevistaIndexacion.revista_id, Indexacion.nombre)
+                .join(RevistaIndexacion.indexacion)
+                .where(
+                    RevistaIndexacion.revista_id.in_(pendientes),
+                    RevistaIndexacion.activo == True,
+                    Indexacion.activo == True
+                )
+            )
+            for revista_id, nombre in filas:
+                de_revista[revista_id].add(nombre)
+            for revista_id, nombres in de_revista.items():
+                self._indexaciones_revista[revista_id] = (nombres, ', '.join(sorted(nombres)))
+        
+        de_articulo: Dict[int, set] = {}
+        filas = db.session.execute(
+            db.select(ArticuloIndexacion.articulo_id, Indexacion.nombre)
+            .join(ArticuloIndexacion.indexacion)
+            .where(ArticuloIndexacion.articulo_id.in_(list(revistas)), Indexacion.activo == True)
+        )
+        for articulo_id, nombre in filas:
+            de_articulo.setdefault(articulo_id, set()).add(nombre)
+        
+        indexaciones = {}
+        for articulo_id, revista_id in revistas.items():
+            nombres_revista, texto_revista = self._indexaciones_revista.get(revista_id, (set(), ''))
+            propias = de_articulo.get(articulo_id)
+            if propias:
+                indexaciones[articulo_id] = ', '.join(sorted(nombres_revista | propias))
+            elif texto_revista:
+                # Sin indexaciones propias: la cadena ya armada de la revista
+                indexaciones[articulo_id] = texto_revista
+        return indexaciones
     
-    def _apply_formatting(self, ws, num_rows: int):
-        """Aplica formato a todas las celdas."""
+    def _estilos_de_datos(self) -> Tuple[List[Tuple[Border, Alignment, PatternFill]], ...]:
+        """
+        Estilos (borde, alineación, relleno) de cada columna de datos.
+        
+        Returns:
+            Tupla indexada por paridad de la fila: [0] filas pares (con
+            relleno alterno) y [1] impares, cada una con un estilo por columna
+        """
         # Bordes
         thin_border = Border(
             left=Side(style='thin'),
@@ -157,63 +528,50 @@ class ExcelService:
         # Alineación para datos
         data_alignment = Alignment(vertical='top', wrap_text=True)
         
-        # Aplicar a todas las celdas de datos
-        for row_idx in range(2, num_rows + 2):
-            # Filas alternas
-            if row_idx % 2 == 0:
-                fill = PatternFill(start_color=self.COLOR_ALT_ROW, 
-                                   end_color=self.COLOR_ALT_ROW, 
-                                   fill_type='solid')
-            else:
-                fill = PatternFill()
-            
-            for col_letter, _, _ in self.COLUMNS:
-                cell = ws[f'{col_letter}{row_idx}']
-                cell.border = thin_border
-                cell.alignment = data_alignment
-                cell.fill = fill
-                
-                # Centrar columnas específicas
-                if col_letter in ['A', 'D', 'O', 'P']:
-                    cell.alignment = Alignment(horizontal='center', vertical='center')
+        # Centrar columnas específicas
+        centered_alignment = Alignment(horizontal='center', vertical='center')
+        alineaciones = [
+            centered_alignment if col_letter in self.CENTERED_COLUMNS else data_alignment
+            for col_letter, _, _ in self.COLUMNS
+        ]
+        
+        # Filas alternas
+        alt_fill = PatternFill(start_color=self.COLOR_ALT_ROW, 
+                               end_color=self.COLOR_ALT_ROW, 
+                               fill_type='solid')
+        no_fill = PatternFill()
+        
+        return tuple(
+            [(thin_border, alignment, fill) for alignment in alineaciones]
+            for fill in (alt_fill, no_fill)
+        )
     
     def _add_metadata(self, wb, num_articulos: int):
         """Agrega una hoja con metadatos del reporte."""
         ws_meta = wb.create_sheet("Información del Reporte")
         
         # Información del reporte
-        metadata = [
-            ('Fecha de Generación:', datetime.now().strftime('%Y-%m-%d %H:%M:%S')),
-            ('Total de Artículos:', num_articulos),
-            ('Sistema:', 'Sistema de Gestión de Artículos Académicos'),
-            ('Versión:', '1.0'),
-        ]
-        
-        for idx, (label, value) in enumerate(metadata, start=1):
-            ws_meta[f'A{idx}'] = label
-            ws_meta[f'B{idx}'] = value
-            ws_meta[f'A{idx}'].font = Font(bold=True)
+        metadata = self._datos_metadata(num_articulos)
         
         # Ajustar anchos
         ws_meta.column_dimensions['A'].width = 25
         ws_meta.column_dimensions['B'].width = 40
+        
+        label_font = Font(bold=True)
+        for label, value in metadata:
+            label_cell = WriteOnlyCell(ws_meta, value=label)
+            label_cell.font = label_font
+            ws_meta.append([label_cell, value])
     
-    def _get_autores(self, articulo) -> str:
-        """Obtiene los autores como string separado por comas."""
-        try:
-            if not articulo.articulo_autores:
-                return ''
-            
-            autores = []
-            for aa in sorted(articulo.articulo_autores, key=lambda x: x.orden):
-                autor = aa.autor
-                nombre_completo = f"{autor.apellidos}, {autor.nombres}"
-                autores.append(nombre_completo)
-            
-            return '; '.join(autores)
-        except Exception as e:
-            self.logger.warning(f"Error obteniendo autores: {str(e)}")
-            return ''
+    @staticmethod
+    def _datos_metadata(num_articulos: int) -> List[Tuple[str, Any]]:
+        """Pares (etiqueta, valor) de la hoja de metadatos del reporte."""
+        return [
+            ('Fecha de Generación:', datetime.now().strftime('%Y-%m-%d %H:%M:%S')),
+            ('Total de Artículos:', num_articulos),
+            ('Sistema:', 'Sistema de Gestión de Artículos Académicos'),
+            ('Versión:', '1.0'),
+        ]
     
     def _get_lgacs(self, articulo) -> str:
         """Obtiene la LGAC como string."""
@@ -235,28 +593,6 @@ class ExcelService:
             self.logger.warning(f"Error obteniendo propósito: {str(e)}")
             return ''
     
-    def _get_indexaciones(self, articulo) -> str:
-        """Obtiene las indexaciones como string separado por comas."""
-        try:
-            indexaciones = set()
-            
-            # Indexaciones de la revista
-            if articulo.revista and hasattr(articulo.revista, 'revista_indexaciones'):
-                for ri in articulo.revista.revista_indexaciones:
-                    if ri.activo and ri.indexacion.activo:
-                        indexaciones.add(ri.indexacion.nombre)
-            
-            # Indexaciones adicionales del artículo
-            if hasattr(articulo, 'articulo_indexaciones'):
-                for ai in articulo.articulo_indexaciones:
-                    if ai.indexacion.activo:
-                        indexaciones.add(ai.indexacion.nombre)
-            
-            return ', '.join(sorted(indexaciones))
-        except Exception as e:
-            self.logger.warning(f"Error obteniendo indexaciones: {str(e)}")
-            return ''
-    
     def generate_filename(self, prefix: str = 'articulos') -> str:
         """
         Genera nombre de archivo con timestamp.
@@ -4,9 +4,11 @@ Maneja el upload y procesamiento de múltiples PDFs en paralelo.
 """
 import logging
 import threading
-from typing import List, Dict, Callable
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Callable, Tuple
 from pathlib import Path
-from queue import Queue
 from datetime import datetime
 
 from app import db
@@ -14,17 +16,38 @@ from app.models.articulo import Articulo
 from app.models.catalogs import TipoProduccion, Estado
 from app.services.file_handler import FileHandler
 from app.services.pdf_service import PDFService
+from app.utils.cache import get_estado_id
 
 
 logger = logging.getLogger(__name__)
 
+def _separar_nombre(texto: str) -> Tuple[str, str]:
+    """
+    Separa un nombre "Nombre Apellidos" en (nombre, apellidos): el primer
+    token es el nombre y el resto, con los espacios normalizados, los
+    apellidos.
+    """
+    partes = texto.split(maxsplit=1)
+    if len(partes) < 2:
+        return (partes[0] if partes else '', '')
+    return (partes[0], ' '.join(partes[1].split()))
+
 
 class PDFBatchProcessor:
     """
     Procesa múltiples PDFs en paralelo usando threads.
     Extrae metadatos y crea artículos automáticamente.
+    
+    Los hilos del pool solo guardan archivos y extraen metadatos: no usan
+    la sesión de BD. Todas las escrituras se hacen en el hilo que llama a
+    process_files, dentro de su propio contexto de aplicación (y por tanto
+    con su propia sesión, que se libera al terminar el lote).
     """
     
+    # Segundos mínimos entre dos llamadas a progress_callback, salvo que
+    # avance al menos un 1% del lote o termine (ver process_files)
+    INTERVALO_PROGRESO = 0.25
+    
     def __init__(self, upload_folder: str, max_workers: int = 5, app=None):
         """
         Inicializa el procesador de batch.
@@ -40,109 +63,158 @@ class PDFBatchProcessor:
         self.app = app
         self.results = []
         self.errors = []
-        self.lock = threading.Lock()
+        # (tipo_produccion_id, estado_id) por defecto, ver _default_catalogs
+        self._catalogos = None
     
     def process_files(self, files: List, progress_callback: Callable = None) -> Dict:
         """
         Procesa múltiples archivos PDF en paralelo.
         
+        Se hace en dos fases: el guardado y la extracción de metadatos se
+        reparten entre los hilos del pool; después, en este hilo, se crean
+        todos los artículos del lote con inserciones masivas y un solo
+        commit (ver _create_articles_from_metadata).
+        
         Args:
             files: Lista de FileStorage objects de Werkzeug
             progress_callback: Función callback para reportar progreso
+                (procesados, total); en lotes grandes se agrupan los avisos.
+                Un archivo cuenta como procesado al terminar su extracción,
+                pero (total, total) solo se reporta cuando los artículos del
+                lote ya se crearon (o fallaron) en la BD
             
         Returns:
-            Diccionario con resultados del procesamiento
+            Diccionario con resultados del procesamiento. processing_time de
+            cada archivo es su guardado y extracción; db_time es el tiempo
+            de la creación en lote de todos los artículos
         """
-        self.results = []
-        self.errors = []
+        # Resultados locales de esta llamada; se publican en self.results y
+        # self.errors al terminar
+        results = []
+        errors = []
+        self._catalogos = None
         
         total_files = len(files)
-        processed = 0
-        
-        # Cola de trabajo
-        work_queue = Queue()
-        for file in files:
-            work_queue.put(file)
-        
-        # Crear threads
-        threads = []
-        num_threads = min(self.max_workers, total_files)
-        
-        for i in range(num_threads):
-            thread = threading.Thread(
-                target=self._worker,
-                args=(work_queue, progress_callback, total_files),
-                daemon=True
-            )
-            thread.start()
-            threads.append(thread)
-        
-        # Esperar a que terminen todos los threads
-        for thread in threads:
-            thread.join()
+        extraidos = []
+        tiempo_lote = 0.0
+        
+        # El callback puede hacer E/S (p. ej. publicar el avance): se llama
+        # cada 1% del lote o cada INTERVALO_PROGRESO segundos, y al terminar
+        paso_progreso = max(1, total_files // 100)
+        ultimo_aviso = (0, time.monotonic())
+        
+        def reportar_progreso(final=False):
+            nonlocal ultimo_aviso
+            if not progress_callback:
+                return
+            if final:
+                procesados = len(results) + len(errors)
+            else:
+                procesados = len(extraidos) + len(errors)
+                if procesados == total_files:
+                    # El 100% se reporta al terminar la fase 2
+                    return
+            ahora = time.monotonic()
+            if (procesados - ultimo_aviso[0] >= paso_progreso or procesados == total_files
+                    or ahora - ultimo_aviso[1] >= self.INTERVALO_PROGRESO):
+                ultimo_aviso = (procesados, ahora)
+                progress_callback(procesados, total_files)
+        
+        # Fase 1: guardado y extracción. La extracción es sobre todo E/S
+        # (GROBID y Crossref por HTTP, lectura del archivo), así que basta un
+        # pool de hilos; los resultados se recogen en este hilo a medida que
+        # terminan las tareas: no hay estado compartido que proteger
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, total_files))) as executor:
+            futures = {
+                executor.submit(self._extract_single_file, file): file
+                for file in files
+            }
+            for future in as_completed(futures):
+                try:
+                    extraidos.append(future.result())
+                except Exception as e:
+                    errors.append(self._error_entry(futures[future].filename, e))
+                reportar_progreso()
+        
+        # Fase 2: creación de los artículos del lote
+        if extraidos:
+            inicio = time.monotonic()
+            creados = self._run_in_context(self._create_articles_from_metadata, [
+                (extraido['metadata'], extraido['filename'], extraido['filepath'])
+                for extraido in extraidos
+            ])
+            tiempo_lote = time.monotonic() - inicio
+            
+            for extraido, creado in zip(extraidos, creados):
+                if isinstance(creado, Exception):
+                    # Si falla la creación del artículo, eliminar el archivo subido
+                    self.file_handler.delete_file(extraido['filepath'])
+                    errors.append(self._error_entry(extraido['filename'], creado))
+                    continue
+                
+                metadata = extraido['metadata']
+                article_id, title = creado
+                results.append({
+                    'filename': extraido['filename'],
+                    'article_id': article_id,
+                    'title': title,
+                    'confidence': metadata['confidence'],
+                    'processing_time': extraido['processing_time'],
+                    'extracted_fields': {
+                        'titulo': bool(metadata['titulo']),
+                        'autores': len(metadata['autores']),
+                        'anio': bool(metadata['anio_publicacion']),
+                        'doi': bool(metadata['doi']),
+                        'issn': bool(metadata['issn']),
+                        'resumen': bool(metadata['resumen'])
+                    }
+                })
+        
+        if total_files:
+            reportar_progreso(final=True)
+        
+        self.results = results
+        self.errors = errors
         
         # Compilar resultados
         return {
             'total': total_files,
-            'success': len(self.results),
-            'errors': len(self.errors),
-            'results': self.results,
-            'error_details': self.errors
+            'success': len(results),
+            'errors': len(errors),
+            'results': results,
+            'error_details': errors,
+            'db_time': tiempo_lote
+        }
+    
+    def _error_entry(self, filename: str, error: Exception) -> Dict:
+        """Registra en el log el error de un archivo y lo retorna como detalle."""
+        logger.error(f"Error procesando {filename}: {error}")
+        return {
+            'filename': filename,
+            'error': str(error)
         }
     
-    def _worker(self, work_queue: Queue, progress_callback: Callable, total: int):
+    def _run_in_context(self, func: Callable, *args):
         """
-        Worker thread que procesa archivos de la cola.
+        Ejecuta func dentro de un contexto de la aplicación si hay una (al
+        salir se libera la sesión de BD usada).
         """
-        # Si hay una app, configurar el contexto para este thread
-        if self.app:
-            ctx = self.app.app_context()
-            ctx.push()
-        else:
-            ctx = None
-        
-        try:
-            while not work_queue.empty():
-                try:
-                    file = work_queue.get_nowait()
-                except:
-                    break
-                
-                try:
-                    result = self._process_single_file(file)
-                    
-                    with self.lock:
-                        self.results.append(result)
-                        
-                        if progress_callback:
-                            progress = len(self.results) + len(self.errors)
-                            progress_callback(progress, total)
-                            
-                except Exception as e:
-                    logger.error(f"Error procesando {file.filename}: {e}")
-                    with self.lock:
-                        self.errors.append({
-                            'filename': file.filename,
-                            'error': str(e)
-                        })
-                finally:
-                    work_queue.task_done()
-        finally:
-            # Limpiar el contexto al finalizar el thread
-            if ctx:
-                ctx.pop()
+        if not self.app:
+            return func(*args)
+        with self.app.app_context():
+            return func(*args)
     
-    def _process_single_file(self, file) -> Dict:
+    def _extract_single_file(self, file) -> Dict:
         """
-        Procesa un único archivo PDF.
+        Guarda un archivo PDF y extrae sus metadatos (sin acceder a la BD).
         
         Args:
             file: FileStorage object
-            
+        
         Returns:
-            Diccionario con resultado del procesamiento
+            Diccionario con filename, filepath, metadata y processing_time
         """
-        start_time = datetime.now()
+        inicio = time.monotonic()
         
         # 1. Guardar archivo
         success, error, filepath = self.file_handler.save_file(file)
@@ -158,45 +230,11 @@ class PDFBatchProcessor:
             self.file_handler.delete_file(filepath)
             raise Exception(f"Error al extraer metadatos: {metadata['error']}")
         
-        # 3. Crear artículo en la BD
-        try:
-            articulo = self._create_article_from_metadata(
-                metadata,
-                original_filename=file.filename,
-                stored_filepath=filepath
-            )
-        except Exception as e:
-            # IMPORTANTE: Hacer rollback de la sesión si hubo error
-            db.session.rollback()
-            
-            # Si falla la creación del artículo, eliminar el archivo subido
-            self.file_handler.delete_file(filepath)
-            
-            # Verificar si es un error de DOI duplicado
-            error_msg = str(e)
-            if 'UNIQUE constraint failed: articulos.doi' in error_msg or 'duplicate key' in error_msg.lower():
-                doi = metadata.get('doi', 'desconocido')
-                raise Exception(f"Ya existe un artículo con el DOI: {doi}. No se puede duplicar el registro.")
-            else:
-                # Otro tipo de error
-                raise Exception(f"Error al crear el artículo: {str(e)}")
-        
-        processing_time = (datetime.now() - start_time).total_seconds()
-        
         return {
             'filename': file.filename,
-            'article_id': articulo.id,
-            'title': articulo.titulo,
-            'confidence': metadata['confidence'],
-            'processing_time': processing_time,
-            'extracted_fields': {
-                'titulo': bool(metadata['titulo']),
-                'autores': len(metadata['autores']),
-                'anio': bool(metadata['anio_publicacion']),
-                'doi': bool(metadata['doi']),
-                'issn': bool(metadata['issn']),
-                'resumen': bool(metadata['resumen'])
-            }
+            'filepath': filepath,
+            'metadata': metadata,
+            'processing_time': time.monotonic() - inicio
         }
     
     def _create_article_from_metadata(self, metadata: Dict, original_filename: str, 
@@ -215,125 +253,241 @@ class PDFBatchProcessor:
         Raises:
             Exception: Si ya existe un artículo con el mismo DOI
         """
-        # Verificar si ya existe un artículo con este DOI
-        doi = metadata.get('doi')
-        if doi:
-            articulo_existente = Articulo.query.filter_by(doi=doi).first()
-            if articulo_existente:
-                raise Exception(f"Ya existe un artículo con el DOI: {doi}. Título: '{articulo_existente.titulo}'")
+        creado = self._create_articles_from_metadata(
+            [(metadata, original_filename, stored_filepath)]
+        )[0]
+        if isinstance(creado, Exception):
+            raise creado
+        return db.session.get(Articulo, creado[0])
+    
+    def _create_articles_from_metadata(self, entradas: List[Tuple[Dict, str, str]]) -> List:
+        """
+        Crea los artículos de un lote con sus autores y un solo commit.
+        
+        Los DOI repetidos y los autores existentes se buscan con una consulta
+        cada uno para todo el lote; autores nuevos y artículos se insertan en
+        un solo flush (INSERT de varias filas por tabla) y los vínculos
+        artículo-autor con un solo INSERT executemany. Si el commit falla,
+        cada artículo se reintenta por separado para aislar el que falló.
+        
+        Args:
+            entradas: Lista de tuplas (metadata, original_filename, stored_filepath)
+        
+        Returns:
+            Lista con una tupla (article_id, titulo) o la excepción de cada entrada
+        """
+        from app.models.autor import Autor
+        from app.models.relations import ArticuloAutor
+        
+        try:
+            tipo_id, estado_id = self._default_catalogs()
+        except ValueError as e:
+            return [e] * len(entradas)
+        
+        resultados = [None] * len(entradas)
+        
+        # DOI ya registrados, con una sola consulta para el lote (los DOI se
+        # guardan normalizados, ver Articulo.normalizar_doi); sin DOI en el
+        # lote no hay nada que consultar
+        dois = [Articulo.normalizar_doi(metadata.get('doi')) for metadata, _, _ in entradas]
+        titulos_por_doi = {}
+        if any(dois):
+            titulos_por_doi = dict(db.session.execute(
+                db.select(Articulo.doi, Articulo.titulo)
+                .where(Articulo.doi.in_({doi for doi in dois if doi}))
+            ).all())
+        
+        # Autores de cada artículo y pares (nombre, apellidos) distintos del lote
+        autores_por_entrada = [self._parse_authors(metadata) for metadata, _, _ in entradas]
+        pares = {(nombre, apellidos) for autores in autores_por_entrada
+                 for nombre, apellidos, _ in autores}
+        
+        # IDs de los autores existentes: una consulta de solo tres columnas
+        # (sin construir objetos Autor); si hay homónimos exactos se usa el
+        # de menor id
+        autor_ids = {}
+        if pares:
+            for autor_id, nombre, apellidos in db.session.execute(
+                db.select(Autor.id, Autor.nombre, Autor.apellidos)
+                .where(db.tuple_(Autor.nombre, Autor.apellidos).in_(pares))
+                .order_by(Autor.id)
+            ):
+                autor_ids.setdefault((nombre, apellidos), autor_id)
+        autores_nuevos = {}
+        
+        nuevos = []
+        for i, (metadata, original_filename, _) in enumerate(entradas):
+            doi = dois[i]
+            if doi and doi in titulos_por_doi:
+                resultados[i] = Exception(
+                    f"Ya existe un artículo con el DOI: {metadata.get('doi')}. "
+                    f"Título: '{titulos_por_doi[doi]}'"
+                )
+                continue
+            
+            # Preparar datos del artículo
+            titulo = metadata.get('titulo') or f"Documento sin título - {original_filename}"
+            
+            # Limpiar título si es muy largo
+            if len(titulo) > 500:
+                titulo = titulo[:497] + "..."
+            
+            if doi:
+                # Un segundo PDF del lote con el mismo DOI también se rechaza
+                titulos_por_doi[doi] = titulo
+            
+            for nombre, apellidos, _ in autores_por_entrada[i]:
+                par = (nombre, apellidos)
+                if par not in autor_ids and par not in autores_nuevos:
+                    autores_nuevos[par] = Autor(
+                        nombre=nombre,
+                        apellidos=apellidos,
+                        es_miembro_ca=False,
+                        activo=True
+                    )
+            
+            # Crear artículo
+            articulo = Articulo(
+                titulo=titulo,
+                tipo_produccion_id=tipo_id,
+                estado_id=estado_id,
+                anio_publicacion=metadata.get('anio_publicacion'),
+                doi=metadata.get('doi'),
+                issn=metadata.get('issn'),
+                descripcion=metadata.get('resumen'),  # Mapear resumen extraído a descripción
+                archivo_origen=original_filename,
+                completo=False,  # Marcar como incompleto para edición posterior
+                campos_faltantes=self._identify_missing_fields(metadata),
+                activo=True,
+                para_curriculum=True
+            )
+            db.session.add(articulo)
+            nuevos.append((i, articulo))
+        
+        if not nuevos:
+            return resultados
+        db.session.add_all(autores_nuevos.values())
+        
+        try:
+            # Un flush para autores nuevos y artículos (ids disponibles)
+            db.session.flush()
+            autor_ids.update((par, autor.id) for par, autor in autores_nuevos.items())
+            
+            vinculos = []
+            for i, articulo in nuevos:
+                # El artículo es nuevo, así que un autor solo puede repetirse
+                # dentro de lo extraído (uq_articulo_autor rechazaría el commit)
+                vinculados = set()
+                for nombre, apellidos, orden in autores_por_entrada[i]:
+                    autor_id = autor_ids[(nombre, apellidos)]
+                    if autor_id in vinculados:
+                        continue
+                    vinculados.add(autor_id)
+                    
+                    vinculos.append({
+                        'articulo_id': articulo.id,
+                        'autor_id': autor_id,
+                        'orden': orden,
+                        'es_corresponsal': orden == 1  # Primer autor como corresponsal
+                    })
+                resultados[i] = (articulo.id, articulo.titulo)
+            
+            if vinculos:
+                db.session.execute(db.insert(ArticuloAutor), vinculos)
+            
+            db.session.commit()
+        except Exception as e:
+            # IMPORTANTE: Hacer rollback de la sesión si hubo error
+            db.session.rollback()
+            
+            if len(nuevos) > 1:
+                # Reintentar uno por uno para que solo falle el artículo culpable
+                for i, _ in nuevos:
+                    resultados[i] = self._create_articles_from_metadata([entradas[i]])[0]
+                return resultados
+            
+            # Verificar si es un error de DOI duplicado
+            error_msg = str(e)
+            i = nuevos[0][0]
+            if 'UNIQUE constraint failed: articulos.doi' in error_msg or 'duplicate key' in error_msg.lower():
+                doi = entradas[i][0].get('doi', 'desconocido')
+                resultados[i] = Exception(f"Ya existe un artículo con el DOI: {doi}. No se puede duplicar el registro.")
+            else:
+                # Otro tipo de error
+                resultados[i] = Exception(f"Error al crear el artículo: {error_msg}")
+        
+        return resultados
+    
+    def _default_catalogs(self) -> Tuple[int, int]:
+        """
+        IDs del tipo de producción y del estado asignados a los artículos
+        extraídos. Se consultan una vez por lote (process_files reinicia el
+        valor) y se reutilizan en los reintentos individuales.
+        
+        Raises:
+            ValueError: Si no hay tipos de producción o estados en la BD
+        """
+        if self._catalogos is not None:
+            return self._catalogos
         
         # Obtener tipo de producción por defecto (debe existir desde seed_catalogs.py)
-        tipo_default = TipoProduccion.query.filter_by(
-            nombre='Artículo científico'
-        ).first()
+        tipo_id = db.session.scalar(
+            db.select(TipoProduccion.id).filter_by(nombre='Artículo científico')
+        )
         
-        if not tipo_default:
+        if tipo_id is None:
             # Fallback: buscar el primer tipo activo disponible
-            tipo_default = TipoProduccion.query.filter_by(activo=True).first()
+            tipo_id = db.session.scalar(
+                db.select(TipoProduccion.id).filter_by(activo=True).limit(1)
+            )
             
-            if not tipo_default:
+            if tipo_id is None:
                 raise ValueError(
                     "No hay tipos de producción en la base de datos. "
                     "Ejecuta: python scripts/seed_catalogs.py"
                 )
         
-        # Obtener estado "Publicado" por defecto (debe existir desde seed_catalogs.py)
-        estado_default = Estado.query.filter_by(
-            nombre='Publicado'
-        ).first()
+        # Obtener estado "Publicado" por defecto (debe existir desde
+        # seed_catalogs.py); su id se cachea en el proceso
+        estado_id = get_estado_id('Publicado')
         
-        if not estado_default:
+        if estado_id is None:
             # Fallback: buscar el primer estado activo disponible
-            estado_default = Estado.query.filter_by(activo=True).first()
+            estado_id = db.session.scalar(
+                db.select(Estado.id).filter_by(activo=True).limit(1)
+            )
             
-            if not estado_default:
+            if estado_id is None:
                 raise ValueError(
                     "No hay estados en la base de datos. "
                     "Ejecuta: python scripts/seed_catalogs.py"
                 )
         
-        # Preparar datos del artículo
-        titulo = metadata.get('titulo') or f"Documento sin título - {original_filename}"
-        
-        # Limpiar título si es muy largo
-        if len(titulo) > 500:
-            titulo = titulo[:497] + "..."
-        
-        # Crear artículo
-        articulo = Articulo(
-            titulo=titulo,
-            tipo_produccion_id=tipo_default.id,
-            estado_id=estado_default.id,
-            anio_publicacion=metadata.get('anio_publicacion'),
-            doi=metadata.get('doi'),
-            issn=metadata.get('issn'),
-            descripcion=metadata.get('resumen'),  # Mapear resumen extraído a descripción
-            archivo_origen=original_filename,
-            completo=False,  # Marcar como incompleto para edición posterior
-            campos_faltantes=self._identify_missing_fields(metadata),
-            activo=True,
-            para_curriculum=True
-        )
-        
-        db.session.add(articulo)
-        db.session.flush()  # Para obtener el ID del artículo
-        
-        # Crear autores si se extrajeron
-        if metadata.get('autores'):
-            from app.models.autor import Autor
-            from app.models.relations import ArticuloAutor
+        self._catalogos = (tipo_id, estado_id)
+        return self._catalogos
+    
+    def _parse_authors(self, metadata: Dict) -> List[Tuple[str, str, int]]:
+        """
+        Autores extraídos como tuplas (nombre, apellidos, orden); se omiten
+        los que no tienen nombre ni apellidos.
+        """
+        autores = []
+        for idx, autor_data in enumerate(metadata.get('autores') or [], start=1):
+            # Manejar formato dict (GROBID/Crossref) o string (heurísticas)
+            if isinstance(autor_data, dict):
+                # Formato nuevo: {'nombre': 'John', 'apellidos': 'Doe', 'orden': 1}
+                nombre = autor_data.get('nombre', '').strip()
+                apellidos = autor_data.get('apellidos', '').strip()
+                orden = autor_data.get('orden', idx)
+            else:
+                # Formato legacy: string "John Doe"
+                nombre, apellidos = _separar_nombre(str(autor_data))
+                orden = idx
             
-            for idx, autor_data in enumerate(metadata['autores'], start=1):
-                # Manejar formato dict (GROBID/Crossref) o string (heurísticas)
-                if isinstance(autor_data, dict):
-                    # Formato nuevo: {'nombre': 'John', 'apellidos': 'Doe', 'orden': 1}
-                    nombre = autor_data.get('nombre', '').strip()
-                    apellidos = autor_data.get('apellidos', '').strip()
-                    orden = autor_data.get('orden', idx)
-                else:
-                    # Formato legacy: string "John Doe"
-                    autor_nombre = str(autor_data).strip()
-                    partes = autor_nombre.split()
-                    if len(partes) >= 2:
-                        nombre = partes[0]
-                        apellidos = ' '.join(partes[1:])
-                    else:
-                        nombre = autor_nombre
-                        apellidos = ''
-                    orden = idx
-                
-                # Validar que hay al menos nombre o apellidos
-                if not nombre and not apellidos:
-                    continue
-                
-                # Buscar o crear autor
-                autor = Autor.query.filter_by(
-                    nombre=nombre,
-                    apellidos=apellidos
-                ).first()
-                
-                if not autor:
-                    autor = Autor(
-                        nombre=nombre,
-                        apellidos=apellidos,
-                        es_miembro_ca=False,
-                        activo=True
-                    )
-                    db.session.add(autor)
-                    db.session.flush()
-                
-                # Crear relación artículo-autor
-                articulo_autor = ArticuloAutor(
-                    articulo_id=articulo.id,
-                    autor_id=autor.id,
-                    orden=orden,
-                    es_corresponsal=(orden == 1)  # Primer autor como corresponsal
-                )
-                db.session.add(articulo_autor)
-        
-        db.session.commit()
-        
-        return articulo
+            # Validar que hay al menos nombre o apellidos
+            if nombre or apellidos:
+                autores.append((nombre, apellidos, orden))
+        return autores
     
     def _identify_missing_fields(self, metadata: Dict) -> str:
         """
@@ -372,6 +526,13 @@ class UploadSession:
     Útil para tracking en tiempo real.
     """
     
+    # get_progress se consulta en cada sondeo del cliente: atributos fijos
+    # sin __dict__ por instancia
+    __slots__ = (
+        'session_id', 'total_files', 'processed', 'success', 'errors',
+        'start_time', 'status', 'results', 'lock'
+    )
+    
     def __init__(self, session_id: str, total_files: int):
         """
         Inicializa una sesión de upload.
@@ -385,7 +546,9 @@ class UploadSession:
         self.processed = 0
         self.success = 0
         self.errors = 0
-        self.start_time = datetime.now()
+        # Instante de inicio en time.monotonic(): solo se usa para medir
+        # tiempos transcurridos, no para mostrar la hora
+        self.start_time = time.monotonic()
         self.status = 'processing'  # processing, completed, failed
         self.results = []
         self.lock = threading.Lock()
@@ -404,20 +567,27 @@ class UploadSession:
     
     def get_progress(self) -> Dict:
         """Obtiene el progreso actual"""
+        # Bajo el lock solo se toma una copia consistente de los contadores;
+        # los cálculos se hacen fuera (session_id y total_files no cambian)
         with self.lock:
-            elapsed = (datetime.now() - self.start_time).total_seconds()
-            
-            return {
-                'session_id': self.session_id,
-                'status': self.status,
-                'total': self.total_files,
-                'processed': self.processed,
-                'success': self.success,
-                'errors': self.errors,
-                'progress_percent': (self.processed / self.total_files * 100) if self.total_files > 0 else 0,
-                'elapsed_time': elapsed,
-                'estimated_remaining': (elapsed / self.processed * (self.total_files - self.processed)) if self.processed > 0 else 0
-            }
+            status, processed, success, errors = (
+                self.status, self.processed, self.success, self.errors
+            )
+        
+        total = self.total_files
+        elapsed = time.monotonic() - self.start_time
+        
+        return {
+            'session_id': self.session_id,
+            'status': status,
+            'total': total,
+            'processed': processed,
+            'success': success,
+            'errors': errors,
+            'progress_percent': (processed / total * 100) if total > 0 else 0,
+            'elapsed_time': elapsed,
+            'estimated_remaining': (elapsed / processed * (total - processed)) if processed > 0 else 0
+        }
     
     def add_result(self, result: Dict):
         """Agrega un resultado a la sesión"""
@@ -425,8 +595,10 @@ class UploadSession:
             self.results.append(result)
 
 
-# Almacenamiento global de sesiones (en producción usar Redis o similar)
-_upload_sessions = {}
+# Almacenamiento global de sesiones (en producción usar Redis o similar).
+# Se insertan al crearse, así que quedan ordenadas por start_time: la más
+# antigua es la primera
+_upload_sessions: 'OrderedDict[str, UploadSession]' = OrderedDict()
 _sessions_lock = threading.Lock()
 
 
@@ -449,17 +621,21 @@ def get_upload_session(session_id: str) -> UploadSession:
 
 
 def cleanup_old_sessions(max_age_hours: int = 24):
-    """Limpia sesiones antiguas"""
+    """
+    Limpia sesiones antiguas.
+    
+    Se eliminan desde la más antigua y el recorrido se detiene en la
+    primera que no ha expirado: el lock se retiene solo por las expiradas.
+    """
+    limite = time.monotonic() - max_age_hours * 3600
+    eliminadas = 0
+    
     with _sessions_lock:
-        now = datetime.now()
-        to_remove = []
-        
-        for session_id, session in _upload_sessions.items():
-            age_hours = (now - session.start_time).total_seconds() / 3600
-            if age_hours > max_age_hours:
-                to_remove.append(session_id)
-        
-        for session_id in to_remove:
-            del _upload_sessions[session_id]
-        
-        return len(to_remove)
+        while _upload_sessions:
+            session = next(iter(_upload_sessions.values()))
+            if session.start_time >= limite:
+                break
+            _upload_sessions.popitem(last=False)
+            eliminadas += 1
+    
+    return eliminadas
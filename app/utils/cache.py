@@ -0,0 +1,279 @@
+"""
+Cachés en memoria del proceso.
+Evitan consultas repetidas a tablas de catálogo que casi nunca cambian
+y recalcular las estadísticas de artículos en cada carga del dashboard.
+"""
+import copy
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Type
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app import db
+from app.models import (
+    Articulo, Autor, TipoProduccion, Estado, Proposito, LGAC, Revista, Indexacion
+)
+
+
+# Modelos cuya existencia por ID se cachea
+CATALOG_MODELS = (TipoProduccion, Estado, Proposito, LGAC, Revista)
+
+# IDs confirmados como existentes, por modelo. Solo se cachean resultados
+# positivos: un ID inexistente se vuelve a consultar, así un registro recién
+# creado (incluso por otro proceso) se reconoce sin invalidar nada.
+_ids_existentes: Dict[Type, Set[int]] = {modelo: set() for modelo in CATALOG_MODELS}
+_lock = threading.Lock()
+
+
+def clear_catalog_cache(modelo: Type = None) -> None:
+    """Vacía la caché de un modelo, o de todos si no se indica."""
+    with _lock:
+        if modelo is None:
+            for ids in _ids_existentes.values():
+                ids.clear()
+        elif modelo in _ids_existentes:
+            _ids_existentes[modelo].clear()
+
+
+def catalogs_exist(referencias: List[Tuple[Type, int]]) -> List[bool]:
+    """
+    Indica para cada (modelo, id) si existe en la base de datos.
+    
+    Los IDs que no están en caché se resuelven juntos en un solo SELECT
+    con un EXISTS por referencia; si todos están en caché no hay consulta.
+    
+    Args:
+        referencias: Lista de tuplas (modelo, id)
+    
+    Returns:
+        Lista de booleanos (True = existe) en el mismo orden
+    """
+    resultado = [id_ in _ids_existentes[modelo] for modelo, id_ in referencias]
+    pendientes = [i for i, existe in enumerate(resultado) if not existe]
+    if not pendientes:
+        return resultado
+    
+    existencias = db.session.execute(db.select(*[
+        db.exists().where(referencias[i][0].id == referencias[i][1])
+        for i in pendientes
+    ])).one()
+    
+    with _lock:
+        for i, existe in zip(pendientes, existencias):
+            if existe:
+                modelo, id_ = referencias[i]
+                _ids_existentes[modelo].add(id_)
+                resultado[i] = True
+    
+    return resultado
+
+
+def catalog_ids_existing(modelo: Type, ids) -> Set[int]:
+    """
+    Retorna el subconjunto de ids que existen en el catálogo modelo.
+    
+    Pensado para cargas masivas: los ids fuera de caché se resuelven con
+    un solo SELECT ... WHERE id IN (...).
+    """
+    ids = set(ids)
+    existentes = ids & _ids_existentes[modelo]
+    faltantes = ids - existentes
+    if faltantes:
+        encontrados = set(db.session.scalars(
+            db.select(modelo.id).where(modelo.id.in_(faltantes))
+        ))
+        with _lock:
+            _ids_existentes[modelo].update(encontrados)
+        existentes |= encontrados
+    return existentes
+
+
+def catalog_has(modelo: Type, id_: int) -> bool:
+    """Indica si existe el registro id_ del catálogo modelo."""
+    return catalogs_exist([(modelo, id_)])[0]
+
+
+# Nombres de registros de catálogo por id, por modelo (solo encontrados).
+# Se invalidan al renombrar o eliminar un registro del modelo.
+_nombres: Dict[Type, Dict[int, str]] = {modelo: {} for modelo in CATALOG_MODELS}
+
+
+def get_catalog_name(modelo: Type, id_: int) -> Optional[str]:
+    """
+    Retorna el nombre del registro id_ del catálogo modelo, o None si no existe.
+    
+    En caso de fallo de caché consulta solo la columna nombre (sin construir
+    el objeto ORM).
+    """
+    nombre = _nombres[modelo].get(id_)
+    if nombre is None:
+        nombre = db.session.scalar(db.select(modelo.nombre).where(modelo.id == id_))
+        if nombre is not None:
+            with _lock:
+                _nombres[modelo][id_] = nombre
+    return nombre
+
+
+def clear_catalog_names_cache(modelo: Type = None) -> None:
+    """Vacía la caché de nombres de un modelo, o de todos si no se indica."""
+    with _lock:
+        if modelo is None:
+            for nombres in _nombres.values():
+                nombres.clear()
+        elif modelo in _nombres:
+            _nombres[modelo].clear()
+
+
+# === IDs de estados por nombre ===
+
+# Estados buscados por nombre (p. ej. 'Publicado'). Igual que arriba, solo se
+# cachean los encontrados; se invalida si un estado se renombra o elimina.
+_estados_por_nombre: Dict[str, int] = {}
+
+
+def get_estado_id(nombre: str) -> Optional[int]:
+    """Retorna el id del estado con ese nombre, o None si no existe."""
+    estado_id = _estados_por_nombre.get(nombre)
+    if estado_id is None:
+        estado_id = db.session.scalar(db.select(Estado.id).filter_by(nombre=nombre))
+        if estado_id is not None:
+            with _lock:
+                _estados_por_nombre[nombre] = estado_id
+    return estado_id
+
+
+def clear_estado_ids_cache() -> None:
+    """Vacía la caché de ids de estados por nombre."""
+    with _lock:
+        _estados_por_nombre.clear()
+
+
+# === Estadísticas de artículos ===
+
+# Último resultado de ArticleController.get_statistics y su expiración
+# (time.monotonic). Se invalida al escribir artículos o los catálogos
+# cuyos nombres aparecen en el resultado.
+_estadisticas: Dict[str, Any] = {'valor': None, 'expira': 0.0}
+
+
+def get_cached_statistics() -> Optional[Dict[str, Any]]:
+    """Retorna una copia de las estadísticas en caché, o None si expiraron."""
+    with _lock:
+        if _estadisticas['valor'] is None or time.monotonic() >= _estadisticas['expira']:
+            return None
+        return copy.deepcopy(_estadisticas['valor'])
+
+
+def set_cached_statistics(valor: Dict[str, Any], timeout: int) -> None:
+    """Guarda las estadísticas durante timeout segundos (0 desactiva la caché)."""
+    if timeout <= 0:
+        return
+    with _lock:
+        _estadisticas['valor'] = copy.deepcopy(valor)
+        _estadisticas['expira'] = time.monotonic() + timeout
+
+
+def clear_statistics_cache() -> None:
+    """Invalida las estadísticas en caché."""
+    with _lock:
+        _estadisticas['valor'] = None
+
+
+# === Opciones de formularios ===
+
+# Modelos cuyos registros aparecen como opciones en los formularios
+CHOICE_MODELS = (TipoProduccion, Proposito, LGAC, Estado, Revista, Autor, Indexacion)
+
+# Opciones ya construidas por clave ('tipo_produccion', 'autor', ...):
+# clave -> (expiración time.monotonic, opciones). Cualquier escritura en un
+# modelo de CHOICE_MODELS vacía todas; el timeout cubre cambios hechos por
+# otros procesos.
+_opciones: Dict[str, Tuple[float, Any]] = {}
+
+
+def get_cached_choices(clave: str, cargar: Callable[[], Any], timeout: int) -> Any:
+    """
+    Retorna las opciones en caché para clave, o las carga con cargar().
+    
+    El valor retornado es compartido: no debe modificarse.
+    
+    Args:
+        clave: Identificador del conjunto de opciones
+        cargar: Función sin argumentos que consulta las opciones
+        timeout: Segundos de validez (0 desactiva la caché)
+    """
+    entrada = _opciones.get(clave)
+    if entrada is not None and time.monotonic() < entrada[0]:
+        return entrada[1]
+    
+    valor = cargar()
+    if timeout > 0:
+        with _lock:
+            _opciones[clave] = (time.monotonic() + timeout, valor)
+    return valor
+
+
+def clear_choices_cache() -> None:
+    """Vacía la caché de opciones de formularios."""
+    with _lock:
+        _opciones.clear()
+
+
+def _invalidar_estadisticas(*args, **kwargs):
+    clear_statistics_cache()
+
+
+def _invalidar_estadisticas_bulk(orm_execute_state):
+    """Invalida ante INSERT/UPDATE/DELETE masivos sobre articulos (sin eventos de mapper)."""
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update
+            or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ is Articulo:
+        clear_statistics_cache()
+
+
+def _invalidar_modelo(mapper, connection, target):
+    clear_catalog_cache(type(target))
+
+
+def _invalidar_nombres(mapper, connection, target):
+    clear_catalog_names_cache(type(target))
+
+
+def _invalidar_estado_ids(*args, **kwargs):
+    clear_estado_ids_cache()
+
+
+def _invalidar_opciones(*args, **kwargs):
+    clear_choices_cache()
+
+
+def _invalidar_todo(*args, **kwargs):
+    clear_catalog_cache()
+    clear_catalog_names_cache()
+    clear_estado_ids_cache()
+    clear_choices_cache()
+    clear_statistics_cache()
+
+
+for _modelo in CATALOG_MODELS:
+    event.listen(_modelo, 'after_delete', _invalidar_modelo)
+    event.listen(_modelo, 'after_update', _invalidar_nombres)
+    event.listen(_modelo, 'after_delete', _invalidar_nombres)
+
+for _evento in ('after_insert', 'after_update', 'after_delete'):
+    event.listen(Articulo, _evento, _invalidar_estadisticas)
+event.listen(TipoProduccion, 'after_update', _invalidar_estadisticas)
+event.listen(Estado, 'after_update', _invalidar_estadisticas)
+event.listen(Estado, 'after_update', _invalidar_estado_ids)
+event.listen(Estado, 'after_delete', _invalidar_estado_ids)
+event.listen(Session, 'do_orm_execute', _invalidar_estadisticas_bulk)
+
+for _modelo in CHOICE_MODELS:
+    for _evento in ('after_insert', 'after_update', 'after_delete'):
+        event.listen(_modelo, _evento, _invalidar_opciones)
+
+# create_all/drop_all (p. ej. entre tests) reinician los IDs
+event.listen(db.metadata, 'after_create', _invalidar_todo)
+event.listen(db.metadata, 'after_drop', _invalidar_todo)
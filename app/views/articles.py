@@ -60,6 +60,54 @@ def index():
     )
 
 
+@articles_bp.route('/api/list')
+def api_list():
+    """
+    Listado JSON de artículos con paginación por cursor ("cargar más").
+    GET /articles/api/list?cursor=...&per_page=20&tipo_id=1&query=machine+learning
+    
+    Cada respuesta incluye next_cursor, que se envía como cursor para pedir
+    la página siguiente; no se calcula el total.
+    """
+    filters = {
+        'tipo_id': request.args.get('tipo_id', type=int),
+        'estado_id': request.args.get('estado_id', type=int),
+        'lgac_id': request.args.get('lgac_id', type=int),
+        'anio': request.args.get('anio', type=int),
+        'autor_id': request.args.get('autor_id', type=int),
+        'query': request.args.get('query', '').strip()
+    }
+    filters = {k: v for k, v in filters.items() if v}
+    
+    pagina, error = ArticleController.get_all_keyset(
+        cursor=request.args.get('cursor') or None,
+        per_page=request.args.get('per_page', 20, type=int),
+        **filters
+    )
+    
+    if error:
+        return jsonify({'error': error}), 400
+    
+    # Solo los campos del listado (tipo y estado vienen en la misma consulta)
+    return jsonify({
+        'items': [
+            {
+                'id': articulo.id,
+                'titulo': articulo.titulo,
+                'titulo_revista': articulo.titulo_revista,
+                'anio_publicacion': articulo.anio_publicacion,
+                'tipo_produccion': articulo.tipo.nombre if articulo.tipo else None,
+                'estado': articulo.estado.nombre if articulo.estado else None,
+                'completo': articulo.completo,
+                'url': url_for('articles.show', id=articulo.id)
+            }
+            for articulo in pagina['items']
+        ],
+        'next_cursor': pagina['next_cursor'],
+        'has_next': pagina['has_next']
+    })
+
+
 @articles_bp.route('/new', methods=['GET', 'POST'])
 def new():
     """
@@ -447,7 +495,7 @@ def export_excel():
     try:
         # Obtener filtros de la URL (mismos que en la lista)
         filters = {
-            'tipo_id': request.args.get('tipo_id', type=int),
+            'tipo_produccion_id': request.args.get('tipo_id', type=int),
             'estado_id': request.args.get('estado_id', type=int),
             'lgac_id': request.args.get('lgac_id', type=int),
             'anio_inicio': request.args.get('anio_inicio', type=int),
@@ -469,7 +517,8 @@ def export_excel():
         controller = ReportController()
         excel_file, filename = controller.export_excel(filters)
         
-        # Enviar archivo
+        # Enviar archivo: send_file lo transmite por bloques (sin
+        # Content-Length) y lo cierra al terminar, lo que borra el temporal
         return send_file(
             excel_file,
             mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
@@ -492,7 +541,7 @@ def export_preview():
     try:
         # Obtener filtros
         filters = {
-            'tipo_id': request.args.get('tipo_id', type=int),
+            'tipo_produccion_id': request.args.get('tipo_id', type=int),
             'estado_id': request.args.get('estado_id', type=int),
             'lgac_id': request.args.get('lgac_id', type=int),
             'anio_inicio': request.args.get('anio_inicio', type=int),
@@ -36,6 +36,15 @@ class Config:
     # Paginación
     ARTICLES_PER_PAGE = 20
     
+    # Lanzar excepción ante cargas perezosas no previstas en listados (detecta N+1)
+    ARTICLES_RAISELOAD = False
+    
+    # Caché de estadísticas de artículos (segundos)
+    STATS_CACHE_TIMEOUT = int(os.environ.get('STATS_CACHE_TIMEOUT', 60))
+    
+    # Caché de opciones de catálogos en formularios (segundos)
+    CHOICES_CACHE_TIMEOUT = int(os.environ.get('CHOICES_CACHE_TIMEOUT', 60))
+    
     # Background worker
     WORKER_CHECK_INTERVAL = 3600  # 1 hora en segundos
     
@@ -47,6 +56,7 @@ class DevelopmentConfig(Config):
     """Configuración para desarrollo"""
     DEBUG = True
     SQLALCHEMY_ECHO = True  # Mostrar queries SQL
+    ARTICLES_RAISELOAD = True
 
 
 class ProductionConfig(Config):
@@ -58,6 +68,7 @@ class ProductionConfig(Config):
 class TestingConfig(Config):
     """Configuración para testing"""
     TESTING = True
+    ARTICLES_RAISELOAD = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
     WTF_CSRF_ENABLED = False
 
@@ -51,6 +51,25 @@ def get_metadata():
     return target_db.metadata
 
 
+def include_object_for(dialect_name):
+    """
+    Filtro include_object de autogenerate: omite los objetos del modelo
+    declarados con .ddl_if(dialect=...) para otro motor (índices GIN de
+    PostgreSQL, el índice parcial de cada motor, etc.), que autogenerate
+    no distingue por sí mismo.
+    """
+    def include_object(obj, name, type_, reflected, compare_to):
+        ddl_if = getattr(obj, '_ddl_if', None)
+        if reflected or ddl_if is None or ddl_if.dialect is None:
+            return True
+        dialectos = ddl_if.dialect
+        if isinstance(dialectos, str):
+            dialectos = (dialectos,)
+        return dialect_name in dialectos
+    
+    return include_object
+
+
 def run_migrations_offline():
     """Run migrations in 'offline' mode.
 
@@ -97,6 +116,14 @@ def run_migrations_online():
     connectable = get_engine()
 
     with connectable.connect() as connection:
+        # En SQLite las migraciones batch recrean tablas; con claves foráneas
+        # activas, borrar la tabla original dispararía los ON DELETE CASCADE
+        if connection.dialect.name == 'sqlite':
+            connection.exec_driver_sql('PRAGMA foreign_keys=OFF')
+            connection.commit()
+        
+        conf_args.setdefault(
+            'include_object', include_object_for(connection.dialect.name))
         context.configure(
             connection=connection,
             target_metadata=get_metadata(),
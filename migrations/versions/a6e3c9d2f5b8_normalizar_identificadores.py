@@ -0,0 +1,86 @@
+"""Normaliza DOI, ISSN y ORCID y agrega CHECK de formato (PostgreSQL)
+
+Revision ID: a6e3c9d2f5b8
+Revises: f7d2b5e8a1c4
+Create Date: 2026-02-02 10:07:44.291836
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6e3c9d2f5b8'
+down_revision = 'f7d2b5e8a1c4'
+branch_labels = None
+depends_on = None
+
+
+# Copia de la normalización del modelo al momento de esta revisión (la
+# migración no debe cambiar si el modelo cambia después)
+def _minusculas(valor):
+    return valor.strip().lower() or None
+
+
+def _mayusculas(valor):
+    return valor.strip().upper() or None
+
+
+# (tabla, columna, normalizador, columna única)
+IDENTIFICADORES = (
+    ('articulos', 'doi', _minusculas, True),
+    ('articulos', 'issn', _mayusculas, False),
+    ('autores', 'orcid', _mayusculas, True),
+)
+
+# (tabla, nombre, condición) de los CHECK; solo PostgreSQL
+CHECKS = (
+    ('articulos', 'ck_articulos_doi_formato', r"doi ~ '^10\.[0-9]{4,9}/.+'"),
+    ('articulos', 'ck_articulos_issn_formato', r"issn ~ '^[0-9]{4}-[0-9]{3}[0-9X]$'"),
+    ('autores', 'ck_autores_orcid_formato',
+     r"orcid ~ '^[0-9]{4}-[0-9]{4}-[0-9]{4}-[0-9]{3}[0-9X]$'"),
+)
+
+
+def upgrade():
+    bind = op.get_bind()
+    
+    # Valores ya guardados a su forma canónica (la misma que aplica el modelo).
+    # En columnas únicas se omiten los que chocarían con otro registro; esos
+    # duplicados deben resolverse a mano
+    for tabla, columna, normalizar, unica in IDENTIFICADORES:
+        t = sa.table(tabla, sa.column('id', sa.Integer), sa.column(columna, sa.String))
+        filas = bind.execute(
+            sa.select(t.c.id, t.c[columna]).where(t.c[columna].isnot(None))
+        ).all()
+        
+        ocupados = {valor for _, valor in filas}
+        cambios = []
+        for id_, valor in filas:
+            nuevo = normalizar(valor)
+            if nuevo == valor:
+                continue
+            if unica and nuevo is not None and nuevo in ocupados:
+                continue
+            ocupados.discard(valor)
+            ocupados.add(nuevo)
+            cambios.append({'_id': id_, '_valor': nuevo})
+        
+        if cambios:
+            bind.execute(
+                t.update().where(t.c.id == sa.bindparam('_id'))
+                .values({columna: sa.bindparam('_valor')}),
+                cambios
+            )
+    
+    # NOT VALID: se exige a partir de ahora sin fallar por datos antiguos
+    if bind.dialect.name == 'postgresql':
+        for tabla, nombre, condicion in CHECKS:
+            op.execute(f'ALTER TABLE {tabla} ADD CONSTRAINT {nombre} CHECK ({condicion}) NOT VALID')
+
+
+def downgrade():
+    # La normalización de datos no se revierte
+    if op.get_bind().dialect.name == 'postgresql':
+        for tabla, nombre, _ in CHECKS:
+            op.drop_constraint(nombre, tabla, type_='check')
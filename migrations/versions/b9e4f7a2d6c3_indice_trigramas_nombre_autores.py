@@ -0,0 +1,71 @@
+"""Indice de trigramas sobre autores.nombre_normalizado y relleno de la columna
+
+Revision ID: b9e4f7a2d6c3
+Revises: d5c1e8a3b7f4
+Create Date: 2026-01-28 10:22:57.118406
+
+"""
+import re
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b9e4f7a2d6c3'
+down_revision = 'd5c1e8a3b7f4'
+branch_labels = None
+depends_on = None
+
+
+autores = sa.table(
+    'autores',
+    sa.column('id', sa.Integer),
+    sa.column('nombre', sa.String),
+    sa.column('apellidos', sa.String),
+    sa.column('nombre_normalizado', sa.String),
+)
+
+
+def normalizar_texto(texto):
+    """
+    Copia de Autor.normalizar_texto al momento de esta revisión: sin
+    acentos, minúsculas, solo letras y espacios simples.
+    """
+    if not texto:
+        return ""
+    texto = unicodedata.normalize('NFKD', texto).encode('ASCII', 'ignore').decode().lower()
+    return ' '.join(re.sub(r'[^a-z\s]', ' ', texto).split())
+
+
+def upgrade():
+    # Autores creados sin nombre_normalizado (ahora lo calcula un evento del modelo)
+    bind = op.get_bind()
+    pendientes = bind.execute(
+        sa.select(autores.c.id, autores.c.nombre, autores.c.apellidos)
+        .where(autores.c.nombre_normalizado.is_(None))
+    ).all()
+    if pendientes:
+        bind.execute(
+            autores.update()
+            .where(autores.c.id == sa.bindparam('_id'))
+            .values(nombre_normalizado=sa.bindparam('_normalizado')),
+            [
+                {'_id': id_, '_normalizado': normalizar_texto(f"{nombre} {apellidos}")}
+                for id_, nombre, apellidos in pendientes
+            ]
+        )
+    
+    # Índice GIN de trigramas: solo PostgreSQL
+    if bind.dialect.name == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.create_index('ix_autores_nombre_normalizado_trgm', 'autores', ['nombre_normalizado'],
+                        unique=False, postgresql_using='gin',
+                        postgresql_ops={'nombre_normalizado': 'gin_trgm_ops'})
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_autores_nombre_normalizado_trgm', table_name='autores',
+                      postgresql_using='gin')
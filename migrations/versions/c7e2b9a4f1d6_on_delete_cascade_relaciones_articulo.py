@@ -0,0 +1,56 @@
+"""ON DELETE CASCADE en relaciones N:N de articulos
+
+Revision ID: c7e2b9a4f1d6
+Revises: a1f4c2d9e7b3
+Create Date: 2026-01-14 09:37:12.804116
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e2b9a4f1d6'
+down_revision = 'a1f4c2d9e7b3'
+branch_labels = None
+depends_on = None
+
+# Las FK de la migración inicial no tienen nombre; en SQLite se les asigna
+# uno con esta convención para poder reemplazarlas en modo batch.
+NAMING_CONVENTION = {
+    'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s',
+}
+TABLAS = ('articulo_autor', 'articulo_indexacion')
+
+
+def _nombre_fk(tabla):
+    """Obtiene el nombre real de la FK articulo_id -> articulos.id."""
+    inspector = sa.inspect(op.get_bind())
+    for fk in inspector.get_foreign_keys(tabla):
+        if fk['constrained_columns'] == ['articulo_id'] and fk['referred_table'] == 'articulos':
+            if fk.get('name'):
+                return fk['name']
+    return NAMING_CONVENTION['fk'] % {
+        'table_name': tabla,
+        'column_0_name': 'articulo_id',
+        'referred_table_name': 'articulos',
+    }
+
+
+def _reemplazar_fk(tabla, ondelete):
+    nombre = _nombre_fk(tabla)
+    with op.batch_alter_table(tabla, schema=None,
+                              naming_convention=NAMING_CONVENTION) as batch_op:
+        batch_op.drop_constraint(nombre, type_='foreignkey')
+        batch_op.create_foreign_key(nombre, 'articulos', ['articulo_id'], ['id'],
+                                    ondelete=ondelete)
+
+
+def upgrade():
+    for tabla in TABLAS:
+        _reemplazar_fk(tabla, 'CASCADE')
+
+
+def downgrade():
+    for tabla in TABLAS:
+        _reemplazar_fk(tabla, None)
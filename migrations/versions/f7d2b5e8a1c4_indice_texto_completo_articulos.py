@@ -0,0 +1,35 @@
+"""Indice GIN de texto completo sobre titulo y titulo_revista de articulos
+
+Revision ID: f7d2b5e8a1c4
+Revises: e1c6a9f3d8b5
+Create Date: 2026-01-30 12:18:03.664190
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7d2b5e8a1c4'
+down_revision = 'e1c6a9f3d8b5'
+branch_labels = None
+depends_on = None
+
+
+# Misma expresión que usa Articulo.buscar
+VECTOR_BUSQUEDA = (
+    "to_tsvector('spanish', coalesce(titulo, '') || ' ' || coalesce(titulo_revista, ''))"
+)
+
+
+def upgrade():
+    # Solo PostgreSQL: en otros motores Articulo.buscar sigue usando ILIKE
+    if op.get_bind().dialect.name == 'postgresql':
+        op.create_index('ix_articulos_busqueda_fts', 'articulos', [sa.text(VECTOR_BUSQUEDA)],
+                        unique=False, postgresql_using='gin')
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_articulos_busqueda_fts', table_name='articulos',
+                      postgresql_using='gin')
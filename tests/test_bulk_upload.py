@@ -102,6 +102,38 @@ def create_file_storage(filepath: Path, filename: str = None) -> FileStorage:
     )
 
 
+def create_text_pdf(texto: str) -> bytes:
+    """
+    Genera un PDF mínimo de una página con varias líneas de texto.
+    
+    Args:
+        texto: Texto de cada línea (se numeran para superar el mínimo extraíble)
+    
+    Returns:
+        Contenido del PDF
+    """
+    lineas = " ".join(f"({texto} {i}) Tj 0 -14 Td" for i in range(8))
+    contenido = f"BT /F1 12 Tf 72 720 Td {lineas} ET".encode()
+    objetos = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n%s\nendstream" % (len(contenido), contenido),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    pdf = b"%PDF-1.4\n"
+    posiciones = []
+    for i, objeto in enumerate(objetos, start=1):
+        posiciones.append(len(pdf))
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (i, objeto)
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objetos) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % posicion for posicion in posiciones)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objetos) + 1, xref)
+    return pdf
+
+
 class TestPDFBatchProcessor:
     """Tests para el procesador de PDFs en batch"""
     
@@ -184,6 +216,67 @@ class TestPDFBatchProcessor:
             assert results['errors'] == 1
             assert results['success'] == 0
     
+    def test_progress_callback_counts_errors(self, app, processor):
+        """Test: El progreso se reporta por cada archivo, también los fallidos"""
+        with app.app_context():
+            files = [
+                FileStorage(stream=BytesIO(b"Not a PDF"), filename=f"fake_{i}.txt",
+                            content_type="text/plain")
+                for i in range(4)
+            ]
+            progreso = []
+            
+            results = processor.process_files(
+                files, progress_callback=lambda hechos, total: progreso.append((hechos, total))
+            )
+            
+            assert results['errors'] == 4
+            assert progreso == [(1, 4), (2, 4), (3, 4), (4, 4)]
+            assert sorted(e['filename'] for e in results['error_details']) == \
+                [f"fake_{i}.txt" for i in range(4)]
+    
+    def test_progress_callback_batched(self, app, processor):
+        """Test: En lotes grandes el progreso se reporta cada 1% y al terminar"""
+        with app.app_context():
+            files = [
+                FileStorage(stream=BytesIO(b"Not a PDF"), filename=f"fake_{i}.txt",
+                            content_type="text/plain")
+                for i in range(250)
+            ]
+            progreso = []
+            processor.INTERVALO_PROGRESO = 3600
+            
+            processor.process_files(
+                files, progress_callback=lambda hechos, total: progreso.append(hechos)
+            )
+            
+            assert progreso == list(range(2, 251, 2))
+    
+    def test_thread_pool_extraction_batch(self, app, processor):
+        """Test: Varios PDFs se extraen en el pool de hilos y se crean en un lote"""
+        with app.app_context():
+            files = [
+                FileStorage(stream=BytesIO(create_text_pdf(f"Documento de prueba {i} del pool")),
+                            filename=f"pool_{i}.pdf", content_type='application/pdf')
+                for i in range(3)
+            ]
+            progreso = []
+            
+            # Junto con cada aviso se registra cuántos artículos hay ya en la BD
+            results = processor.process_files(
+                files,
+                progress_callback=lambda hechos, total: progreso.append((hechos, Articulo.query.count()))
+            )
+            
+            assert results['success'] == 3, results['error_details']
+            # El 100% se reporta cuando los artículos ya están creados
+            assert [hechos for hechos, _ in progreso] == [1, 2, 3]
+            assert progreso[-1] == (3, 3)
+            # El tiempo de BD del lote se reporta una vez, no en cada archivo
+            assert results['db_time'] >= 0
+            titulos = sorted(r['title'] for r in results['results'])
+            assert titulos == [f"Documento de prueba {i} del pool 0" for i in range(3)]
+    
     def test_max_files_limit(self, app, processor):
         """Test: Verificar límite de archivos"""
         # Esta prueba se hace en la vista, no en el procesador
@@ -332,6 +425,84 @@ class TestArticleCreation:
                 assert articulo.campos_faltantes is not None
                 # Puede contener texto como "Faltan: autores, DOI"
                 assert len(articulo.campos_faltantes) > 0
+    
+    def test_autor_repetido_se_vincula_una_vez(self, app, processor):
+        """Test: Un autor extraído dos veces se vincula una sola vez al artículo"""
+        with app.app_context():
+            metadata = {
+                'titulo': 'Artículo con autores repetidos',
+                'autores': [
+                    'Ana Ruiz',
+                    {'nombre': 'Luis', 'apellidos': 'Mora', 'orden': 2},
+                    {'nombre': 'Ana', 'apellidos': 'Ruiz', 'orden': 3},
+                ]
+            }
+            articulo = processor._create_article_from_metadata(
+                metadata, 'repetidos.pdf', '/tmp/repetidos.pdf'
+            )
+            
+            vinculos = [(aa.autor.nombre_completo, aa.orden) for aa in articulo.articulo_autores]
+            assert vinculos == [('Ana Ruiz', 1), ('Luis Mora', 2)]
+    
+    def test_lote_comparte_autores_y_rechaza_doi_repetido(self, app, processor):
+        """Test: Un lote crea cada autor una vez y rechaza un DOI repetido en el lote"""
+        from app.models.autor import Autor
+        
+        with app.app_context():
+            entradas = [
+                ({'titulo': 'Primero', 'doi': '10.1/LOTE', 'autores': ['Eva Lote']}, 'a.pdf', '/tmp/a.pdf'),
+                ({'titulo': 'Segundo', 'autores': ['Eva Lote', 'Raúl Lote']}, 'b.pdf', '/tmp/b.pdf'),
+                ({'titulo': 'Tercero', 'doi': '10.1/lote', 'autores': []}, 'c.pdf', '/tmp/c.pdf'),
+            ]
+            
+            creados = processor._create_articles_from_metadata(entradas)
+            
+            assert [c[1] for c in creados[:2]] == ['Primero', 'Segundo']
+            assert isinstance(creados[2], Exception) and 'DOI' in str(creados[2])
+            assert Autor.query.filter_by(nombre='Eva', apellidos='Lote').count() == 1
+            
+            segundo = Articulo.query.get(creados[1][0])
+            assert [aa.autor.nombre_completo for aa in segundo.articulo_autores] == \
+                ['Eva Lote', 'Raúl Lote']
+            assert Articulo.query.get(creados[0][0]).doi == '10.1/lote'
+
+
+
+class TestUploadSessions:
+    """Tests para las sesiones de upload"""
+    
+    def test_cleanup_old_sessions_stops_at_first_recent(self):
+        """Test: Solo se eliminan las sesiones más antiguas que el límite"""
+        from app.services.pdf_batch_processor import (
+            create_upload_session, get_upload_session, cleanup_old_sessions
+        )
+        
+        cleanup_old_sessions(max_age_hours=0)
+        sesiones = [create_upload_session(total_files=1) for _ in range(3)]
+        for sesion in sesiones[:2]:
+            sesion.start_time -= 25 * 3600
+        
+        assert cleanup_old_sessions(max_age_hours=24) == 2
+        assert get_upload_session(sesiones[0].session_id) is None
+        assert get_upload_session(sesiones[2].session_id) is sesiones[2]
+        
+        sesiones[2].start_time -= 3600
+        assert cleanup_old_sessions(max_age_hours=0) == 1
+    
+    def test_get_progress(self):
+        """Test: El progreso refleja éxitos, errores y el estado final"""
+        from app.services.pdf_batch_processor import UploadSession
+        
+        sesion = UploadSession('upload_test', total_files=2)
+        sesion.update_progress(1, success=True)
+        progreso = sesion.get_progress()
+        assert (progreso['processed'], progreso['progress_percent'], progreso['status']) == \
+            (1, 50.0, 'processing')
+        
+        sesion.update_progress(2, success=False)
+        progreso = sesion.get_progress()
+        assert (progreso['success'], progreso['errors'], progreso['status']) == (1, 1, 'completed')
+        assert progreso['estimated_remaining'] == 0
 
 
 if __name__ == '__main__':
@@ -3,8 +3,12 @@ Tests para el controlador de artículos.
 """
 import pytest
 from datetime import datetime
+from sqlalchemy import update
 from app.controllers import ArticleController
+from app.controllers.report_controller import ReportController
+from app.services.excel_service import ExcelService
 from app.models import Articulo, Autor, Revista, TipoProduccion, Estado, LGAC, Proposito
+from app.models import Indexacion, RevistaIndexacion, ArticuloIndexacion
 
 
 class TestArticleControllerCreate:
@@ -126,6 +130,137 @@ class TestArticleControllerCreate:
             
             assert articulo is None
             assert 'página final' in error.lower()
+    
+    def test_create_article_invalid_reference(self, app, db_session, catalogs):
+        """Test crear artículo con referencias a catálogos inexistentes."""
+        with app.app_context():
+            data = {
+                'titulo': 'Test Article',
+                'tipo_produccion_id': catalogs['tipo'].id,
+                'estado_id': catalogs['estado'].id,
+                'lgac_id': 9999,
+                'revista_id': 9999
+            }
+            
+            articulo, error = ArticleController.create(data)
+            
+            assert articulo is None
+            assert error == "LGAC inválido"
+    
+    def test_create_article_format_checked_before_references(self, app, db_session, catalogs):
+        """Test las validaciones de formato se evalúan antes que las referencias."""
+        with app.app_context():
+            data = {
+                'titulo': 'Test Article',
+                'tipo_produccion_id': catalogs['tipo'].id,
+                'estado_id': catalogs['estado'].id,
+                'lgac_id': 9999,
+                'doi': 'invalid-doi',
+                'proposito_id': 0
+            }
+            
+            articulo, error = ArticleController.create(data)
+            
+            assert articulo is None
+            assert 'DOI inválido' in error
+    
+    def test_create_article_normalizes_before_validating(self, app, db_session, catalogs):
+        """Test DOI e ISSN se normalizan antes de validar su formato."""
+        with app.app_context():
+            data = {
+                'titulo': 'Test Article',
+                'tipo_produccion_id': catalogs['tipo'].id,
+                'estado_id': catalogs['estado'].id,
+                'doi': ' 10.1234/XYZ',
+                'issn': '1234-567x'
+            }
+            
+            articulo, error = ArticleController.create(data)
+            
+            assert error is None
+            assert (articulo.doi, articulo.issn) == ('10.1234/xyz', '1234-567X')
+    
+    def test_create_article_reference_deleted_after_cache(self, app, db_session, catalogs):
+        """Test la caché de catálogos se invalida al eliminar un registro."""
+        with app.app_context():
+            lgac = LGAC(nombre='LGAC temporal', activo=True)
+            db_session.add(lgac)
+            db_session.commit()
+            lgac_id = lgac.id
+            
+            data = {
+                'titulo': 'Test Article',
+                'tipo_produccion_id': catalogs['tipo'].id,
+                'estado_id': catalogs['estado'].id,
+                'lgac_id': lgac_id
+            }
+            articulo, error = ArticleController.create(dict(data))
+            assert error is None
+            
+            db_session.delete(articulo)
+            db_session.delete(lgac)
+            db_session.commit()
+            
+            articulo, error = ArticleController.create(dict(data, titulo='Otro'))
+            
+            assert articulo is None
+            assert error == "LGAC inválido"
+
+
+class TestArticleControllerCreateMany:
+    """Tests para la creación masiva de artículos."""
+    
+    def test_create_many_inserts_valid_and_reports_invalid(self, app, db_session, catalogs):
+        """Test crear varios artículos: los inválidos se reportan, los válidos se insertan."""
+        with app.app_context():
+            base = {
+                'tipo_produccion_id': catalogs['tipo'].id,
+                'estado_id': catalogs['estado'].id
+            }
+            items = [
+                {**base, 'titulo': 'Lote 1', 'revista_id': 0},
+                {**base, 'titulo': 'Lote 2', 'doi': 'invalido'},
+                {**base, 'titulo': 'Lote 3', 'lgac_id': 999},
+                {**base, 'titulo': 'Lote 4', 'anio_publicacion': 2024}
+            ]
+            
+            articulos, errores = ArticleController.create_many(items)
+            
+            assert [a.titulo for a in articulos] == ['Lote 1', 'Lote 4']
+            assert all(a.id is not None for a in articulos)
+            assert articulos[0].revista_id is None
+            assert len(errores) == 2
+            assert errores[0].startswith('Artículo 2:')
+            assert errores[1].startswith('Artículo 3:')
+            assert Articulo.query.count() == 2
+    
+    def test_create_many_normalizes_identifiers(self, app, db_session, catalogs):
+        """Test la inserción masiva guarda DOI e ISSN normalizados."""
+        with app.app_context():
+            base = {
+                'tipo_produccion_id': catalogs['tipo'].id,
+                'estado_id': catalogs['estado'].id
+            }
+            
+            articulos, errores = ArticleController.create_many([
+                {**base, 'titulo': 'Lote DOI', 'doi': ' 10.1234/ABC ', 'issn': '1234-567x'}
+            ])
+            
+            assert errores == []
+            assert (articulos[0].doi, articulos[0].issn) == ('10.1234/abc', '1234-567X')
+            
+            # La variante en minúsculas es el mismo DOI: el índice único la rechaza
+            articulo, error = ArticleController.create({**base, 'titulo': 'Otro', 'doi': '10.1234/abc'})
+            assert articulo is None
+            assert 'duplicado' in error
+    
+    def test_create_many_empty(self, app, db_session, catalogs):
+        """Test crear lote vacío."""
+        with app.app_context():
+            articulos, errores = ArticleController.create_many([])
+            
+            assert articulos == []
+            assert errores == []
 
 
 class TestArticleControllerGetAll:
@@ -179,6 +314,69 @@ class TestArticleControllerGetAll:
             assert pagination.total == 25
             assert pagination.pages == 3
     
+    def test_get_all_without_count(self, app, db_session, catalogs):
+        """Test paginación sin SELECT count(*)."""
+        with app.app_context():
+            for i in range(25):
+                data = {
+                    'titulo': f'Article {i}',
+                    'tipo_produccion_id': catalogs['tipo'].id,
+                    'estado_id': catalogs['estado'].id
+                }
+                ArticleController.create(data)
+            
+            pagination, error = ArticleController.get_all(page=1, per_page=10, count=False)
+            
+            assert error is None
+            assert pagination.total is None
+            assert len(pagination.items) == 10
+            assert pagination.has_next is True
+            
+            pagination, _ = ArticleController.get_all(page=3, per_page=10, count=False)
+            
+            assert len(pagination.items) == 5
+            assert pagination.has_next is False
+    
+    def test_get_all_approximate_total_fallback(self, app, db_session, catalogs):
+        """Test total aproximado usa conteo exacto cuando el motor no estima (SQLite)."""
+        with app.app_context():
+            for i in range(3):
+                data = {
+                    'titulo': f'Article {i}',
+                    'tipo_produccion_id': catalogs['tipo'].id,
+                    'estado_id': catalogs['estado'].id
+                }
+                ArticleController.create(data)
+            
+            assert ArticleController._fast_count() is None
+            
+            pagination, error = ArticleController.get_all(approximate_total=True)
+            
+            assert error is None
+            assert pagination.total == 3
+    
+    def test_get_all_eager_loads_list_relations(self, app, db_session, catalogs):
+        """Test el listado carga tipo y estado y no permite cargas perezosas."""
+        from sqlalchemy.exc import InvalidRequestError
+        with app.app_context():
+            app.config['ARTICLES_RAISELOAD'] = True
+            data = {
+                'titulo': 'Article',
+                'tipo_produccion_id': catalogs['tipo'].id,
+                'estado_id': catalogs['estado'].id,
+                'proposito_id': catalogs['proposito'].id
+            }
+            ArticleController.create(data)
+            db_session.expunge_all()
+            
+            pagination, error = ArticleController.get_all()
+            articulo = pagination.items[0]
+            
+            assert articulo.tipo.nombre == catalogs['tipo'].nombre
+            assert articulo.estado.nombre == catalogs['estado'].nombre
+            with pytest.raises(InvalidRequestError):
+                articulo.proposito
+    
     def test_get_all_filter_by_tipo(self, app, db_session, catalogs):
         """Test filtrar artículos por tipo."""
         with app.app_context():
@@ -213,6 +411,39 @@ class TestArticleControllerGetAll:
             
             assert pagination is None
             assert 'entre 1 y 100' in error
+    
+    def test_get_all_keyset_pagination(self, app, db_session, catalogs):
+        """Test paginación por cursor recorre todos los artículos sin repetir."""
+        with app.app_context():
+            for i in range(25):
+                data = {
+                    'titulo': f'Article {i}',
+                    'tipo_produccion_id': catalogs['tipo'].id,
+                    'estado_id': catalogs['estado'].id
+                }
+                ArticleController.create(data)
+            
+            vistos = []
+            cursor = None
+            while True:
+                pagina, error = ArticleController.get_all_keyset(cursor=cursor, per_page=10)
+                assert error is None
+                vistos.extend(a.id for a in pagina['items'])
+                if not pagina['has_next']:
+                    assert pagina['next_cursor'] is None
+                    break
+                cursor = pagina['next_cursor']
+            
+            assert len(vistos) == 25
+            assert len(set(vistos)) == 25
+    
+    def test_get_all_keyset_invalid_cursor(self, app, db_session, catalogs):
+        """Test cursor inválido."""
+        with app.app_context():
+            pagina, error = ArticleController.get_all_keyset(cursor='no-es-un-cursor')
+            
+            assert pagina is None
+            assert 'cursor' in error.lower()
 
 
 class TestArticleControllerGetById:
@@ -272,6 +503,29 @@ class TestArticleControllerUpdate:
             assert articulo.titulo == 'Updated Title'
             assert articulo.anio_publicacion == 2024
     
+    def test_update_article_ignores_non_columns(self, app, db_session, catalogs):
+        """Test actualizar ignora llaves que no son columnas del modelo."""
+        with app.app_context():
+            data = {
+                'titulo': 'Original Title',
+                'tipo_produccion_id': catalogs['tipo'].id,
+                'estado_id': catalogs['estado'].id
+            }
+            articulo_creado, _ = ArticleController.create(data)
+            id_original = articulo_creado.id
+            
+            articulo, error = ArticleController.update(id_original, {
+                'titulo': 'Updated Title',
+                'id': 9999,
+                'validar': None,
+                'campo_inexistente': 'x'
+            })
+            
+            assert error is None
+            assert articulo.id == id_original
+            assert callable(articulo.validar)
+            assert articulo.titulo == 'Updated Title'
+    
     def test_update_article_not_found(self, app, db_session, catalogs):
         """Test actualizar artículo inexistente."""
         with app.app_context():
@@ -347,6 +601,28 @@ class TestArticleControllerDelete:
             articulo = Articulo.query.get(article_id)
             assert articulo is None
     
+    def test_delete_article_hard_cascades_authors(self, app, db_session, catalogs):
+        """Test la eliminación física borra las relaciones con autores en cascada."""
+        with app.app_context():
+            from app.models.relations import ArticuloAutor
+            data = {
+                'titulo': 'Test Article',
+                'tipo_produccion_id': catalogs['tipo'].id,
+                'estado_id': catalogs['estado'].id
+            }
+            articulo, _ = ArticleController.create(data)
+            autor = Autor(nombre='John', apellidos='Doe')
+            db_session.add(autor)
+            db_session.commit()
+            ArticleController.add_author(articulo.id, autor.id)
+            articulo_id = articulo.id
+            
+            success, error = ArticleController.delete(articulo_id, soft=False)
+            
+            assert success is True
+            assert ArticuloAutor.query.filter_by(articulo_id=articulo_id).count() == 0
+            assert db_session.get(Autor, autor.id) is not None
+    
     def test_delete_article_not_found(self, app, db_session, catalogs):
         """Test eliminar artículo inexistente."""
         with app.app_context():
@@ -433,6 +709,24 @@ class TestArticleControllerAuthors:
             assert success is False
             assert 'ya está asociado' in error
     
+    def test_add_author_not_found(self, app, db_session, catalogs):
+        """Test agregar autor inexistente o a artículo inexistente."""
+        with app.app_context():
+            data = {
+                'titulo': 'Test Article',
+                'tipo_produccion_id': catalogs['tipo'].id,
+                'estado_id': catalogs['estado'].id
+            }
+            articulo, _ = ArticleController.create(data)
+            
+            success, error = ArticleController.add_author(articulo.id, 9999)
+            assert success is False
+            assert 'autor con ID 9999' in error
+            
+            success, error = ArticleController.add_author(9999, 1)
+            assert success is False
+            assert 'artículo con ID 9999' in error
+    
     def test_remove_author_success(self, app, db_session, catalogs):
         """Test remover autor de artículo."""
         with app.app_context():
@@ -496,3 +790,263 @@ class TestArticleControllerStatistics:
             assert stats['para_curriculum'] == 5
             assert len(stats['por_tipo']) > 0
             assert len(stats['por_estado']) > 0
+            assert stats['publicados'] == 5
+            assert stats['por_anio'] == {2024: 5}
+    
+    def test_get_statistics_cache_invalidation(self, app, db_session, catalogs):
+        """Test las estadísticas en caché se invalidan al modificar artículos."""
+        with app.app_context():
+            creados = []
+            for i in range(3):
+                data = {
+                    'titulo': f'Article {i}',
+                    'tipo_produccion_id': catalogs['tipo'].id,
+                    'estado_id': catalogs['estado'].id
+                }
+                articulo, _ = ArticleController.create(data)
+                creados.append(articulo.id)
+            
+            stats, _ = ArticleController.get_statistics()
+            assert stats['total'] == 3
+            
+            ArticleController.delete(creados[0], soft=True)
+            stats, _ = ArticleController.get_statistics()
+            assert stats['total'] == 2
+            
+            # UPDATE masivo sin eventos de mapper
+            db_session.execute(update(Articulo).values(activo=False))
+            db_session.commit()
+            stats, _ = ArticleController.get_statistics()
+            assert stats['total'] == 0
+    
+    def test_get_statistics_publicados_after_rename(self, app, db_session, catalogs):
+        """Test el id cacheado de 'Publicado' se invalida al renombrar el estado."""
+        with app.app_context():
+            data = {
+                'titulo': 'Article',
+                'tipo_produccion_id': catalogs['tipo'].id,
+                'estado_id': catalogs['estado'].id
+            }
+            ArticleController.create(data)
+            
+            stats, _ = ArticleController.get_statistics()
+            assert stats['publicados'] == 1
+            
+            estado = db_session.get(Estado, catalogs['estado'].id)
+            estado.nombre = 'Aceptado'
+            db_session.commit()
+            stats, _ = ArticleController.get_statistics()
+            assert stats['publicados'] == 0
+
+
+
+class TestReportController:
+    """Tests para la exportación de reportes."""
+    
+    def test_export_excel_streams_filtered_articles(self, app, db_session, catalogs):
+        """Test exportar a Excel recorriendo la query por lotes."""
+        from openpyxl import load_workbook
+        
+        with app.app_context():
+            revista = Revista(nombre='Revista de prueba', pais_id=catalogs['pais'].id)
+            autor = Autor(nombre='Ana', apellidos='López')
+            scopus = Indexacion(nombre='Índice A')
+            wos = Indexacion(nombre='Índice B')
+            db_session.add_all([revista, autor, scopus, wos])
+            db_session.commit()
+            db_session.add(RevistaIndexacion(revista_id=revista.id, indexacion_id=wos.id))
+            db_session.commit()
+            
+            creados = []
+            for i in range(3):
+                articulo, _ = ArticleController.create({
+                    'titulo': f'Article {i}',
+                    'tipo_produccion_id': catalogs['tipo'].id,
+                    'estado_id': catalogs['estado'].id,
+                    'lgac_id': catalogs['lgac'].id,
+                    'revista_id': revista.id,
+                    'anio_publicacion': 2020 + i
+                })
+                creados.append(articulo.id)
+            ArticleController.add_author(creados[2], autor.id)
+            db_session.add_all([
+                ArticuloIndexacion(articulo_id=creados[2], indexacion_id=scopus.id),
+                ArticuloIndexacion(articulo_id=creados[2], indexacion_id=wos.id)
+            ])
+            db_session.commit()
+            
+            # Lotes de 2: autores e indexaciones se consultan por partición
+            controller = ReportController()
+            controller.EXPORT_BATCH_SIZE = 2
+            excel_file, filename = controller.export_excel({'anio_inicio': 2021})
+            
+            ws = load_workbook(excel_file)['Artículos Académicos']
+            titulos = [ws[f'B{fila}'].value for fila in range(2, ws.max_row + 1)]
+            
+            assert titulos == ['Article 2', 'Article 1']
+            assert ws['C2'].value == 'López, Ana'
+            assert ws['C3'].value is None
+            assert ws['K2'].value == catalogs['lgac'].nombre
+            assert ws['M2'].value == 'Índice A, Índice B'
+            assert ws['M3'].value == 'Índice B'
+            assert ws['N2'].value == catalogs['pais'].nombre
+            
+            # Formato aplicado al escribir (libro de solo escritura)
+            assert ws.freeze_panes == 'A2'
+            assert ws['A1'].font.b
+            assert ws['B2'].fill.fgColor.rgb == ExcelService.COLOR_ALT_ROW
+            assert ws['B3'].fill.fill_type is None
+            assert ws['A2'].alignment.horizontal == 'center'
+            assert ws['B2'].alignment.wrap_text
+            assert filename.startswith('articulos_desde_2021_')
+            assert filename.endswith('.xlsx')
+    
+    def test_generate_rows_con_xlsxwriter(self, app):
+        """Test exportación grande con xlsxwriter: mismos valores y formato que openpyxl."""
+        pytest.importorskip('xlsxwriter')
+        from openpyxl import load_workbook
+        
+        filas = [
+            (i, f'Título {i}', 'López, Ana', 2020 + i, '', '', '', '', 'Artículo', 'Publicado',
+             '', '', '', '', 'https://example.com', 'Sí', 'No', '=no es fórmula')
+            for i in range(3)
+        ]
+        
+        with app.app_context():
+            service = ExcelService()
+            esperado = load_workbook(service.generate_rows(filas)[0])['Artículos Académicos']
+            
+            service.XLSXWRITER_MIN_FILAS = 3
+            assert service.usar_xlsxwriter(3)
+            excel_file, total = service.generate_rows(filas, total_estimado=3)
+            
+            assert total == 3
+            libro = load_workbook(excel_file)
+            ws = libro['Artículos Académicos']
+            assert 'Información del Reporte' in libro.sheetnames
+            assert [[c.value or None for c in fila] for fila in ws.iter_rows()] == \
+                [[c.value or None for c in fila] for fila in esperado.iter_rows()]
+            assert ws['R2'].value == '=no es fórmula'
+            assert ws.freeze_panes == 'A2'
+            assert ws['A1'].font.b
+            assert ws['B2'].fill.fgColor.rgb == ExcelService.COLOR_ALT_ROW
+            assert ws['B3'].fill.fill_type is None
+            assert ws['A2'].alignment.horizontal == 'center'
+            assert ws['B2'].alignment.wrap_text
+    
+    def test_generate_stream_consulta_relaciones_por_lote(self, app, db_session, catalogs):
+        """Test generar Excel desde objetos Articulo sin consultas por artículo."""
+        from openpyxl import load_workbook
+        from sqlalchemy import event
+        from app import db
+        
+        with app.app_context():
+            revista = Revista(nombre='Revista de prueba', pais_id=catalogs['pais'].id)
+            autores = [Autor(nombre='Ana', apellidos='López'), Autor(nombre='Luis', apellidos='Mora')]
+            indexacion = Indexacion(nombre='Índice A')
+            db_session.add_all([revista, indexacion, *autores])
+            db_session.commit()
+            db_session.add(RevistaIndexacion(revista_id=revista.id, indexacion_id=indexacion.id))
+            
+            creados = []
+            for i in range(3):
+                articulo, _ = ArticleController.create({
+                    'titulo': f'Article {i}',
+                    'tipo_produccion_id': catalogs['tipo'].id,
+                    'estado_id': catalogs['estado'].id,
+                    'lgac_id': catalogs['lgac'].id,
+                    'revista_id': revista.id if i else None
+                })
+                creados.append(articulo.id)
+            ArticleController.add_author(creados[2], autores[1].id, orden=2)
+            ArticleController.add_author(creados[2], autores[0].id, orden=1)
+            db_session.expunge_all()
+            
+            service = ExcelService()
+            service.LOTE_RELACIONES = 2
+            query = ExcelService.prepare_query(Articulo.query.order_by(Articulo.id))
+            
+            sentencias = []
+            contar = lambda *args: sentencias.append(args[2])
+            event.listen(db.engine, 'before_cursor_execute', contar)
+            try:
+                excel_file, total = service.generate_stream(query)
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', contar)
+            
+            # Artículos + (autores, indexaciones propias) por cada uno de los 2
+            # lotes + indexaciones de la revista, consultadas una sola vez
+            assert total == 3
+            assert len(sentencias) == 6
+            
+            ws = load_workbook(excel_file)['Artículos Académicos']
+            assert ws['C4'].value == 'López, Ana; Mora, Luis'
+            assert ws['C2'].value is None
+            assert ws['K4'].value == catalogs['lgac'].nombre
+            assert ws['M2'].value is None
+            assert ws['M3'].value == 'Índice A'
+            assert ws['M4'].value == 'Índice A'
+            assert ws['N3'].value == catalogs['pais'].nombre
+    
+    def test_export_statistics_aggregates(self, app, db_session, catalogs):
+        """Test estadísticas de exportación calculadas con agregados SQL."""
+        with app.app_context():
+            autor = Autor(nombre='Ana', apellidos='López')
+            db_session.add(autor)
+            db_session.commit()
+            
+            creados = []
+            for i in range(3):
+                articulo, _ = ArticleController.create({
+                    'titulo': f'Article {i}',
+                    'tipo_produccion_id': catalogs['tipo'].id,
+                    'estado_id': catalogs['estado'].id,
+                    'lgac_id': catalogs['lgac'].id if i else None,
+                    'anio_publicacion': 2023 if i else None,
+                    'para_curriculum': i == 2
+                })
+                creados.append(articulo.id)
+            ArticleController.add_author(creados[1], autor.id)
+            
+            controller = ReportController()
+            stats = controller.get_export_statistics()
+            
+            assert stats['total'] == 3
+            assert stats['para_curriculum'] == 1
+            assert stats['completos'] + stats['incompletos'] == 3
+            assert stats['por_anio'] == {2023: 2}
+            assert stats['por_tipo'] == {catalogs['tipo'].nombre: 3}
+            assert stats['por_estado'] == {catalogs['estado'].nombre: 3}
+            
+            assert controller.get_export_statistics({'lgac_id': catalogs['lgac'].id})['total'] == 2
+            assert controller.get_export_statistics({'autor_id': autor.id})['total'] == 1
+    
+    def test_generate_filename_uses_catalog_names(self, app, db_session, catalogs):
+        """Test el nombre de archivo incluye los nombres de tipo y estado filtrados."""
+        with app.app_context():
+            controller = ReportController()
+            filename = controller._generate_filename({
+                'tipo_produccion_id': catalogs['tipo'].id,
+                'estado_id': catalogs['estado'].id
+            })
+            
+            assert filename.startswith('articulos_artículo_científico_publicado_')
+            
+            estado = db_session.get(Estado, catalogs['estado'].id)
+            estado.nombre = 'En prensa'
+            db_session.commit()
+            
+            filename = controller._generate_filename({'estado_id': estado.id})
+            assert filename.startswith('articulos_en_prensa_')
+            
+            estado.nombre = 'Aceptado/En revisión'
+            db_session.commit()
+            
+            filename = controller._generate_filename({'estado_id': estado.id})
+            assert filename.startswith('articulos_aceptado_en_revisión_')
+            
+            estado.nombre = 'Aceptado: 2024? <"final"|*>'
+            db_session.commit()
+            
+            filename = controller._generate_filename({'estado_id': estado.id})
+            assert filename.startswith('articulos_aceptado__2024_final_')
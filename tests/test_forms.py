@@ -4,7 +4,9 @@ Tests para formularios de artículos.
 import pytest
 from datetime import datetime, timedelta
 from app.forms import ArticleForm, ArticleSearchForm, ArticleAuthorForm
-from app.forms.utils import populate_form_choices, validate_articulo_data
+from app.forms.utils import (
+    populate_form_choices, populate_lgac_choices, populate_autor_choices, validate_articulo_data
+)
 from app.models.catalogs import TipoProduccion, Estado, LGAC, Proposito
 from app.models.revista import Revista
 from app.models.autor import Autor
@@ -105,6 +107,18 @@ class TestArticleForm:
             with pytest.raises(ValidationError):
                 form.validate_anio_publicacion(form.anio_publicacion)
     
+    def test_validate_usa_un_solo_instante(self, app, db_session, catalogs):
+        """Test que validate() fija la fecha de referencia solo mientras valida."""
+        with app.test_request_context(method='POST', data={
+            'anio_publicacion': str(datetime.now().year + 5),
+            'fecha_publicacion': (datetime.now() + timedelta(days=30)).strftime('%Y-%m-%d')
+        }):
+            form = populate_form_choices(ArticleForm())
+            assert not form.validate()
+            assert 'anio_publicacion' in form.errors
+            assert 'fecha_publicacion' in form.errors
+            assert form._ahora is None
+    
     def test_paginas_validation_valid(self, app):
         """Test validación de páginas con valores válidos."""
         with app.app_context():
@@ -165,6 +179,29 @@ class TestArticleForm:
             assert len(form.estado_id.choices) > 1
             assert len(form.proposito_id.choices) > 1
             assert len(form.lgac_id.choices) > 1
+    
+    def test_populate_choices_cached_until_catalog_changes(self, app, db_session, catalogs):
+        """Test que las opciones se cachean y se invalidan al escribir en el catálogo."""
+        with app.app_context():
+            primeras = populate_lgac_choices()
+            assert populate_lgac_choices() is primeras
+            
+            db_session.add(LGAC(nombre='Nueva LGAC', activo=True))
+            db_session.commit()
+            
+            nombres = [nombre for _, nombre in populate_lgac_choices()]
+            assert 'Nueva LGAC' in nombres
+    
+    def test_populate_autor_choices_plain_tuples(self, app, db_session):
+        """Test que las opciones son tuplas (id, nombre completo) tras la opción vacía."""
+        with app.app_context():
+            autor = Autor(nombre='Ana', apellidos='López')
+            db_session.add(autor)
+            db_session.commit()
+            
+            opciones = populate_autor_choices()
+            assert opciones == ((0, '-- Seleccione --'), (autor.id, 'Ana López'))
+            assert all(type(opcion) is tuple for opcion in opciones)
 
 
 class TestArticleSearchForm:
@@ -244,6 +281,21 @@ class TestValidateArticuloData:
                 is_valid, errors = validate_articulo_data(form_data)
                 assert not is_valid
                 assert 'nombre_congreso' in errors
+    
+    def test_tipo_renombrado_a_conference(self, app, db_session, catalogs):
+        """Test que el nombre cacheado del tipo se actualiza al renombrarlo."""
+        with app.app_context():
+            tipo = db_session.get(TipoProduccion, catalogs['tipo'].id)
+            form_data = {'tipo_produccion_id': tipo.id, 'nombre_congreso': None}
+            
+            assert validate_articulo_data(form_data)[0]
+            
+            tipo.nombre = 'Conference proceedings'
+            db_session.commit()
+            
+            is_valid, errors = validate_articulo_data(form_data)
+            assert not is_valid
+            assert 'nombre_congreso' in errors
 
 
 class TestFormIntegration:
@@ -0,0 +1,16 @@
+"""
+Tests de las migraciones.
+"""
+from flask_migrate import check, upgrade
+
+from app import create_app
+
+
+def test_migraciones_sin_cambios_pendientes(tmp_path):
+    """Test: el modelo coincide con la base migrada (flask db check) en SQLite."""
+    app = create_app('testing')
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'migrada.db'}"
+    
+    with app.app_context():
+        upgrade()
+        check()
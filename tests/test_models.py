@@ -2,6 +2,7 @@
 Tests básicos para modelos y relaciones.
 Ejecutar desde la raíz del proyecto: python -m pytest tests/test_models.py
 """
+import json
 import pytest
 from datetime import datetime, date
 from app import create_app, db
@@ -144,6 +145,15 @@ def test_articulo_validaciones(init_database):
     articulo.issn = '1234-5678'
     assert articulo.validar_issn()
     
+    # DOI e ISSN se normalizan al asignarse
+    articulo.doi = ' 10.1234/ABC.Def '
+    articulo.issn = '1234-567x'
+    assert articulo.doi == '10.1234/abc.def'
+    assert articulo.issn == '1234-567X'
+    assert articulo.validar_issn()
+    articulo.doi = ''
+    assert articulo.doi is None
+    
     # Año válido
     assert articulo.validar_anio()
     
@@ -158,6 +168,35 @@ def test_articulo_validaciones(init_database):
     assert not articulo.validar_paginas()
 
 
+def test_articulo_validaciones_estaticas():
+    """Test: Validadores estáticos sin instanciar Articulo."""
+    assert Articulo.es_doi_valido('10.1234/test.2024.001')
+    assert not Articulo.es_doi_valido('invalid-doi')
+    assert Articulo.es_doi_valido(None)
+    
+    assert Articulo.es_issn_valido('1234-567X')
+    assert not Articulo.es_issn_valido('12345678')
+    
+    assert Articulo.es_anio_valido(2024)
+    assert not Articulo.es_anio_valido(1800)
+    
+    assert Articulo.son_paginas_validas(10, 20)
+    assert not Articulo.son_paginas_validas(20, 10)
+    
+    assert Articulo.es_quartil_valido('q2')
+    assert not Articulo.es_quartil_valido('Q5')
+
+
+def test_articulo_validaciones_por_lote():
+    """Test: Validación por lote con el mismo criterio que la individual."""
+    dois = ['10.1234/test.2024.001', 'invalid-doi', None, '10.1234/ABC-def', '10.1234/a b']
+    assert Articulo.son_dois_validos(dois) == [Articulo.es_doi_valido(d) for d in dois]
+    assert Articulo.son_dois_validos(dois) == [True, False, True, True, False]
+    
+    issns = ['1234-567X', '12345678', '', '1234-5678']
+    assert Articulo.son_issns_validos(issns) == [True, False, True, True]
+
+
 def test_articulo_to_dict(init_database):
     """Test: Método to_dict del artículo."""
     tipo = TipoProduccion.query.first()
@@ -168,18 +207,27 @@ def test_articulo_to_dict(init_database):
         tipo_produccion_id=tipo.id,
         estado_id=estado.id,
         anio_publicacion=2024,
-        doi='10.1234/test'
+        doi='10.1234/test',
+        fecha_publicacion=date(2024, 3, 15),
+        pagina_inicio=10,
+        pagina_fin=20
     )
     
     db.session.add(articulo)
     db.session.commit()
     
+    # Tras el commit las columnas están expiradas; to_dict las recarga
     data = articulo.to_dict()
     
     assert data['titulo'] == 'Test Dict'
     assert data['anio_publicacion'] == 2024
     assert data['doi'] == '10.1234/test'
     assert data['tipo_produccion'] == 'Artículo científico'
+    assert data['fecha_publicacion'] == '2024-03-15'
+    assert data['fecha_aceptacion'] is None
+    assert data['paginas'] == '10-20'
+    assert 'descripcion' not in data and 'created_at' not in data
+    assert {'id', 'estado', 'revista', 'lgac', 'proposito', 'activo'} <= data.keys()
 
 
 # === Tests de Modelo Autor ===
@@ -198,6 +246,12 @@ def test_crear_autor(init_database):
     
     assert autor.id is not None
     assert autor.nombre_completo == 'Francisco Pérez García'
+    
+    # nombre_normalizado se calcula al guardar
+    assert autor.nombre_normalizado == 'francisco perez garcia'
+    autor.apellidos = 'Pérez-Gómez'
+    db.session.commit()
+    assert autor.nombre_normalizado == 'francisco perez gomez'
 
 
 def test_autor_normalizar_nombre(init_database):
@@ -210,6 +264,197 @@ def test_autor_normalizar_nombre(init_database):
     autor.actualizar_nombre_normalizado()
     
     assert autor.nombre_normalizado == 'jose maria garcia lopez'
+    
+    # Ligaduras, símbolos, dígitos, espacios no ASCII y caracteres fuera
+    # de la tabla precalculada
+    assert Autor.normalizar_texto('Comparán-Pantoja, Francisco') == 'comparan pantoja francisco'
+    assert Autor.normalizar_texto('\ufb01lho\u00a0Ñandú 3º\t\n') == 'filho nandu o'
+    assert Autor.normalizar_texto('Ἀθῆναι 東京 Ⅷ') == 'viii'
+    assert Autor.normalizar_texto('  ') == ''
+    assert Autor.normalizar_texto(None) == ''
+
+
+def test_autor_buscar_fuzzy(init_database):
+    """Test: Búsqueda fuzzy de autores por nombre."""
+    autores = [
+        Autor(nombre='Francisco', apellidos='Comparán Pantoja'),
+        Autor(nombre='María', apellidos='García López'),
+        Autor(nombre='Francisco', apellidos='Comparan Pantoja', activo=False),
+    ]
+    db.session.add_all(autores)
+    db.session.commit()
+    
+    resultados = Autor.buscar_fuzzy('Comparán-Pantoja, Francisco', umbral=85)
+    
+    assert [autor.id for autor, _ in resultados] == [autores[0].id]
+    assert resultados[0][1] == 100
+    assert Autor.buscar_fuzzy('Pedro Ramírez') == []
+    
+    # Solo el más similar
+    db.session.add(Autor(nombre='Francisca', apellidos='Comparán Pantoja'))
+    db.session.commit()
+    todos = Autor.buscar_fuzzy('Francisco Comparan', umbral=70)
+    assert len(todos) == 2 and todos[0][0] == autores[0]
+    assert Autor.buscar_fuzzy('Francisco Comparan', umbral=70, limite=1) == todos[:1]
+
+
+def test_parsear_nombre_autor():
+    """Test: Formatos de nombre de autor soportados."""
+    from app.services.autor_matching import AutorMatchingService
+    parsear = AutorMatchingService.parsear_nombre_autor
+    
+    assert parsear('Francisco Comparan  Pantoja') == ('Francisco', 'Comparan Pantoja')
+    assert parsear(' Comparan-Pantoja , Francisco ') == ('Francisco', 'Comparan Pantoja')
+    assert parsear('F. Comparan Pantoja') == ('F.', 'Comparan Pantoja')
+    assert parsear('Francisco') == ('Francisco', '')
+    assert parsear('  ') == ('', '')
+    assert parsear(None) == ('', '')
+
+
+def test_encontrar_o_crear_autor_con_cache(init_database):
+    """Test: La caché de carga masiva resuelve autores existentes y recién creados."""
+    from app.services.autor_matching import AutorMatchingService
+    
+    existente = Autor(nombre='Francisco', apellidos='Comparán Pantoja',
+                      orcid='0000-0002-1825-0097')
+    db.session.add(existente)
+    db.session.commit()
+    
+    cache = AutorMatchingService.prime_cache()
+    assert AutorMatchingService.encontrar_o_crear_autor(
+        'Comparán Pantoja, Francisco', cache=cache) == (existente, False)
+    assert AutorMatchingService.encontrar_o_crear_autor(
+        'Otro Nombre', orcid=' 0000-0002-1825-0097 ', cache=cache) == (existente, False)
+    
+    nuevo, creado = AutorMatchingService.encontrar_o_crear_autor('Ana Nueva Ruiz', cache=cache)
+    assert creado
+    assert AutorMatchingService.encontrar_o_crear_autor('Nueva Ruiz, Ana', cache=cache) == (nuevo, False)
+    
+    # La caché solo existe para quien la pasa: sin ella se consulta la base
+    assert AutorMatchingService.resolve_batch(['Nueva Ruiz, Ana'], crear_si_no_existe=False) == {
+        'Nueva Ruiz, Ana': nuevo
+    }
+    
+    db.session.commit()
+    assert Autor.query.filter_by(apellidos='Nueva Ruiz').count() == 1
+
+
+def test_fusionar_autores(init_database):
+    """Test: Fusión de autores sin duplicar la relación en artículos compartidos."""
+    from app.services.autor_matching import AutorMatchingService
+    
+    tipo = TipoProduccion.query.first()
+    estado = Estado.query.first()
+    principal = Autor(nombre='Francisco', apellidos='Comparán')
+    duplicado = Autor(nombre='F.', apellidos='Comparán', registro='R-7')
+    articulos = [
+        Articulo(titulo=f'Artículo {i}', tipo_produccion_id=tipo.id, estado_id=estado.id)
+        for i in range(3)
+    ]
+    db.session.add_all([principal, duplicado, *articulos])
+    db.session.commit()
+    articulos[0].agregar_autores([principal, duplicado])
+    articulos[1].agregar_autores([duplicado])
+    db.session.commit()
+    
+    exito, mensaje = AutorMatchingService.fusionar_autores(principal.id, duplicado.id)
+    
+    assert exito, mensaje
+    assert mensaje == 'Fusión exitosa: 2 artículos movidos'
+    assert ArticuloAutor.query.filter_by(autor_id=duplicado.id).count() == 0
+    assert sorted(aa.articulo_id for aa in ArticuloAutor.query.filter_by(autor_id=principal.id)) == [
+        articulos[0].id, articulos[1].id
+    ]
+    assert principal.registro == 'R-7'
+    assert not duplicado.activo
+
+
+def test_encontrar_o_crear_autor_nombre_exacto(init_database, monkeypatch):
+    """Test: Un nombre normalizado exacto se resuelve sin fuzzy matching."""
+    from app.services.autor_matching import AutorMatchingService
+    
+    existente = Autor(nombre='Francisco', apellidos='Comparán Pantoja')
+    db.session.add(existente)
+    db.session.commit()
+    
+    def sin_fuzzy(*args, **kwargs):
+        raise AssertionError('buscar_fuzzy no debería llamarse')
+    monkeypatch.setattr(Autor, 'buscar_fuzzy', staticmethod(sin_fuzzy))
+    
+    for texto in ('Comparán Pantoja, Francisco', 'FRANCISCO comparan pantoja'):
+        assert AutorMatchingService.encontrar_o_crear_autor(texto) == (existente, False)
+
+
+def test_resolve_batch(init_database, monkeypatch):
+    """Test: Cada nombre distinto del lote se resuelve una sola vez."""
+    from app.services.autor_matching import AutorMatchingService
+    
+    existente = Autor(nombre='Francisco', apellidos='Comparán Pantoja')
+    db.session.add(existente)
+    db.session.commit()
+    
+    llamadas = []
+    original = AutorMatchingService.encontrar_o_crear_autor
+    monkeypatch.setattr(AutorMatchingService, 'encontrar_o_crear_autor',
+                        lambda nombre, **kwargs: llamadas.append(nombre) or original(nombre, **kwargs))
+    
+    nombres = ['Comparán Pantoja, Francisco', 'Ana Ruiz', 'Comparán Pantoja, Francisco']
+    resueltos = AutorMatchingService.resolve_batch(nombres, crear_si_no_existe=False)
+    
+    assert llamadas == ['Comparán Pantoja, Francisco', 'Ana Ruiz']
+    assert resueltos == {'Comparán Pantoja, Francisco': existente, 'Ana Ruiz': None}
+
+
+def test_detectar_duplicados(init_database, monkeypatch):
+    """Test: Detección de autores duplicados por similitud de nombre."""
+    from app.services import autor_matching
+    from app.services.autor_matching import AutorMatchingService
+    
+    autores = [
+        Autor(nombre='Francisco', apellidos='Comparán Pantoja'),
+        Autor(nombre='Pantoja', apellidos='Francisco Comparan'),
+        Autor(nombre='María', apellidos='García López'),
+        Autor(nombre='Francisco', apellidos='Comparán Pantoja', activo=False),
+    ]
+    db.session.add_all(autores)
+    db.session.commit()
+    
+    duplicados = AutorMatchingService.detectar_duplicados()
+    
+    assert [(a1.id, a2.id, score) for a1, a2, score in duplicados] == [
+        (autores[0].id, autores[1].id, 100)
+    ]
+    assert AutorMatchingService.detectar_duplicados(por_bloques=False) == duplicados
+    
+    # La matriz se calcula por bloques de filas: con una fila por bloque el
+    # resultado es el mismo
+    monkeypatch.setattr(autor_matching, 'FILAS_POR_BLOQUE', 1)
+    assert AutorMatchingService.detectar_duplicados(por_bloques=False) == duplicados
+
+
+def test_autor_buscar_por_identificador(init_database):
+    """Test: Búsqueda por identificador con prioridad ORCID > email > registro."""
+    por_registro = Autor(nombre='Ana', apellidos='Registro', registro='R-1')
+    por_email = Autor(nombre='Ana', apellidos='Email', email='ana@example.com')
+    por_orcid = Autor(nombre='Ana', apellidos='Orcid', orcid='0000-0002-1825-0097')
+    db.session.add_all([por_registro, por_email, por_orcid])
+    db.session.commit()
+    
+    assert Autor.buscar_por_identificador(
+        orcid='0000-0002-1825-0097', email='ana@example.com', registro='R-1'
+    ) is por_orcid
+    assert Autor.buscar_por_identificador(
+        orcid='0000-0000-0000-0000', email='ana@example.com', registro='R-1'
+    ) is por_email
+    assert Autor.buscar_por_identificador(email='otro@example.com', registro='R-1') is por_registro
+    assert Autor.buscar_por_identificador(registro='R-2') is None
+    
+    # ORCID normalizado al asignar y al buscar
+    por_orcid.orcid = '0000-0002-1825-009x '
+    db.session.commit()
+    assert por_orcid.orcid == '0000-0002-1825-009X'
+    assert Autor.buscar_por_identificador(orcid='0000-0002-1825-009x') is por_orcid
+    assert Autor.buscar_por_identificador() is None
 
 
 def test_autor_validaciones(init_database):
@@ -276,6 +521,41 @@ def test_articulo_autores(init_database):
     assert primer_autor.es_corresponsal == True
 
 
+def test_articulo_agregar_autores(init_database):
+    """Test: Agregar varios autores con un solo INSERT a continuación de los existentes."""
+    tipo = TipoProduccion.query.first()
+    estado = Estado.query.first()
+    articulo = Articulo(titulo='Test Bulk Authors', tipo_produccion_id=tipo.id,
+                        estado_id=estado.id, anio_publicacion=2024)
+    autores = [Autor(nombre=f'Autor{i}', apellidos='Lote') for i in range(4)]
+    db.session.add_all([articulo, *autores])
+    db.session.commit()
+    
+    articulo.agregar_autor(autores[0])
+    db.session.commit()
+    
+    assert articulo.agregar_autores(autores[1:], corresponsal=autores[2]) == 3
+    assert articulo.agregar_autores([]) == 0
+    db.session.commit()
+    
+    filas = [(aa.autor_id, aa.orden, aa.es_corresponsal) for aa in articulo.articulo_autores]
+    assert filas == [
+        (autores[0].id, 1, False),
+        (autores[1].id, 2, False),
+        (autores[2].id, 3, True),
+        (autores[3].id, 4, False),
+    ]
+    
+    # Remover renumera a los restantes con un solo UPDATE
+    assert articulo.remover_autor(autores[1])
+    assert not articulo.remover_autor(autores[1])
+    db.session.commit()
+    db.session.expire_all()
+    
+    filas = [(aa.autor_id, aa.orden) for aa in articulo.articulo_autores]
+    assert filas == [(autores[0].id, 1), (autores[2].id, 2), (autores[3].id, 3)]
+
+
 def test_revista_indexaciones(init_database):
     """Test: Relación N:N entre Revista e Indexación."""
     pais = Pais.query.first()
@@ -304,6 +584,78 @@ def test_revista_indexaciones(init_database):
     assert revista.revista_indexaciones[0].indexacion.nombre == 'Scopus'
 
 
+def test_articulo_obtener_todas_indexaciones(init_database):
+    """Test: Indexaciones de la revista y del artículo, sin duplicados por id."""
+    scopus = Indexacion.query.first()
+    wos = Indexacion(nombre='Web of Science')
+    latindex = Indexacion(nombre='Latindex')
+    revista = Revista(nombre='Indexed Journal', pais_id=Pais.query.first().id)
+    db.session.add_all([wos, latindex, revista])
+    db.session.commit()
+    db.session.add_all([
+        RevistaIndexacion(revista_id=revista.id, indexacion_id=scopus.id),
+        RevistaIndexacion(revista_id=revista.id, indexacion_id=latindex.id, activo=False),
+    ])
+    articulo = Articulo(titulo='Indexed', tipo_produccion_id=TipoProduccion.query.first().id,
+                        estado_id=Estado.query.first().id, revista_id=revista.id)
+    db.session.add(articulo)
+    db.session.commit()
+    articulo.agregar_indexacion(scopus)
+    articulo.agregar_indexacion(wos)
+    db.session.commit()
+    
+    assert [i.nombre for i in articulo.obtener_todas_indexaciones()] == ['Scopus', 'Web of Science']
+
+
+def test_articulo_to_excel_rows_por_lote(init_database):
+    """Test: to_excel_rows da las mismas filas que to_excel_row con consultas por lote."""
+    from sqlalchemy import event
+    
+    tipo = TipoProduccion.query.first()
+    estado = Estado.query.first()
+    revista = Revista(nombre='Batch Journal', pais_id=Pais.query.first().id)
+    autores = [Autor(nombre='Juan', apellidos='Pérez'), Autor(nombre='María', apellidos='García')]
+    db.session.add_all([revista] + autores)
+    db.session.commit()
+    db.session.add(RevistaIndexacion(revista_id=revista.id,
+                                     indexacion_id=Indexacion.query.first().id))
+    
+    articulos = []
+    for i in range(3):
+        articulo = Articulo(titulo=f'Batch {i}', tipo_produccion_id=tipo.id,
+                            estado_id=estado.id, revista_id=revista.id if i else None)
+        db.session.add(articulo)
+        articulos.append(articulo)
+    db.session.commit()
+    articulos[1].agregar_autor(autores[1], orden=2)
+    articulos[1].agregar_autor(autores[0], orden=1)
+    db.session.commit()
+    
+    esperadas = [a.to_excel_row() for a in articulos]
+    
+    sentencias = []
+    contar = lambda *args: sentencias.append(args[2])
+    event.listen(db.engine, 'before_cursor_execute', contar)
+    try:
+        filas = list(Articulo.to_excel_rows(articulos, tamano_lote=2))
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', contar)
+    
+    assert filas == esperadas
+    assert filas[1]['Autores'] == 'Juan Pérez, María García'
+    assert filas[1]['Indexaciones'] == 'Scopus'
+    assert list(filas[1])[:6] == [
+        'Título del artículo', 'Tipo de producción', 'Estado', 'Propósito', 'LGAC', 'Autores'
+    ]
+    assert list(filas[1])[-5:] == [
+        'Indexaciones', 'Factor de impacto', 'Quartil', 'Nombre del congreso', 'Para currículum CA'
+    ]
+    assert filas[1]['Tipo de producción'] == 'Artículo científico'
+    assert filas[1]['Propósito'] == '' and filas[1]['Volumen'] == ''
+    # Dos lotes: una consulta de autores y una de indexaciones por lote
+    assert len(sentencias) == 4
+
+
 def test_busqueda_articulos(init_database):
     """Test: Método de búsqueda avanzada."""
     tipo = TipoProduccion.query.first()
@@ -376,5 +728,93 @@ def test_articulo_completitud(init_database):
     assert articulo.completo == True
 
 
+def test_articulo_completitud_sin_persistir(init_database):
+    """Test: Completitud de un artículo nuevo según los autores agregados en memoria."""
+    tipo = TipoProduccion.query.first()
+    estado = Estado(nombre='Borrador nuevo', activo=True)
+    autor = Autor(nombre='Nuevo', apellidos='Autor')
+    db.session.add_all([estado, autor])
+    db.session.commit()
+    
+    articulo = Articulo(titulo='Sin guardar', tipo_produccion_id=tipo.id,
+                        estado_id=estado.id, anio_publicacion=2024)
+    articulo.estado = estado
+    articulo.tipo = tipo
+    
+    assert not articulo.calcular_completitud()
+    assert 'Autores' in articulo.campos_faltantes
+    
+    articulo.articulo_autores.append(ArticuloAutor(autor_id=autor.id, orden=1))
+    assert articulo.calcular_completitud()
+    assert articulo.campos_faltantes is None
+
+
+def test_recalcular_completitud_por_lotes(init_database):
+    """Test: Recalcular completitud de varios artículos con una consulta de autores por lote."""
+    tipo = TipoProduccion.query.first()
+    estado = Estado(nombre='En revisión', activo=True)
+    autor = Autor(nombre='Lote', apellidos='Completitud')
+    db.session.add_all([estado, autor])
+    db.session.commit()
+    
+    articulos = [
+        Articulo(titulo=f'Completitud {i}', tipo_produccion_id=tipo.id,
+                 estado_id=estado.id, anio_publicacion=2024)
+        for i in range(3)
+    ]
+    db.session.add_all(articulos)
+    db.session.commit()
+    articulos[0].agregar_autor(autor)
+    articulos[2].agregar_autor(autor)
+    db.session.commit()
+    
+    completos = Articulo.recalcular_completitud(articulos, tamano_lote=2)
+    
+    assert completos == 2
+    assert [a.completo for a in articulos] == [True, False, True]
+    assert 'Autores' in articulos[1].campos_faltantes
+
+
+def test_recalcular_completitud_bulk(init_database):
+    """Test: Recalcular completitud en SQL coincide con calcular_completitud."""
+    tipo = TipoProduccion.query.first()
+    publicado = Estado.query.filter_by(nombre='Publicado').first() or Estado(nombre='Publicado')
+    borrador = Estado(nombre='Borrador masivo', activo=True)
+    autor = Autor(nombre='Bulk', apellidos='Completitud')
+    db.session.add_all([publicado, borrador, autor])
+    db.session.commit()
+    
+    articulos = [
+        Articulo(titulo='Bulk completo', tipo_produccion_id=tipo.id,
+                 estado_id=borrador.id, anio_publicacion=2024, completo=False),
+        Articulo(titulo='Bulk sin autores', tipo_produccion_id=tipo.id,
+                 estado_id=borrador.id, anio_publicacion=2024, completo=True),
+        Articulo(titulo='Bulk publicado sin revista', tipo_produccion_id=tipo.id,
+                 estado_id=publicado.id, anio_publicacion=2024, completo=True),
+    ]
+    db.session.add_all(articulos)
+    db.session.commit()
+    articulos[0].agregar_autor(autor)
+    articulos[2].agregar_autor(autor)
+    db.session.commit()
+    ids = [a.id for a in articulos]
+    
+    completos = Articulo.recalcular_completitud_bulk(ids, tamano_lote=2)
+    db.session.commit()
+    db.session.expire_all()
+    
+    assert completos == 1
+    recalculados = [db.session.get(Articulo, id_) for id_ in ids]
+    assert [a.completo for a in recalculados] == [True, False, False]
+    assert recalculados[0].campos_faltantes is None
+    assert json.loads(recalculados[1].campos_faltantes) == ['Autores']
+    
+    # Mismo resultado que el cálculo por instancia
+    for articulo in recalculados:
+        faltantes = articulo.campos_faltantes
+        articulo.calcular_completitud()
+        assert articulo.campos_faltantes == faltantes
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
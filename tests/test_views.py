@@ -57,6 +57,36 @@ class TestArticleViews:
             response = client.get(url_for('articles.index', page=2, per_page=10))
             assert response.status_code == 200
     
+    def test_api_list_cursor(self, client, app, db_session, catalogs):
+        """Test de listado JSON por cursor ("cargar más")."""
+        with app.app_context():
+            for i in range(15):
+                articulo = Articulo(
+                    titulo=f'Article {i+1}',
+                    tipo_produccion_id=catalogs['tipo'].id,
+                    estado_id=catalogs['estado'].id
+                )
+                db_session.add(articulo)
+            db_session.commit()
+            
+            response = client.get(url_for('articles.api_list', per_page=10))
+            assert response.status_code == 200
+            primera = response.get_json()
+            assert len(primera['items']) == 10
+            assert primera['has_next']
+            
+            response = client.get(url_for('articles.api_list', per_page=10,
+                                          cursor=primera['next_cursor']))
+            segunda = response.get_json()
+            assert len(segunda['items']) == 5
+            assert not segunda['has_next']
+            assert segunda['next_cursor'] is None
+            ids = [a['id'] for a in primera['items'] + segunda['items']]
+            assert len(set(ids)) == 15
+            
+            response = client.get(url_for('articles.api_list', cursor='no-es-un-cursor'))
+            assert response.status_code == 400
+    
     def test_new_route_get(self, client, app, db_session, catalogs):
         """Test de ruta para mostrar formulario de nuevo artículo."""
         with app.app_context():
@@ -333,3 +363,27 @@ class TestArticleViews:
             response = client.get(url_for('articles.index', query='Machine'))
             
             assert response.status_code == 200
+    
+    def test_export_excel_route(self, client, app, db_session, catalogs, monkeypatch):
+        """Test de exportación a Excel enviada desde archivo temporal."""
+        from io import BytesIO
+        from openpyxl import load_workbook
+        from app.services.excel_service import ExcelService
+        
+        # Forzar que el archivo generado pase a disco
+        monkeypatch.setattr(ExcelService, 'SPOOL_MAX_SIZE', 1)
+        
+        with app.app_context():
+            db_session.add(Articulo(
+                titulo='Exported Article',
+                tipo_produccion_id=catalogs['tipo'].id,
+                estado_id=catalogs['estado'].id
+            ))
+            db_session.commit()
+            
+            response = client.get(url_for('articles.export_excel'))
+            
+            assert response.status_code == 200
+            assert 'attachment' in response.headers['Content-Disposition']
+            ws = load_workbook(BytesIO(response.data))['Artículos Académicos']
+            assert ws['B2'].value == 'Exported Article'